@@ -0,0 +1,121 @@
+"""Benchmark JSON load/save of result files: stdlib path vs codec layer.
+
+Generates realistic fio result files (latency percentiles for read and
+write, kernel parameters, software versions) and times:
+
+- load: ``json.load`` + ``model_validate`` (previous implementation)
+  against ``load_and_validate_json`` (``model_validate_json`` on bytes)
+- save: ``json.dumps(indent=2)`` (previous implementation) against
+  ``codec.dumps`` (orjson when installed)
+
+Usage:
+    python benchmarks/bench_codec.py [--files N] [--repeat R]
+"""
+
+import argparse
+import json
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from mybench.models.config import KernelConfig, SoftwareVersions, SystemConfiguration
+from mybench.models.result import BenchmarkResult
+from mybench.storage import codec
+from mybench.storage.base import load_and_validate_json, save_model_to_json
+
+PERCENTILES = [
+    "1.00", "5.00", "10.00", "20.00", "30.00", "40.00", "50.00", "60.00",
+    "70.00", "80.00", "90.00", "95.00", "99.00", "99.50", "99.90", "99.95",
+    "99.99",
+]
+
+
+def make_fio_result(i: int) -> BenchmarkResult:
+    """Build a fio result shaped like `fio --output-format=json --lat_percentiles`."""
+    results = {}
+    for direction in ("read", "write"):
+        results[f"{direction}_iops"] = 50000.0 + i
+        results[f"{direction}_bw_kb"] = 200000.0 + i * 4
+        results[f"{direction}_lat_avg_us"] = 640.0 + (i % 50)
+        results[f"{direction}_lat_stddev_us"] = 85.3
+        for p in PERCENTILES:
+            results[f"{direction}_clat_p{p}_us"] = 100.0 + float(p) * 10 + i % 7
+    return BenchmarkResult(
+        timestamp=datetime(2024, 1, 1) + timedelta(hours=i),
+        category="disk",
+        tool="fio",
+        label="nightly",
+        system_profile_id="bench-host",
+        configuration=SystemConfiguration(
+            os="Ubuntu 22.04.3 LTS",
+            kernel=KernelConfig(
+                version="5.15.0-91-generic",
+                cpu_governor="performance",
+                parameters={f"vm.param_{k}": str(k) for k in range(40)},
+            ),
+            software=SoftwareVersions(fio="3.35", libaio="0.3.112"),
+            environment={"LANG": "C.UTF-8", "TZ": "UTC"},
+        ),
+        benchmark_parameters={
+            "rw": "randrw", "bs": "4k", "iodepth": 32, "numjobs": 4,
+            "runtime": 60, "ioengine": "libaio", "direct": 1,
+        },
+        results=results,
+    )
+
+
+def timed(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    results = [make_fio_result(i) for i in range(args.files)]
+    payloads = [r.model_dump(mode="json") for r in results]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        paths = [Path(tmp) / f"{i}.json" for i in range(args.files)]
+        for path, result in zip(paths, results):
+            save_model_to_json(path, result)
+
+        def load_stdlib():
+            for path in paths:
+                with open(path, "r", encoding="utf-8") as f:
+                    BenchmarkResult.model_validate(json.load(f))
+
+        def load_codec():
+            for path in paths:
+                load_and_validate_json(path, BenchmarkResult)
+
+        def save_stdlib():
+            for data in payloads:
+                json.dumps(data, indent=2, ensure_ascii=False, default=str)
+
+        def save_codec():
+            for data in payloads:
+                codec.dumps(data)
+
+        print(f"{args.files} fio result files, best of {args.repeat}, "
+              f"codec backend: {codec.backend_name()}")
+        for name, old, new in (
+            ("load", load_stdlib, load_codec),
+            ("save", save_stdlib, save_codec),
+        ):
+            t_old = timed(old, args.repeat)
+            t_new = timed(new, args.repeat)
+            print(f"  {name}: stdlib {t_old * 1000:8.1f} ms  "
+                  f"codec {t_new * 1000:8.1f} ms  speedup {t_old / t_new:4.1f}x")
+
+
+if __name__ == "__main__":
+    main()
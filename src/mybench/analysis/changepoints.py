@@ -0,0 +1,316 @@
+"""Offline change-point detection over metric histories.
+
+Each metric of a (system, category, tool) series is split by binary
+segmentation with a Gaussian change-in-mean cost, on values divided by
+a robust noise estimate. The change points found are kept next to the
+metric store; after new results are saved, only the points after the
+second-to-last change are segmented again.
+"""
+
+import hashlib
+import math
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence
+
+import numpy as np
+
+from ..storage import codec
+from ..storage.base import atomic_save_json
+from ..storage.index import timestamp_sort_key
+from ..storage.metrics import MetricSeries, load_metric_series, series_dir
+from .trend import normalize_columns
+
+CHANGEPOINTS_FILENAME = "changepoints.json"
+STATE_VERSION = 1
+
+# Fewest points on either side of a change
+MIN_SEGMENT = 3
+# Penalty per change, times log(n), on standardized values (as MBIC)
+PENALTY_FACTOR = 3.0
+
+
+class ChangePoint(NamedTuple):
+    """A step change in a metric between two consecutive results."""
+
+    metric: str
+    category: str
+    tool: str
+    before_id: str
+    after_id: str
+    timestamp: datetime
+    mean_before: float
+    mean_after: float
+
+    @property
+    def percent_change(self) -> float:
+        """Change of the segment mean relative to the mean before it."""
+        if self.mean_before == 0:
+            return math.inf if self.mean_after > 0 else -math.inf
+        return (self.mean_after - self.mean_before) / abs(self.mean_before) * 100
+
+
+def _noise_scale(x: np.ndarray) -> float:
+    """Estimate the noise level from differences of consecutive values."""
+    diffs = np.diff(x)
+    if len(diffs) == 0:
+        return 1.0
+    # The median absolute deviation ignores the few steps between segments
+    scale = float(np.median(np.abs(diffs - np.median(diffs)))) / 0.6745 / math.sqrt(2)
+    if scale == 0:
+        # e.g. mostly repeated integer values
+        scale = float(np.std(diffs)) / math.sqrt(2)
+    return scale or 1.0
+
+
+def _digest(ids: Sequence[str], x: np.ndarray) -> str:
+    digest = hashlib.sha1("\0".join(ids).encode("utf-8"))
+    digest.update(x.tobytes())
+    return digest.hexdigest()
+
+
+def binary_segmentation(
+    z: np.ndarray, penalty: float, start: int = 0, end: Optional[int] = None
+) -> List[int]:
+    """
+    Split standardized values wherever a change in mean pays its penalty.
+
+    The best split of a segment is the one reducing the sum of squared
+    deviations from the segment means the most; the gains of all split
+    points of a segment are computed at once from cumulative sums.
+
+    Args:
+        z: Values divided by their noise level
+        penalty: Smallest reduction of the squared error worth a change
+        start: First position to segment
+        end: Position after the last one to segment (default: all)
+
+    Returns:
+        Positions at which new segments start, ascending
+    """
+    end = len(z) if end is None else end
+    s1 = np.concatenate([[0.0], np.cumsum(z[start:end])])
+    s2 = np.concatenate([[0.0], np.cumsum(z[start:end] ** 2)])
+
+    def cost(a, b):
+        total = s1[b] - s1[a]
+        return (s2[b] - s2[a]) - total * total / (b - a)
+
+    changes = []
+    pending = [(0, end - start)]
+    while pending:
+        a, b = pending.pop()
+        if b - a < 2 * MIN_SEGMENT:
+            continue
+        splits = np.arange(a + MIN_SEGMENT, b - MIN_SEGMENT + 1)
+        gains = cost(a, b) - cost(a, splits) - cost(splits, b)
+        best = int(np.argmax(gains))
+        if gains[best] > penalty:
+            split = int(splits[best])
+            changes.append(start + split)
+            pending += [(a, split), (split, b)]
+    return sorted(changes)
+
+
+@dataclass
+class SegmentationState:
+    """
+    Change points found in the first ``n`` points of a metric.
+
+    New points can only move the last change or add later ones, so an
+    update keeps every change but the last and re-segments the points
+    after the one before it.
+    """
+
+    n: int
+    digest: str
+    # Number of points when center, scale and penalty were chosen
+    n_fitted: int
+    center: float
+    scale: float
+    penalty: float
+    changes: List[int]
+
+    @classmethod
+    def start(cls, x: np.ndarray) -> "SegmentationState":
+        """Create an empty state with the noise level and penalty of ``x``."""
+        return cls(
+            n=0,
+            digest=_digest([], x[:0]),
+            n_fitted=len(x),
+            center=float(np.median(x)) if len(x) else 0.0,
+            scale=_noise_scale(x),
+            penalty=PENALTY_FACTOR * math.log(max(len(x), 2)),
+            changes=[],
+        )
+
+    def continues(self, ids: Sequence[str], x: np.ndarray) -> bool:
+        """
+        Check whether points extend the ones this state was built from.
+
+        The state is also discarded once the series has doubled in size,
+        so that the noise level and the log(n) penalty are refitted with
+        amortized constant cost per point.
+        """
+        return (
+            self.n <= len(x) <= 2 * self.n_fitted
+            and _digest(ids[: self.n], x[: self.n]) == self.digest
+        )
+
+    def extend(self, ids: Sequence[str], x: np.ndarray) -> None:
+        """
+        Update the change points for points added after the first ``n``.
+
+        Args:
+            ids: Result IDs of all points
+            x: All values of the metric, oldest first
+        """
+        kept = self.changes[:-1]
+        start = kept[-1] if kept else 0
+        z = (x - self.center) / self.scale
+        self.changes = kept + binary_segmentation(z, self.penalty, start)
+        self.n = len(x)
+        self.digest = _digest(ids, x)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "n": self.n,
+            "digest": self.digest,
+            "n_fitted": self.n_fitted,
+            "center": self.center,
+            "scale": self.scale,
+            "penalty": self.penalty,
+            "changes": self.changes,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "SegmentationState":
+        return cls(**data)
+
+
+def _load_states(path: Optional[Path]) -> Dict[str, SegmentationState]:
+    if path is None:
+        return {}
+    try:
+        data = codec.loads(path.read_bytes())
+        if data.get("version") != STATE_VERSION:
+            return {}
+        return {
+            metric: SegmentationState.from_dict(state)
+            for metric, state in data["metrics"].items()
+        }
+    except (OSError, ValueError, KeyError, TypeError):
+        return {}
+
+
+def detect_changepoints(
+    series: MetricSeries,
+    state_path: Optional[Path] = None,
+    metrics: Optional[Iterable[str]] = None,
+) -> List[ChangePoint]:
+    """
+    Find step changes in the metrics of a series.
+
+    Metrics are named and valued as normalized by the metric registry.
+
+    Args:
+        series: Full metric series, ordered by timestamp
+        state_path: File keeping the change points between runs; None
+            to always start over
+        metrics: Only these metrics (all by default)
+
+    Returns:
+        Change points ordered by metric and time
+    """
+    states = _load_states(state_path)
+    columns = normalize_columns(series.tool, series.columns)
+    updated = False
+    found = []
+    for metric in columns if metrics is None else metrics:
+        values = columns.get(metric)
+        if values is None:
+            continue
+        rows = np.flatnonzero(~np.isnan(values)).tolist()
+        ids = [series.ids[row] for row in rows]
+        x = values[rows]
+
+        state = states.get(metric)
+        if state is None or not state.continues(ids, x):
+            state = states[metric] = SegmentationState.start(x)
+        if state.n < len(x):
+            state.extend(ids, x)
+            updated = True
+
+        bounds = [0, *state.changes, len(x)]
+        for i in range(1, len(bounds) - 1):
+            start, split, end = bounds[i - 1], bounds[i], bounds[i + 1]
+            found.append(
+                ChangePoint(
+                    metric=metric,
+                    category=series.category,
+                    tool=series.tool,
+                    before_id=ids[split - 1],
+                    after_id=ids[split],
+                    timestamp=series.timestamp(rows[split]),
+                    mean_before=float(x[start:split].mean()),
+                    mean_after=float(x[split:end].mean()),
+                )
+            )
+
+    if state_path is not None and updated:
+        atomic_save_json(
+            state_path,
+            {
+                "version": STATE_VERSION,
+                "metrics": {
+                    metric: state.to_dict() for metric, state in states.items()
+                },
+            },
+        )
+    return found
+
+
+def find_changepoints(
+    results_dir: Path,
+    system_profile_id: str,
+    category: Optional[str] = None,
+    tool: Optional[str] = None,
+    metrics: Optional[Iterable[str]] = None,
+    workers: Optional[int] = 1,
+) -> List[ChangePoint]:
+    """
+    Find step changes in the metric histories of a system.
+
+    The change points of each series are stored in
+    ``results/.metrics/<system>/<category>/<tool>/changepoints.json``, so
+    re-running after new results were saved only segments the latest
+    points again.
+
+    Args:
+        results_dir: Base results directory
+        system_profile_id: System profile ID
+        category: Only series of this category
+        tool: Only series of this tool
+        metrics: Only these metrics (all by default)
+        workers: Number of processes used to refresh the index
+
+    Returns:
+        Change points ordered by time, then metric
+
+    Raises:
+        sqlite3.Error: If the result index cannot be used
+    """
+    metrics = None if metrics is None else list(metrics)
+    found = []
+    for series in load_metric_series(
+        results_dir, system_profile_id, category=category, tool=tool, workers=workers
+    ):
+        state_path = (
+            series_dir(results_dir, system_profile_id, series.category, series.tool)
+            / CHANGEPOINTS_FILENAME
+        )
+        found.extend(detect_changepoints(series, state_path, metrics))
+    return sorted(
+        found, key=lambda change: (timestamp_sort_key(change.timestamp), change.metric)
+    )
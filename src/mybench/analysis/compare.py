@@ -1,8 +1,19 @@
 """Benchmark comparison and analysis functions."""
 
-from typing import Any, Dict, List
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional
 from ..models.result import BenchmarkResult
 from ..models.config import SystemConfiguration
+from ..storage.index import scalar_metrics, timestamp_sort_key
+from ..storage.query import Predicate
+from ..storage.results import iter_benchmark_results
+from .registry import lookup_metric, normalize_metrics
+
+if TYPE_CHECKING:
+    # The trend engine loads NumPy; diffs do not need it
+    from .trend import TrendMatrix
 
 
 def calculate_delta(value1: float, value2: float) -> Dict[str, Any]:
@@ -36,12 +47,17 @@ def compare_results(
     """
     Compare two benchmark results and calculate deltas for all metrics.
 
+    Numeric metrics are converted to canonical names and units with the
+    metric registry, so results of tool versions that name or scale a
+    metric differently line up.
+
     Args:
         result1: First benchmark result (baseline)
         result2: Second benchmark result (comparison)
 
     Returns:
-        Dict mapping metric names to delta information
+        Dict mapping metric names to delta information; numeric metrics
+        also have their canonical ``unit`` and better ``direction``
 
     Raises:
         ValueError: If results are from different tools or categories
@@ -57,25 +73,36 @@ def compare_results(
             f"{result1.category} vs {result2.category}"
         )
 
-    deltas = {}
-
-    # Get all metrics from both results
-    all_metrics = set(result1.results.keys()) | set(result2.results.keys())
-
-    for metric in all_metrics:
-        value1 = result1.results.get(metric)
-        value2 = result2.results.get(metric)
+    # Numeric metrics in canonical names and units
+    tool = result1.tool
+    scalar1, scalar2 = scalar_metrics(result1), scalar_metrics(result2)
+    numeric1 = normalize_metrics(tool, scalar1)
+    numeric2 = normalize_metrics(tool, scalar2)
 
-        # Only compare numeric values
-        if isinstance(value1, (int, float)) and isinstance(
-            value2, (int, float)
-        ):  # noqa: E501
-            deltas[metric] = calculate_delta(value1, value2)
+    deltas = {}
+    for metric in numeric1.keys() | numeric2.keys():
+        if metric in numeric1 and metric in numeric2:
+            deltas[metric] = calculate_delta(numeric1[metric], numeric2[metric])
         else:
-            # Store non-numeric values for reference
             deltas[metric] = {
-                "value1": value1,
-                "value2": value2,
+                "value1": numeric1.get(metric),
+                "value2": numeric2.get(metric),
+                "delta": "N/A",
+                "percent_change": "N/A",
+            }
+        spec = lookup_metric(tool, metric)
+        deltas[metric].update(unit=spec.unit, direction=spec.direction)
+
+    # Store non-numeric values for reference
+    for metric in result1.results.keys() | result2.results.keys():
+        if metric in deltas:
+            continue
+        if (metric in result1.results and metric not in scalar1) or (
+            metric in result2.results and metric not in scalar2
+        ):
+            deltas[metric] = {
+                "value1": result1.results.get(metric),
+                "value2": result2.results.get(metric),
                 "delta": "N/A",
                 "percent_change": "N/A",
             }
@@ -103,6 +130,10 @@ def detect_config_changes(
         "environment": {},
     }
 
+    # Results referencing the same stored snapshot share one instance
+    if config1 is config2 or config1.content_hash() == config2.content_hash():
+        return changes
+
     # Check OS change
     if config1.os != config2.os:
         changes["os"] = {"old": config1.os, "new": config2.os}
@@ -153,41 +184,104 @@ def detect_config_changes(
     return changes
 
 
-def generate_trend_data(
-    results: List[BenchmarkResult],
-) -> Dict[str, List[Any]]:  # noqa: E501
+class TrendSummary(NamedTuple):
+    """Trend data of a system together with its result count and range."""
+
+    total: int
+    first: Optional[datetime]
+    last: Optional[datetime]
+    trends: "TrendMatrix"
+
+
+def load_trend_summary(
+    results_dir: Path,
+    system_profile_id: str,
+    category: Optional[str] = None,
+    tool: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    where: Optional[Predicate] = None,
+    workers: Optional[int] = 1,
+    strict: bool = False,
+) -> TrendSummary:
     """
-    Generate time-series trend data from multiple results.
+    Collect trend data for a system.
+
+    Reads the columnar metric series; if the result index cannot be used,
+    the system's results are streamed oldest first instead.
 
     Args:
-        results: List of benchmark results, should be sorted by timestamp
+        results_dir: Base results directory
+        system_profile_id: System profile ID
+        category: Only results of this category
+        tool: Only results of this tool
+        since: Only results at or after this time
+        until: Only results at or before this time
+        where: Only results whose metrics satisfy this predicate
+        workers: Number of processes used to load files
+        strict: Fully validate every file when streaming results
 
     Returns:
-        Dict mapping metric names to lists of (timestamp, value) tuples
+        TrendSummary with the number of results, the first and last
+        timestamps (None if there are no results) and the trend matrix
     """
-    if not results:
-        return {}
-
-    trends = {}
-
-    # Collect all unique metrics
-    all_metrics = set()
-    for result in results:
-        all_metrics.update(result.results.keys())
+    # The metric store and trend engine load NumPy; diffs do not need it
+    from ..storage.metrics import load_metric_series
+    from .trend import TrendMatrix
+
+    try:
+        # Read contiguous metric columns instead of re-parsing results
+        series_list = load_metric_series(
+            results_dir,
+            system_profile_id,
+            category=category,
+            tool=tool,
+            workers=workers,
+            since=since,
+            until=until,
+            where=where,
+        )
+    except sqlite3.Error:
+        series_list = None
+
+    if series_list is not None:
+        trends = TrendMatrix.from_series(series_list)
+        if not series_list:
+            return TrendSummary(0, None, None, trends)
+        return TrendSummary(
+            total=len(trends),
+            first=min((s.ts[0], s.timestamp(0)) for s in series_list)[1],
+            last=max((s.ts[-1], s.timestamp(-1)) for s in series_list)[1],
+            trends=trends,
+        )
 
-    # Build time series for each metric
-    for metric in all_metrics:
-        trend_data = []
+    # Stream the system's results, oldest first
+    results = iter_benchmark_results(
+        results_dir,
+        category=category,
+        system_profile_id=system_profile_id,
+        workers=workers,
+        tool=tool,
+        since=since,
+        until=until,
+        where=where,
+        strict=strict,
+        newest_first=False,
+    )
+    total = 0
+    first = last = None
+
+    def tally(results):
+        # Track count and date range while the results stream past
+        nonlocal total, first, last
         for result in results:
-            value = result.results.get(metric)
-            if value is not None:
-                trend_data.append(
-                    {
-                        "timestamp": result.timestamp,
-                        "value": value,
-                        "label": result.label,
-                    }
-                )
-        trends[metric] = trend_data
-
-    return trends
+            total += 1
+            key = (timestamp_sort_key(result.timestamp), result.timestamp)
+            first = min(first or key, key, key=lambda k: k[0])
+            last = max(last or key, key, key=lambda k: k[0])
+            yield result
+
+    trends = TrendMatrix.from_results(tally(results))
+    if not total:
+        return TrendSummary(0, None, None, trends)
+    return TrendSummary(total, first[1], last[1], trends)
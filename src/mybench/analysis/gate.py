@@ -0,0 +1,438 @@
+"""Regression gate: the newest result against a baseline window.
+
+Thresholds are read from a YAML file such as::
+
+    # Allowed regression in percent of the baseline median
+    default:
+      max_regression: 5
+    metrics:
+      events_per_second:
+        max_regression: 3
+      latency_avg_ms:
+        direction: lower
+        max_regression: 10%
+
+Metrics are named and valued as normalized by the metric registry;
+thresholds may use either the canonical or the reported names (fio's
+``bw`` is gated as ``bw_mb_s``). ``direction`` says whether higher or
+lower values are better, and defaults to the registry's. Metrics listed
+under ``metrics`` must be reported by the candidate and the baseline;
+other metrics are only checked against ``default`` when both report
+them, and ignored without one.
+"""
+
+import math
+import re
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, NamedTuple, Optional
+
+import numpy as np
+import yaml
+
+from ..storage.metrics import MetricSeries, load_metric_series
+from .registry import HIGHER, LOWER, lookup_metric
+from .trend import normalize_columns
+
+DIRECTIONS = (HIGHER, LOWER)
+DEFAULT_MAX_REGRESSION = 5.0
+
+# Check statuses; only "pass" lets the gate pass
+PASS = "pass"
+REGRESSION = "regression"
+MISSING = "missing"
+
+# last:N results, or last:N[h|d|w] of time before the candidate
+_WINDOW = re.compile(r"last:(\d+)([hdw]?)")
+_WINDOW_UNITS = {"h": "hours", "d": "days", "w": "weeks"}
+
+
+class Threshold(NamedTuple):
+    """Allowed regression of one metric."""
+
+    # None for the direction of the metric registry
+    direction: Optional[str] = None
+    # Percent of the baseline median
+    max_regression: float = DEFAULT_MAX_REGRESSION
+
+
+@dataclass
+class GateConfig:
+    """Per-metric thresholds of a regression gate."""
+
+    default: Optional[Threshold] = None
+    metrics: Dict[str, Threshold] = field(default_factory=dict)
+
+    def threshold(self, metric: str) -> Optional[Threshold]:
+        """Get the threshold of a metric, None if it is not gated."""
+        return self.metrics.get(metric, self.default)
+
+    def canonical(self, tool: str) -> "GateConfig":
+        """
+        Key the per-metric thresholds by the registry's canonical names.
+
+        Lets thresholds name metrics as the tool reports them, e.g. fio's
+        ``bw`` for ``bw_mb_s``.
+
+        Args:
+            tool: Tool whose metric names the thresholds use
+
+        Returns:
+            GateConfig with canonical metric names
+
+        Raises:
+            ValueError: If two names map to the same canonical metric
+        """
+        metrics: Dict[str, Threshold] = {}
+        names: Dict[str, str] = {}
+        for metric, threshold in self.metrics.items():
+            name = lookup_metric(tool, metric).name
+            if name in names:
+                raise ValueError(
+                    f"Thresholds for '{names[name]}' and '{metric}' both apply "
+                    f"to {tool} metric '{name}'"
+                )
+            names[name] = metric
+            metrics[name] = threshold
+        return GateConfig(default=self.default, metrics=metrics)
+
+
+def _parse_percent(value: Any, where: str) -> float:
+    if isinstance(value, str) and value.strip().endswith("%"):
+        value = value.strip()[:-1]
+    try:
+        percent = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{where}: max_regression must be a percentage") from None
+    if not percent >= 0:
+        raise ValueError(f"{where}: max_regression must not be negative")
+    return percent
+
+
+def _parse_threshold(data: Any, where: str, base: Threshold) -> Threshold:
+    if not isinstance(data, dict):
+        raise ValueError(f"{where}: expected a mapping")
+    unknown = ", ".join(sorted(map(str, data.keys() - Threshold._fields)))
+    if unknown:
+        raise ValueError(f"{where}: unknown keys {unknown}")
+    direction = data.get("direction", base.direction)
+    if direction is not None and direction not in DIRECTIONS:
+        raise ValueError(f"{where}: direction must be one of {DIRECTIONS}")
+    if "max_regression" in data:
+        max_regression = _parse_percent(data["max_regression"], where)
+    else:
+        max_regression = base.max_regression
+    return Threshold(direction, max_regression)
+
+
+def parse_thresholds(data: Any) -> GateConfig:
+    """
+    Build a gate configuration from parsed YAML.
+
+    Per-metric entries inherit ``max_regression`` from ``default``.
+
+    Args:
+        data: Mapping with optional ``default`` and ``metrics`` keys
+
+    Returns:
+        GateConfig
+
+    Raises:
+        ValueError: If the data does not describe valid thresholds
+    """
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ValueError("Thresholds must be a mapping")
+    unknown = ", ".join(sorted(map(str, data.keys() - {"default", "metrics"})))
+    if unknown:
+        raise ValueError(f"Unknown keys: {unknown}")
+
+    default = None
+    if data.get("default") is not None:
+        default = _parse_threshold(data["default"], "default", Threshold())
+    metrics = data.get("metrics") or {}
+    if not isinstance(metrics, dict):
+        raise ValueError("metrics: expected a mapping of metric names")
+
+    config = GateConfig(default=default)
+    for metric, entry in metrics.items():
+        config.metrics[str(metric)] = _parse_threshold(
+            {} if entry is None else entry,
+            f"metrics.{metric}",
+            Threshold(max_regression=(default or Threshold()).max_regression),
+        )
+    return config
+
+
+def load_thresholds(filepath: Path) -> GateConfig:
+    """
+    Load gate thresholds from a YAML file.
+
+    Args:
+        filepath: Path to the YAML file
+
+    Returns:
+        GateConfig
+
+    Raises:
+        OSError: If the file cannot be read
+        ValueError: If the file is not valid YAML or not valid thresholds
+    """
+    try:
+        data = yaml.safe_load(filepath.read_text(encoding="utf-8"))
+    except yaml.YAMLError as e:
+        raise ValueError(f"Invalid YAML in {filepath}: {e}") from None
+    try:
+        return parse_thresholds(data)
+    except ValueError as e:
+        raise ValueError(f"Invalid thresholds in {filepath}: {e}") from None
+
+
+class MetricCheck(NamedTuple):
+    """Outcome of the gate for one metric."""
+
+    metric: str
+    direction: str
+    max_regression: float
+    status: str
+    # Median of the baseline runs that reported the metric
+    baseline: Optional[float] = None
+    baseline_count: int = 0
+    value: Optional[float] = None
+    percent_change: Optional[float] = None
+
+
+class GateReport(NamedTuple):
+    """Outcome of a regression gate run."""
+
+    system_profile_id: str
+    category: str
+    tool: str
+    candidate_id: str
+    baseline: str
+    baseline_ids: List[str]
+    checks: List[MetricCheck]
+
+    @property
+    def passed(self) -> bool:
+        """Whether every gated metric passed."""
+        return all(check.status == PASS for check in self.checks)
+
+    @property
+    def failures(self) -> List[MetricCheck]:
+        """Checks that did not pass."""
+        return [check for check in self.checks if check.status != PASS]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a compact JSON-compatible dict."""
+        return {
+            "status": PASS if self.passed else "fail",
+            "system_profile_id": self.system_profile_id,
+            "category": self.category,
+            "tool": self.tool,
+            "candidate": self.candidate_id,
+            "baseline": {
+                "spec": self.baseline,
+                "count": len(self.baseline_ids),
+                "first": self.baseline_ids[0] if self.baseline_ids else None,
+                "last": self.baseline_ids[-1] if self.baseline_ids else None,
+            },
+            "metrics": {
+                check.metric: {
+                    name: _finite(value)
+                    for name, value in check._asdict().items()
+                    if name != "metric"
+                }
+                for check in self.checks
+            },
+        }
+
+
+def _finite(value: Any) -> Any:
+    # JSON has no infinities (a change from a zero baseline)
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def baseline_rows(series: MetricSeries, candidate_row: int, spec: str) -> List[int]:
+    """
+    Select the baseline runs of a gate.
+
+    Only runs before the candidate are considered.
+
+    Args:
+        series: Metric series ordered by timestamp
+        candidate_row: Row of the candidate result
+        spec: ``last:N`` for the N previous runs, ``last:N[h|d|w]`` for the
+            runs within N hours, days or weeks before the candidate, or
+            else a label
+
+    Returns:
+        Row numbers of the baseline runs, oldest first
+    """
+    window = _WINDOW.fullmatch(spec)
+    if window is None:
+        return [row for row in range(candidate_row) if series.labels[row] == spec]
+
+    count, unit = int(window.group(1)), window.group(2)
+    if not unit:
+        return list(range(max(0, candidate_row - count), candidate_row))
+    span = timedelta(**{_WINDOW_UNITS[unit]: count}).total_seconds()
+    start = series.ts[candidate_row] - span
+    return [row for row in range(candidate_row) if series.ts[row] >= start]
+
+
+def _regression(direction: str, baseline: float, value: float) -> float:
+    """Percent by which a value is worse than the baseline (negative if better)."""
+    worse = baseline - value if direction == HIGHER else value - baseline
+    if baseline == 0:
+        return 0.0 if worse == 0 else math.copysign(math.inf, worse)
+    return worse / abs(baseline) * 100
+
+
+def evaluate_gate(
+    series: MetricSeries,
+    config: GateConfig,
+    baseline: str,
+    candidate_id: Optional[str] = None,
+) -> GateReport:
+    """
+    Check a result against the median of its baseline runs.
+
+    Args:
+        series: Metric series holding the candidate and its baseline
+        config: Gate thresholds
+        baseline: Baseline window or label, see ``baseline_rows``
+        candidate_id: Result ID or unique prefix to gate (the newest
+            result by default)
+
+    Returns:
+        GateReport with one check per gated metric, ordered by name
+
+    Raises:
+        ValueError: If the candidate is not found, has no baseline runs, or
+            two thresholds name the same metric
+    """
+    if not len(series):
+        raise ValueError("No results to gate")
+    if candidate_id is None:
+        candidate_row = len(series) - 1
+    elif candidate_id in series.ids:
+        candidate_row = series.ids.index(candidate_id)
+    else:
+        rows = [
+            row
+            for row, result_id in enumerate(series.ids)
+            if result_id.startswith(candidate_id)
+        ]
+        if not rows:
+            raise ValueError(f"Result '{candidate_id}' not found")
+        if len(rows) > 1:
+            raise ValueError(f"Result ID prefix '{candidate_id}' is ambiguous")
+        candidate_row = rows[0]
+
+    rows = baseline_rows(series, candidate_row, baseline)
+    if not rows:
+        raise ValueError(
+            f"No baseline results for '{baseline}' before "
+            f"{series.ids[candidate_row]}"
+        )
+
+    config = config.canonical(series.tool)
+    columns = normalize_columns(series.tool, series.columns)
+    checks = []
+    for metric in sorted(columns.keys() | config.metrics.keys()):
+        threshold = config.threshold(metric)
+        if threshold is None:
+            continue
+        direction = threshold.direction or lookup_metric(series.tool, metric).direction
+        values = columns.get(metric, np.full(len(series), np.nan))
+        window = values[rows]
+        window = window[~np.isnan(window)]
+        value = float(values[candidate_row])
+        check = MetricCheck(
+            metric,
+            direction,
+            threshold.max_regression,
+            MISSING,
+            baseline_count=len(window),
+            value=None if math.isnan(value) else value,
+        )
+        if not len(window) or math.isnan(value):
+            # Only metrics required by name fail when they are missing
+            if metric in config.metrics:
+                checks.append(check)
+            continue
+
+        median = float(np.median(window))
+        regression = _regression(direction, median, value)
+        checks.append(
+            check._replace(
+                status=REGRESSION if regression > threshold.max_regression else PASS,
+                baseline=median,
+                percent_change=_regression(LOWER, median, value),
+            )
+        )
+
+    return GateReport(
+        system_profile_id=series.system_profile_id,
+        category=series.category,
+        tool=series.tool,
+        candidate_id=series.ids[candidate_row],
+        baseline=baseline,
+        baseline_ids=[series.ids[row] for row in rows],
+        checks=checks,
+    )
+
+
+def run_gate(
+    results_dir: Path,
+    system_profile_id: str,
+    tool: str,
+    config: GateConfig,
+    baseline: str,
+    category: Optional[str] = None,
+    candidate_id: Optional[str] = None,
+    workers: Optional[int] = 1,
+) -> GateReport:
+    """
+    Gate a system's newest result of a tool against a baseline.
+
+    Values are read from the columnar metric store, without loading any
+    result file.
+
+    Args:
+        results_dir: Base results directory
+        system_profile_id: System profile ID
+        tool: Tool name
+        config: Gate thresholds
+        baseline: Baseline window or label, see ``baseline_rows``
+        category: Category of the tool's results (needed only if the tool
+            has results in several categories)
+        candidate_id: Result ID or unique prefix to gate instead of the
+            newest result
+        workers: Number of processes used to refresh the index
+
+    Returns:
+        GateReport
+
+    Raises:
+        ValueError: If there are no matching results or no baseline runs
+        sqlite3.Error: If the result index cannot be used
+    """
+    series_list = load_metric_series(
+        results_dir, system_profile_id, category=category, tool=tool, workers=workers
+    )
+    if not series_list:
+        raise ValueError(f"No {tool} results found for system '{system_profile_id}'")
+    if len(series_list) > 1:
+        categories = ", ".join(series.category for series in series_list)
+        raise ValueError(
+            f"{tool} has results in several categories ({categories}); "
+            f"pass a category"
+        )
+    return evaluate_gate(series_list[0], config, baseline, candidate_id)
+
@@ -0,0 +1,198 @@
+"""Statistical comparison of two groups of benchmark runs."""
+
+import math
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..models.result import BenchmarkResult
+from .compare import calculate_delta
+from .registry import lookup_metric
+from .trend import TrendMatrix
+
+DEFAULT_CONFIDENCE = 0.95
+DEFAULT_RESAMPLES = 10_000
+
+# Bootstrap samples are drawn in batches of at most this many values
+_BATCH_VALUES = 1_000_000
+# Largest group size for which the exact Mann-Whitney U distribution is used
+_EXACT_MAX = 20
+
+
+def bootstrap_mean_delta(
+    baseline: np.ndarray,
+    candidate: np.ndarray,
+    confidence: float = DEFAULT_CONFIDENCE,
+    resamples: int = DEFAULT_RESAMPLES,
+    rng: Optional[np.random.Generator] = None,
+) -> Tuple[float, float]:
+    """
+    Bootstrap a confidence interval for the difference of two means.
+
+    Each resample draws both groups with replacement; all resamples of a
+    batch are drawn and averaged as one matrix.
+
+    Args:
+        baseline: Values of the baseline group
+        candidate: Values of the candidate group
+        confidence: Confidence level of the interval, e.g. 0.95
+        resamples: Number of bootstrap resamples
+        rng: Random generator (a fresh unseeded one by default)
+
+    Returns:
+        (low, high) percentile interval of ``mean(candidate) - mean(baseline)``
+    """
+    rng = rng or np.random.default_rng()
+    batch = max(1, _BATCH_VALUES // (len(baseline) + len(candidate)))
+    deltas = np.empty(resamples)
+    for start in range(0, resamples, batch):
+        size = min(batch, resamples - start)
+        base = baseline[rng.integers(0, len(baseline), (size, len(baseline)))]
+        cand = candidate[rng.integers(0, len(candidate), (size, len(candidate)))]
+        deltas[start : start + size] = cand.mean(axis=1) - base.mean(axis=1)
+
+    alpha = 1 - confidence
+    low, high = np.quantile(deltas, [alpha / 2, 1 - alpha / 2])
+    return float(low), float(high)
+
+
+def _exact_u_counts(n1: int, n2: int) -> np.ndarray:
+    """Count the rankings of n1 + n2 distinct values by their U statistic."""
+    # counts[m][n] holds the distribution for sample sizes m and n
+    counts = [[np.ones(1, dtype=np.int64)] * (n2 + 1)]
+    for m in range(1, n1 + 1):
+        row = [np.ones(1, dtype=np.int64)]
+        for n in range(1, n2 + 1):
+            # The largest value is either in the first sample (adding n to U)
+            # or in the second
+            dist = np.zeros(m * n + 1, dtype=np.int64)
+            dist[n : n + len(counts[m - 1][n])] += counts[m - 1][n]
+            dist[: len(row[n - 1])] += row[n - 1]
+            row.append(dist)
+        counts.append(row)
+    return counts[n1][n2]
+
+
+def mann_whitney_u(baseline: np.ndarray, candidate: np.ndarray) -> Tuple[float, float]:
+    """
+    Two-sided Mann-Whitney U test.
+
+    Uses the exact distribution for small samples without ties, and the
+    normal approximation with tie and continuity correction otherwise.
+
+    Args:
+        baseline: Values of the baseline group
+        candidate: Values of the candidate group
+
+    Returns:
+        (U statistic of the baseline group, p-value)
+    """
+    n1, n2 = len(baseline), len(candidate)
+    values = np.concatenate([baseline, candidate])
+    _, inverse, ties = np.unique(values, return_inverse=True, return_counts=True)
+    # Average rank of each distinct value
+    ranks = np.cumsum(ties) - (ties - 1) / 2
+    u1 = float(ranks[inverse[:n1]].sum() - n1 * (n1 + 1) / 2)
+    u = min(u1, n1 * n2 - u1)
+
+    if max(n1, n2) <= _EXACT_MAX and np.all(ties == 1):
+        counts = _exact_u_counts(n1, n2)
+        p = 2 * counts[: int(u) + 1].sum() / counts.sum()
+        return u1, min(1.0, float(p))
+
+    n = n1 + n2
+    tie_term = float(np.sum(ties**3 - ties)) / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        # Every value is equal
+        return u1, 1.0
+    z = max(0.0, abs(u1 - n1 * n2 / 2) - 0.5) / sigma
+    return u1, math.erfc(z / math.sqrt(2))
+
+
+def compare_groups(
+    baseline: Sequence[BenchmarkResult],
+    candidate: Sequence[BenchmarkResult],
+    confidence: float = DEFAULT_CONFIDENCE,
+    resamples: int = DEFAULT_RESAMPLES,
+    seed: Optional[int] = None,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Compare two groups of runs of the same benchmark metric by metric.
+
+    A change is considered within the noise unless the bootstrap
+    confidence interval of the mean delta excludes zero and the
+    Mann-Whitney U test is significant at the same level.
+
+    Args:
+        baseline: Runs of the baseline group
+        candidate: Runs of the candidate group
+        confidence: Confidence level, e.g. 0.95
+        resamples: Number of bootstrap resamples
+        seed: Seed for the bootstrap, for reproducible intervals
+
+    Returns:
+        Dict mapping canonical metric names to delta information as in
+        compare_results, with ``value1``/``value2`` being group means,
+        plus ``n1``, ``n2``, ``median1``, ``median2``, ``median_delta``,
+        ``median_percent_change``, ``ci_low``, ``ci_high`` (interval of
+        the mean delta), ``p_value`` and ``within_noise``. Metrics missing
+        from one group have "N/A" deltas.
+
+    Raises:
+        ValueError: If a group is empty or the groups mix tools or
+            categories
+    """
+    if not baseline or not candidate:
+        raise ValueError("Both groups need at least one result")
+    kinds = {(r.tool, r.category) for group in (baseline, candidate) for r in group}
+    if len(kinds) > 1:
+        found = ", ".join(sorted(f"{tool} ({category})" for tool, category in kinds))
+        raise ValueError(f"Cannot compare different tools or categories: {found}")
+
+    rng = np.random.default_rng(seed)
+    matrices = TrendMatrix.from_results(baseline), TrendMatrix.from_results(candidate)
+    columns = [
+        {
+            metric: column[~np.isnan(column)]
+            for metric, column in zip(matrix.metrics, matrix.values.T)
+        }
+        for matrix in matrices
+    ]
+
+    deltas = {}
+    for metric in sorted(columns[0].keys() | columns[1].keys()):
+        x, y = columns[0].get(metric), columns[1].get(metric)
+        spec = lookup_metric(baseline[0].tool, metric)
+        if x is None or y is None:
+            deltas[metric] = {
+                "value1": "N/A" if x is None else float(x.mean()),
+                "value2": "N/A" if y is None else float(y.mean()),
+                "delta": "N/A",
+                "percent_change": "N/A",
+                "unit": spec.unit,
+                "direction": spec.direction,
+            }
+            continue
+
+        info = calculate_delta(float(x.mean()), float(y.mean()))
+        median = calculate_delta(float(np.median(x)), float(np.median(y)))
+        ci_low, ci_high = bootstrap_mean_delta(x, y, confidence, resamples, rng)
+        _, p_value = mann_whitney_u(x, y)
+        info.update(
+            unit=spec.unit,
+            direction=spec.direction,
+            n1=len(x),
+            n2=len(y),
+            median1=median["value1"],
+            median2=median["value2"],
+            median_delta=median["delta"],
+            median_percent_change=median["percent_change"],
+            ci_low=ci_low,
+            ci_high=ci_high,
+            p_value=p_value,
+            within_noise=ci_low <= 0 <= ci_high or p_value >= 1 - confidence,
+        )
+        deltas[metric] = info
+
+    return deltas
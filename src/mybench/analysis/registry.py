@@ -0,0 +1,210 @@
+"""Registry of metric names, units and directions.
+
+Tools report the same quantity under different names and units: fio's
+``bw`` is in KiB/s, bonnie++ reports K/sec, dd MB/s and mbw MiB/s.
+``lookup_metric`` maps a tool's metric name to a canonical name in a
+canonical unit, with the factor converting raw values and whether
+higher or lower values are better:
+
+- Names listed for the tool in ``TOOL_METRICS`` use that entry.
+- Otherwise a unit suffix such as ``_us``, ``_kib_s`` or ``_gbit_s`` is
+  replaced by the canonical one (``_ms``, ``_mb_s``, ``_mbit_s``).
+- Other names are kept; they are lower-is-better if a word of the name
+  suggests a cost (``latency``, ``jitter``, ``errors``, ...).
+
+Canonical names map to themselves, so normalized values can be looked
+up again.
+"""
+
+from functools import lru_cache
+from typing import Dict, Mapping, NamedTuple, Optional, Set, Tuple
+
+HIGHER = "higher"
+LOWER = "lower"
+
+# Unit -> (canonical unit, factor converting to it, better direction)
+UNITS: Dict[str, Tuple[str, float, str]] = {
+    "ns": ("ms", 1e-6, LOWER),
+    "us": ("ms", 1e-3, LOWER),
+    "ms": ("ms", 1.0, LOWER),
+    "B/s": ("MB/s", 1e-6, HIGHER),
+    "KB/s": ("MB/s", 1e-3, HIGHER),
+    "MB/s": ("MB/s", 1.0, HIGHER),
+    "GB/s": ("MB/s", 1e3, HIGHER),
+    "KiB/s": ("MB/s", 1024 / 1e6, HIGHER),
+    "MiB/s": ("MB/s", 1024**2 / 1e6, HIGHER),
+    "GiB/s": ("MB/s", 1024**3 / 1e6, HIGHER),
+    "bit/s": ("Mbit/s", 1e-6, HIGHER),
+    "Kbit/s": ("Mbit/s", 1e-3, HIGHER),
+    "Mbit/s": ("Mbit/s", 1.0, HIGHER),
+    "Gbit/s": ("Mbit/s", 1e3, HIGHER),
+    "IOPS": ("IOPS", 1.0, HIGHER),
+    "1/s": ("1/s", 1.0, HIGHER),
+}
+
+# Name suffix -> unit, for names not listed in TOOL_METRICS
+SUFFIXES: Dict[str, str] = {
+    "_ns": "ns",
+    "_us": "us",
+    "_ms": "ms",
+    "_b_s": "B/s",
+    "_kb_s": "KB/s",
+    "_mb_s": "MB/s",
+    "_gb_s": "GB/s",
+    "_kib_s": "KiB/s",
+    "_mib_s": "MiB/s",
+    "_gib_s": "GiB/s",
+    "_bits_per_second": "bit/s",
+    "_kbit_s": "Kbit/s",
+    "_mbit_s": "Mbit/s",
+    "_gbit_s": "Gbit/s",
+    "_per_second": "1/s",
+    "_iops": "IOPS",
+}
+
+# Suffix used in canonical names for each canonical unit
+_CANONICAL_SUFFIXES = {"ms": "_ms", "MB/s": "_mb_s", "Mbit/s": "_mbit_s"}
+
+# Tool -> raw name -> (canonical name, unit, direction or None for the
+# unit's direction)
+TOOL_METRICS: Dict[str, Dict[str, Tuple[str, str, Optional[str]]]] = {
+    "sysbench": {
+        "events_per_second": ("events_per_second", "1/s", None),
+        "total_events": ("total_events", "", HIGHER),
+        "latency_min": ("latency_min_ms", "ms", None),
+        "latency_avg": ("latency_avg_ms", "ms", None),
+        "latency_max": ("latency_max_ms", "ms", None),
+        "latency_95th": ("latency_95th_ms", "ms", None),
+        # sysbench memory
+        "mib_per_sec": ("transfer_mb_s", "MiB/s", None),
+        "transfer_rate": ("transfer_mb_s", "MiB/s", None),
+    },
+    "fio": {
+        "iops": ("iops", "IOPS", None),
+        "read_iops": ("read_iops", "IOPS", None),
+        "write_iops": ("write_iops", "IOPS", None),
+        # fio reports bandwidth in KiB/s
+        "bw": ("bw_mb_s", "KiB/s", None),
+        "read_bw": ("read_bw_mb_s", "KiB/s", None),
+        "write_bw": ("write_bw_mb_s", "KiB/s", None),
+    },
+    "dd": {
+        "throughput": ("throughput_mb_s", "MB/s", None),
+    },
+    "bonnie++": {
+        # bonnie++ reports K/sec, i.e. KiB/s
+        "putc": ("seq_write_char_mb_s", "KiB/s", None),
+        "put_block": ("seq_write_block_mb_s", "KiB/s", None),
+        "rewrite": ("seq_rewrite_mb_s", "KiB/s", None),
+        "getc": ("seq_read_char_mb_s", "KiB/s", None),
+        "get_block": ("seq_read_block_mb_s", "KiB/s", None),
+        "seeks": ("seeks_per_second", "1/s", None),
+    },
+    "mbw": {
+        "memcpy": ("memcpy_mb_s", "MiB/s", None),
+        "dumb": ("dumb_mb_s", "MiB/s", None),
+        "mcblock": ("mcblock_mb_s", "MiB/s", None),
+    },
+    "iperf3": {
+        "bits_per_second": ("bandwidth_mbit_s", "bit/s", None),
+        "retransmits": ("retransmits", "", LOWER),
+    },
+    "netperf": {
+        # netperf reports 10^6 bits/sec
+        "throughput": ("throughput_mbit_s", "Mbit/s", None),
+        "transactions_per_second": ("transactions_per_second", "1/s", None),
+    },
+}
+
+# Words of a metric name that mark it as a cost
+LOWER_IS_BETTER_WORDS = frozenset(
+    ["lat", "clat", "slat", "latency", "jitter", "loss", "errors", "retransmits"]
+)
+
+
+class MetricSpec(NamedTuple):
+    """How one metric of a tool is normalized and compared."""
+
+    name: str
+    # Canonical unit, "" if unknown or dimensionless
+    unit: str
+    direction: str
+    # Multiplying a raw value by this converts it to ``unit``
+    factor: float = 1.0
+
+
+def _spec(name: str, unit: str, direction: Optional[str]) -> MetricSpec:
+    canonical, factor, unit_direction = UNITS.get(unit, (unit, 1.0, HIGHER))
+    return MetricSpec(name, canonical, direction or unit_direction, factor)
+
+
+@lru_cache(maxsize=4096)
+def lookup_metric(tool: str, name: str) -> MetricSpec:
+    """
+    Look up the canonical name, unit and direction of a tool's metric.
+
+    Args:
+        tool: Tool that reported the metric
+        name: Metric name as reported
+
+    Returns:
+        MetricSpec; unknown metrics keep their name and unit-less values
+    """
+    entry = TOOL_METRICS.get(tool, {}).get(name)
+    if entry is not None:
+        return _spec(*entry)
+
+    # Longest matching suffix, so "_mib_s" wins over "_b_s"
+    for suffix in sorted(SUFFIXES, key=len, reverse=True):
+        if name.endswith(suffix) and len(name) > len(suffix):
+            spec = _spec(name, SUFFIXES[suffix], None)
+            canonical_suffix = _CANONICAL_SUFFIXES.get(spec.unit)
+            if canonical_suffix is not None:
+                spec = spec._replace(name=name[: -len(suffix)] + canonical_suffix)
+            if spec.direction == HIGHER and _is_cost(name):
+                spec = spec._replace(direction=LOWER)
+            return spec
+
+    return MetricSpec(name, "", LOWER if _is_cost(name) else HIGHER)
+
+
+def canonical_names(name: str, tool: Optional[str] = None) -> Set[str]:
+    """
+    Get the canonical names a metric name may stand for.
+
+    Args:
+        name: Metric name, as reported or canonical
+        tool: Tool that reported the metric (any tool if None)
+
+    Returns:
+        Canonical names of the metric for the tool, or for every tool
+    """
+    tools = [tool] if tool is not None else [*TOOL_METRICS, ""]
+    return {lookup_metric(each, name).name for each in tools}
+
+
+def _is_cost(name: str) -> bool:
+    return not LOWER_IS_BETTER_WORDS.isdisjoint(name.lower().split("_"))
+
+
+def normalize_metrics(tool: str, metrics: Mapping[str, float]) -> Dict[str, float]:
+    """
+    Convert a result's numeric metrics to canonical names and units.
+
+    A value reported under the canonical name wins over aliases of it.
+
+    Args:
+        tool: Tool that reported the metrics
+        metrics: Metric names and values as reported
+
+    Returns:
+        Dict mapping canonical names to converted values
+    """
+    normalized: Dict[str, float] = {}
+    for name, value in metrics.items():
+        spec = lookup_metric(tool, name)
+        if name != spec.name and spec.name in metrics:
+            continue
+        normalized[spec.name] = value * spec.factor if spec.factor != 1 else value
+    return normalized
+
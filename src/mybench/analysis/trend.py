@@ -0,0 +1,375 @@
+"""Vectorized trend engine over a timestamp × metric matrix."""
+
+import warnings
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Mapping, NamedTuple, Optional, Sequence
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..models.result import BenchmarkResult
+from ..storage.index import scalar_metrics, timestamp_sort_key
+from ..storage.metrics import MetricSeries
+from .registry import lookup_metric, normalize_metrics
+
+BUCKETS = ("day", "week")
+
+_DAY = 86400.0
+_EPOCH = datetime(1970, 1, 1)
+# 1970-01-01 was a Thursday; shifting by 3 days makes weeks start on Monday
+_WEEK_SHIFT = 3
+
+
+class TrendStats(NamedTuple):
+    """
+    Statistics of one metric per rolling window or time bucket.
+
+    Every field holds one entry per row: the point ending the window, or
+    the bucket. ``std`` is the sample standard deviation (NaN for a
+    single value).
+    """
+
+    timestamps: List[datetime]
+    count: np.ndarray
+    mean: np.ndarray
+    median: np.ndarray
+    std: np.ndarray
+    min: np.ndarray
+    max: np.ndarray
+    # Value of the point ending each window (rolling statistics only)
+    value: Optional[np.ndarray] = None
+
+
+@dataclass
+class TrendMatrix:
+    """
+    Scalar metrics of many results as one float64 matrix.
+
+    Rows are results ordered by timestamp and columns are metrics in
+    canonical names and units (see ``registry``), with NaN where a result
+    did not report a metric. The matrix is built once;
+    per-metric views, rolling windows and buckets are computed from it
+    with array operations.
+    """
+
+    ts: np.ndarray
+    timestamps: List[str]
+    labels: List[Optional[str]]
+    metrics: List[str]
+    values: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    @classmethod
+    def from_series(cls, series_list: Sequence[MetricSeries]) -> "TrendMatrix":
+        """
+        Build the matrix from columnar metric series.
+
+        Rows of several series (e.g. different tools) are merged by
+        timestamp; ties keep the order of ``series_list``.
+
+        Args:
+            series_list: Metric series, each ordered by timestamp
+
+        Returns:
+            TrendMatrix over every row of every series
+        """
+        normalized = [
+            normalize_columns(series.tool, series.columns) for series in series_list
+        ]
+        metrics = sorted({name for columns in normalized for name in columns})
+        column_of = {name: i for i, name in enumerate(metrics)}
+        rows = sum(len(series) for series in series_list)
+
+        ts = np.empty(rows)
+        values = np.full((rows, len(metrics)), np.nan)
+        timestamps: List[str] = []
+        labels: List[Optional[str]] = []
+        start = 0
+        for series, columns in zip(series_list, normalized):
+            end = start + len(series)
+            ts[start:end] = series.ts
+            for name, column in columns.items():
+                values[start:end, column_of[name]] = column
+            timestamps.extend(series.timestamps)
+            labels.extend(series.labels)
+            start = end
+
+        return cls._sorted(ts, timestamps, labels, metrics, values)
+
+    @classmethod
+    def from_results(cls, results: Iterable[BenchmarkResult]) -> "TrendMatrix":
+        """
+        Build the matrix from result objects in a single pass.
+
+        Only numeric metrics are kept, as in the result index. A lazy
+        iterator can be passed without holding every result in memory.
+
+        Args:
+            results: Benchmark results, should be sorted by timestamp
+
+        Returns:
+            TrendMatrix with one row per result
+        """
+        ts = array("d")
+        timestamps: List[str] = []
+        labels: List[Optional[str]] = []
+        column_of: Dict[str, int] = {}
+        # Reported cells as parallel (row, column, value) arrays
+        cell_rows, cell_columns, cell_values = array("q"), array("q"), array("d")
+        for row, result in enumerate(results):
+            ts.append(timestamp_sort_key(result.timestamp))
+            timestamps.append(result.timestamp.isoformat())
+            labels.append(result.label)
+            metrics = normalize_metrics(result.tool, scalar_metrics(result))
+            for name, value in metrics.items():
+                cell_rows.append(row)
+                cell_columns.append(column_of.setdefault(name, len(column_of)))
+                cell_values.append(value)
+
+        values = np.full((len(ts), len(column_of)), np.nan)
+        values[
+            np.frombuffer(cell_rows, dtype=np.int64),
+            np.frombuffer(cell_columns, dtype=np.int64),
+        ] = np.frombuffer(cell_values, dtype=np.float64)
+
+        metrics = sorted(column_of)
+        values = values[:, [column_of[name] for name in metrics]]
+        return cls._sorted(
+            np.frombuffer(ts, dtype=np.float64), timestamps, labels, metrics, values
+        )
+
+    @classmethod
+    def _sorted(
+        cls,
+        ts: np.ndarray,
+        timestamps: List[str],
+        labels: List[Optional[str]],
+        metrics: List[str],
+        values: np.ndarray,
+    ) -> "TrendMatrix":
+        # Slicing series by time or --where can leave metrics without data
+        reported = ~np.all(np.isnan(values), axis=0)
+        if not reported.all():
+            metrics = [name for name, keep in zip(metrics, reported) if keep]
+            values = values[:, reported]
+
+        order = np.argsort(ts, kind="stable")
+        if np.any(order != np.arange(len(order))):
+            ts, values = ts[order], values[order]
+            timestamps = [timestamps[row] for row in order]
+            labels = [labels[row] for row in order]
+        return cls(ts, timestamps, labels, metrics, values)
+
+    def column(self, metric: str) -> np.ndarray:
+        """
+        Get a metric's values for every row, NaN where not reported.
+
+        Raises:
+            KeyError: If no result reported the metric
+        """
+        try:
+            return self.values[:, self.metrics.index(metric)]
+        except ValueError:
+            raise KeyError(metric) from None
+
+    def counts(self) -> Dict[str, int]:
+        """Get the number of results that reported each metric."""
+        reported = np.count_nonzero(~np.isnan(self.values), axis=0)
+        return dict(zip(self.metrics, reported.tolist()))
+
+    def _reported(self, metric: str) -> np.ndarray:
+        """Get the row numbers at which a metric was reported."""
+        return np.flatnonzero(~np.isnan(self.column(metric)))
+
+    def points(self, metric: str) -> List[Dict[str, Any]]:
+        """
+        List the data points of a metric in timestamp order.
+
+        Args:
+            metric: Metric name
+
+        Returns:
+            Dicts with the timestamp, value and label of each result that
+            reported the metric
+        """
+        rows = self._reported(metric)
+        return [
+            {
+                "timestamp": datetime.fromisoformat(self.timestamps[row]),
+                "value": value,
+                "label": self.labels[row],
+            }
+            for row, value in zip(rows.tolist(), self.column(metric)[rows].tolist())
+        ]
+
+    def rolling(self, metric: str, window: int) -> TrendStats:
+        """
+        Compute statistics over a window of the latest points at each point.
+
+        Windows are counted in data points of the metric, not in time. The
+        first ``window - 1`` points use the shorter window available.
+
+        Args:
+            metric: Metric name
+            window: Number of points per window (at least 1)
+
+        Returns:
+            TrendStats with one row per data point
+        """
+        if window < 1:
+            raise ValueError("window must be at least 1")
+        rows = self._reported(metric)
+        x = self.column(metric)[rows]
+        timestamps = [
+            datetime.fromisoformat(self.timestamps[row]) for row in rows.tolist()
+        ]
+        if not len(x):
+            return _empty_stats(timestamps, value=x)
+
+        # Full windows are strided views of x; the few shorter leading
+        # windows are computed one by one
+        head = [x[: end + 1] for end in range(min(window - 1, len(x)))]
+        full = sliding_window_view(x, window) if len(x) >= window else x[:0, None]
+
+        def stat(function, **kwargs):
+            return np.concatenate(
+                [
+                    [function(points, **kwargs) for points in head],
+                    function(full, axis=1, **kwargs),
+                ]
+            )
+
+        with warnings.catch_warnings():
+            # Windows of a single point have no sample deviation
+            warnings.simplefilter("ignore", RuntimeWarning)
+            return TrendStats(
+                timestamps=timestamps,
+                count=np.r_[np.arange(1, len(head) + 1), np.full(len(full), window)],
+                mean=stat(np.mean),
+                median=stat(np.median),
+                std=stat(np.std, ddof=1),
+                min=stat(np.min),
+                max=stat(np.max),
+                value=x,
+            )
+
+    def buckets(self, metric: str, bucket: str) -> TrendStats:
+        """
+        Compute statistics of a metric per calendar day or week.
+
+        Buckets follow UTC (naive timestamps are treated as UTC); weeks
+        start on Monday. Buckets without data points are omitted.
+
+        Args:
+            metric: Metric name
+            bucket: "day" or "week"
+
+        Returns:
+            TrendStats with one row per bucket, timestamped at its start
+        """
+        if bucket not in BUCKETS:
+            raise ValueError(f"Unknown bucket '{bucket}', expected one of {BUCKETS}")
+        rows = self._reported(metric)
+        x = self.column(metric)[rows]
+        days = np.floor(self.ts[rows] / _DAY)
+        if bucket == "week":
+            keys = np.floor((days + _WEEK_SHIFT) / 7) * 7 - _WEEK_SHIFT
+        else:
+            keys = days
+        if not len(x):
+            return _empty_stats([])
+
+        # Rows are in timestamp order, so each bucket is a contiguous run
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        count = np.diff(np.r_[starts, len(x)])
+        mean = np.add.reduceat(x, starts) / count
+        squares = np.add.reduceat((x - np.repeat(mean, count)) ** 2, starts)
+        std = np.full(len(count), np.nan)
+        np.divide(squares, count - 1, out=std, where=count > 1)
+        np.sqrt(std, out=std)
+
+        # Median of each run: sort values within runs, take the middle one(s)
+        group = np.repeat(np.arange(len(count)), count)
+        ordered = x[np.lexsort((x, group))]
+        median = (ordered[starts + (count - 1) // 2] + ordered[starts + count // 2]) / 2
+
+        return TrendStats(
+            timestamps=[_EPOCH + timedelta(days=key) for key in keys[starts].tolist()],
+            count=count,
+            mean=mean,
+            median=median,
+            std=std,
+            min=np.minimum.reduceat(x, starts),
+            max=np.maximum.reduceat(x, starts),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to plain lists for JSON, with None for missing values."""
+        return {
+            "ts": self.ts.tolist(),
+            "timestamps": self.timestamps,
+            "labels": self.labels,
+            "metrics": self.metrics,
+            "values": np.where(np.isnan(self.values), None, self.values).tolist(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "TrendMatrix":
+        """Rebuild a matrix converted with ``to_dict``."""
+        return cls(
+            ts=np.array(data["ts"], dtype=np.float64),
+            timestamps=data["timestamps"],
+            labels=data["labels"],
+            metrics=data["metrics"],
+            values=np.array(data["values"], dtype=np.float64).reshape(
+                len(data["timestamps"]), len(data["metrics"])
+            ),
+        )
+
+
+def normalize_columns(
+    tool: str, columns: Mapping[str, np.ndarray]
+) -> Dict[str, np.ndarray]:
+    """
+    Convert the metric columns of a series to canonical names and units.
+
+    Columns mapping to the same canonical name (e.g. a metric renamed
+    between tool versions) are merged row by row; a value reported under
+    the canonical name wins.
+
+    Args:
+        tool: Tool of the series
+        columns: Metric names and float64 columns, NaN where not reported
+
+    Returns:
+        Dict mapping canonical names to float64 arrays
+    """
+    normalized: Dict[str, np.ndarray] = {}
+    # Aliases first, so that canonically named values overwrite them
+    specs = {name: lookup_metric(tool, name) for name in columns}
+    for name in sorted(columns, key=lambda name: specs[name].name == name):
+        spec = specs[name]
+        column = columns[name]
+        if spec.factor != 1:
+            column = column * spec.factor
+        merged = normalized.get(spec.name)
+        if merged is None:
+            normalized[spec.name] = column
+        else:
+            merged = merged.copy()
+            np.copyto(merged, column, where=~np.isnan(column))
+            normalized[spec.name] = merged
+    return normalized
+
+
+def _empty_stats(
+    timestamps: List[datetime], value: Optional[np.ndarray] = None
+) -> TrendStats:
+    empty = np.empty(0)
+    return TrendStats(
+        timestamps, empty.astype(np.int64), empty, empty, empty, empty, empty, value
+    )
@@ -0,0 +1,89 @@
+"""CLI command for detecting step changes in metric histories."""
+
+import click
+
+from ..storage.index import timestamp_sort_key
+from ..storage.results import get_results_by_ids
+from ..analysis.changepoints import find_changepoints
+from ..analysis.compare import detect_config_changes
+from .options import since_option
+from .remote import fetch_results_by_ids
+from ..utils.format import (
+    format_changepoints_table,
+    print_config_changes,
+    print_error,
+    print_warning,
+    console,
+)
+
+
+@click.command(name="changepoints")
+@click.option("--system", "system_profile_id", required=True, help="System profile ID")
+@click.option("--tool", help="Filter by tool name")
+@click.option(
+    "--category",
+    type=click.Choice(["cpu", "memory", "disk", "network"]),
+    help="Filter by category",
+)
+@click.option(
+    "--metric", "metrics", multiple=True, help="Only this metric (repeatable)"
+)
+@since_option
+@click.pass_context
+def compare_changepoints(ctx, system_profile_id, tool, category, metrics, since):
+    """Detect step changes in metric histories.
+
+    Each metric's full history is segmented wherever its mean shifts by
+    more than the run-to-run noise. Every change is shown with the
+    configuration differences between the results on either side of it.
+    --since only limits which changes are reported.
+    """
+    try:
+        changes = find_changepoints(
+            ctx.obj["RESULTS_PATH"],
+            system_profile_id,
+            category=category,
+            tool=tool,
+            metrics=metrics or None,
+            workers=ctx.obj["JOBS"],
+        )
+        if since:
+            changes = [
+                change
+                for change in changes
+                if timestamp_sort_key(change.timestamp) >= timestamp_sort_key(since)
+            ]
+        if not changes:
+            console.print("[dim]No step changes detected[/]")
+            return
+
+        console.print(format_changepoints_table(system_profile_id, changes))
+
+        # Configuration differences across each distinct pair of results
+        pairs = {}
+        for change in changes:
+            pairs.setdefault((change.before_id, change.after_id), []).append(
+                change.metric
+            )
+        ids = [result_id for pair in pairs for result_id in pair]
+        found = fetch_results_by_ids(ctx, ids)
+        if found is None:
+            found = get_results_by_ids(
+                ids, ctx.obj["RESULTS_PATH"], strict=ctx.obj["STRICT"]
+            )
+        for ((before_id, after_id), names), before, after in zip(
+            pairs.items(), found[::2], found[1::2]
+        ):
+            console.print(
+                f"\n[bold cyan]{before_id} → {after_id}[/]"
+                f" [dim]({', '.join(names)})[/]"
+            )
+            if before is None or after is None:
+                print_warning("Result no longer found")
+                continue
+            print_config_changes(
+                detect_config_changes(before.configuration, after.configuration)
+            )
+    except Exception as e:
+        print_error(f"Failed to detect change points: {e}")
+        ctx.exit(1)
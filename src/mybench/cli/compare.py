@@ -1,23 +1,41 @@
-"""CLI commands for comparing benchmark results."""
+"""CLI commands for comparing benchmark results.
+
+``diff`` and ``trend`` live here; the statistical commands, which load
+NumPy, are imported from their own modules only when invoked.
+"""
 
 import click
 from rich.table import Table
 
-from ..storage.results import get_result_by_id, list_benchmark_results
+from ..storage.results import get_results_by_ids
 from ..analysis.compare import (
     compare_results,
     detect_config_changes,
-    generate_trend_data,
+    load_trend_summary,
 )
+from ..analysis.registry import canonical_names, lookup_metric
+from .main import LazyGroup
+from .options import since_option, until_option, where_option
+from .remote import fetch_results_by_ids, fetch_trend_summary
 from ..utils.format import (
     format_comparison_table,
+    format_trend_stats_table,
+    print_config_changes,
     print_error,
     print_warning,
     console,
 )
 
 
-@click.group(name="compare")
+@click.group(
+    name="compare",
+    cls=LazyGroup,
+    lazy_subcommands={
+        "groups": ".groups:compare_groups_cmd",
+        "gate": ".gate:compare_gate",
+        "changepoints": ".changepoints:compare_changepoints",
+    },
+)
 def compare():
     """Compare benchmark results."""
     pass
@@ -36,71 +54,39 @@ def compare_diff(ctx, result_id1, result_id2, show_config):
     """Compare two benchmark results.
 
     RESULT_ID1 and RESULT_ID2 should be in the format: YYYY-MM-DD_HHMMSS_tool
+    or a unique prefix of one.
     """
     results_dir = ctx.obj["RESULTS_PATH"]
 
     try:
         # Load both results
-        result1 = get_result_by_id(result_id1, results_dir)
-        result2 = get_result_by_id(result_id2, results_dir)
+        found = fetch_results_by_ids(ctx, [result_id1, result_id2])
+        if found is None:
+            found = get_results_by_ids(
+                [result_id1, result_id2], results_dir, strict=ctx.obj["STRICT"]
+            )
+        result1, result2 = found
 
         if result1 is None:
-            print_error(f"Result '{result_id1}' not found")
-            ctx.exit(1)
+            raise ValueError(f"Result '{result_id1}' not found")
 
         if result2 is None:
-            print_error(f"Result '{result_id2}' not found")
-            ctx.exit(1)
+            raise ValueError(f"Result '{result_id2}' not found")
 
         # Compare results
         deltas = compare_results(result1, result2)
 
         # Display comparison
-        table = format_comparison_table(result1, result2, deltas)
+        table = format_comparison_table(deltas)
         console.print(table)
 
         # Show configuration changes if requested
         if show_config:
             console.print("\n[bold cyan]Configuration Changes:[/]\n")
-            changes = detect_config_changes(
-                result1.configuration, result2.configuration
+            print_config_changes(
+                detect_config_changes(result1.configuration, result2.configuration)
             )
 
-            # Display changes
-            has_changes = False
-            if changes["os"]:
-                console.print(
-                    f"[yellow]OS:[/] {changes['os']['old']} → {changes['os']['new']}"  # noqa: E501
-                )
-                has_changes = True
-
-            if changes["kernel"]:
-                console.print("\n[yellow]Kernel:[/]")
-                for key, change in changes["kernel"].items():
-                    console.print(
-                        f"  {key}: {change['old']} → {change['new']}"
-                    )  # noqa: E501
-                has_changes = True
-
-            if changes["software"]:
-                console.print("\n[yellow]Software:[/]")
-                for key, change in changes["software"].items():
-                    console.print(
-                        f"  {key}: {change['old']} → {change['new']}"
-                    )  # noqa: E501
-                has_changes = True
-
-            if changes["environment"]:
-                console.print("\n[yellow]Environment:[/]")
-                for key, change in changes["environment"].items():
-                    console.print(
-                        f"  {key}: {change['old']} → {change['new']}"
-                    )  # noqa: E501
-                has_changes = True
-
-            if not has_changes:
-                console.print("[dim]No configuration changes detected[/]")
-
     except ValueError as e:
         print_error(str(e))
         ctx.exit(1)
@@ -117,57 +103,97 @@ def compare_diff(ctx, result_id1, result_id2, show_config):
     help="Filter by category",
 )
 @click.option("--tool", help="Filter by tool name")
-@click.option("--metric", help="Show trend for specific metric")
+@click.option(
+    "--metric", help="Show trend for specific metric (reported or canonical name)"
+)
+@click.option(
+    "--window",
+    type=click.IntRange(min=1),
+    help="With --metric, show rolling statistics over the last N points",
+)
+@click.option(
+    "--bucket",
+    type=click.Choice(["day", "week"]),
+    help="With --metric, show statistics per day or week (UTC)",
+)
+@since_option
+@until_option
+@where_option
 @click.pass_context
-def compare_trend(ctx, system_profile_id, category, tool, metric):
+def compare_trend(
+    ctx,
+    system_profile_id,
+    category,
+    tool,
+    metric,
+    window,
+    bucket,
+    since,
+    until,
+    where,
+):
     """Show performance trends over time for a system."""
     results_dir = ctx.obj["RESULTS_PATH"]
 
+    if (window or bucket) and not metric:
+        raise click.UsageError("--window and --bucket require --metric")
+    if window and bucket:
+        raise click.UsageError("--window and --bucket cannot be combined")
+
     try:
-        # Load all results for the system
-        results = list_benchmark_results(
-            results_dir,
-            category=category,
+        filters = dict(
             system_profile_id=system_profile_id,
+            category=category,
+            tool=tool,
+            since=since,
+            until=until,
+            where=where,
         )
+        summary = fetch_trend_summary(ctx, **filters)
+        if summary is None:
+            summary = load_trend_summary(
+                results_dir,
+                workers=ctx.obj["JOBS"],
+                strict=ctx.obj["STRICT"],
+                **filters,
+            )
+        total, trends = summary.total, summary.trends
 
-        if not results:
-            print_warning(
-                f"No results found for system '{system_profile_id}'"
-            )  # noqa: E501
-            ctx.exit(0)
-
-        # Filter by tool if specified
-        if tool:
-            results = [r for r in results if r.tool == tool]
-            if not results:
+        if not total:
+            if tool:
                 print_warning(f"No results found for tool '{tool}'")
-                ctx.exit(0)
-
-        # Sort by timestamp
-        results.sort(key=lambda r: r.timestamp)
-
-        # Generate trend data
-        trends = generate_trend_data(results)
+            else:
+                print_warning(
+                    f"No results found for system '{system_profile_id}'"
+                )  # noqa: E501
+            ctx.exit(0)
 
-        if not trends:
+        if not trends.metrics:
             print_warning("No trend data available")
             ctx.exit(0)
 
         # Display trends
         if metric:
             # Show specific metric
-            if metric not in trends:
-                print_error(f"Metric '{metric}' not found in results")
-                console.print(f"[dim]Available metrics: {', '.join(trends.keys())}[/]")
-                ctx.exit(1)
+            if metric not in trends.metrics:
+                # Trends use canonical names; accept the reported ones too
+                metric = _resolve_metric(ctx, trends.metrics, metric, tool)
+
+            if window or bucket:
+                stats = (
+                    trends.rolling(metric, window)
+                    if window
+                    else trends.buckets(metric, bucket)
+                )
+                console.print(format_trend_stats_table(metric, stats, bucket))
+                return
 
             table = Table(title=f"Trend: {metric}")
             table.add_column("Timestamp", style="cyan")
             table.add_column("Value", style="green")
             table.add_column("Label", style="yellow")
 
-            for data_point in trends[metric]:
+            for data_point in trends.points(metric):
                 value = data_point["value"]
                 value_str = (
                     f"{value:.4f}" if isinstance(value, float) else str(value)
@@ -182,13 +208,12 @@ def compare_trend(ctx, system_profile_id, category, tool, metric):
         else:
             # Show all metrics summary
             console.print(f"[bold cyan]Trend Summary for {system_profile_id}[/]\n")
-            console.print(f"Total results: {len(results)}")
+            console.print(f"Total results: {total}")
             console.print(
-                f"Date range: {results[0].timestamp.date()} to {results[-1].timestamp.date()}"
-            )  # noqa: E501
-            console.print(f"\nAvailable metrics ({len(trends)}):")
-            for metric_name in sorted(trends.keys()):
-                data_points = len(trends[metric_name])
+                f"Date range: {summary.first.date()} to {summary.last.date()}"
+            )
+            console.print(f"\nAvailable metrics ({len(trends.metrics)}):")
+            for metric_name, data_points in trends.counts().items():
                 console.print(
                     f"  • {metric_name} ({data_points} data points)"
                 )  # noqa: E501
@@ -197,6 +222,32 @@ def compare_trend(ctx, system_profile_id, category, tool, metric):
                 "\n[dim]Tip: Use --metric <name> to see detailed trend for a specific metric[/]"  # noqa: E501
             )
 
+    except click.exceptions.Exit:
+        # Raised by ctx.exit() above, not a failure
+        raise
     except Exception as e:
         print_error(f"Failed to generate trends: {e}")
         ctx.exit(1)
+
+
+def _resolve_metric(ctx, metrics, metric, tool):
+    """Find the canonical trend metric a reported name stands for."""
+    matches = sorted(canonical_names(metric, tool) & set(metrics))
+    if len(matches) == 1:
+        return matches[0]
+    if matches:
+        print_error(
+            f"Metric '{metric}' is ambiguous ({', '.join(matches)}); "
+            "pass --tool or a canonical name"
+        )
+    else:
+        canonical = lookup_metric(tool or "", metric).name
+        if canonical != metric:
+            print_error(
+                f"Metric '{metric}' (canonical name '{canonical}') "
+                "not found in results"
+            )
+        else:
+            print_error(f"Metric '{metric}' not found in results")
+        console.print(f"[dim]Available metrics: {', '.join(metrics)}[/]")
+    ctx.exit(1)
@@ -0,0 +1,79 @@
+"""CLI command for the regression gate."""
+
+from pathlib import Path
+
+import click
+
+from ..storage import codec
+from ..storage.base import atomic_save_json
+from ..analysis.gate import load_thresholds, run_gate
+from ..utils.format import format_gate_table, print_error, print_success, console
+
+
+@click.command(name="gate")
+@click.option("--system", "system_profile_id", required=True, help="System profile ID")
+@click.option("--tool", required=True, help="Tool name")
+@click.option(
+    "--category",
+    type=click.Choice(["cpu", "memory", "disk", "network"]),
+    help="Category (if the tool has results in several)",
+)
+@click.option(
+    "--baseline",
+    required=True,
+    help="Label of the baseline runs, last:N for the N previous runs, "
+    "or last:N[h|d|w] for the runs of the preceding hours, days or weeks",
+)
+@click.option(
+    "--thresholds",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="YAML file with the allowed regression per metric",
+)
+@click.option("--candidate", help="Result ID to check (default: the newest)")
+@click.option(
+    "--report",
+    type=click.Path(dir_okay=False, allow_dash=True),
+    help="Write a JSON report to this file ('-' for stdout instead of the table)",
+)
+@click.pass_context
+def compare_gate(
+    ctx, system_profile_id, tool, category, baseline, thresholds, candidate, report
+):
+    """Fail if the newest result regressed against a baseline.
+
+    Each gated metric of the candidate is compared with the median of the
+    baseline runs before it. Exits with 0 if every metric is within its
+    threshold, 1 on a regression or a missing required metric, and 2 if
+    the gate could not be evaluated.
+    """
+    try:
+        gate_report = run_gate(
+            ctx.obj["RESULTS_PATH"],
+            system_profile_id,
+            tool,
+            load_thresholds(thresholds),
+            baseline,
+            category=category,
+            candidate_id=candidate,
+            workers=ctx.obj["JOBS"],
+        )
+    except ValueError as e:
+        print_error(str(e))
+        ctx.exit(2)
+    except Exception as e:
+        print_error(f"Failed to evaluate gate: {e}")
+        ctx.exit(2)
+
+    if report == "-":
+        click.echo(codec.dumps(gate_report.to_dict()).decode("utf-8"), nl=False)
+    else:
+        if report:
+            atomic_save_json(Path(report), gate_report.to_dict())
+        console.print(format_gate_table(gate_report))
+        if gate_report.passed:
+            print_success(f"{len(gate_report.checks)} metrics within thresholds")
+        else:
+            failed = ", ".join(check.metric for check in gate_report.failures)
+            print_error(f"Gate failed: {failed}")
+    ctx.exit(0 if gate_report.passed else 1)
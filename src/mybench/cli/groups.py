@@ -0,0 +1,116 @@
+"""CLI command for comparing two groups of benchmark runs."""
+
+import click
+
+from ..storage.results import list_benchmark_results
+from ..analysis.groups import compare_groups
+from .options import since_option, until_option, where_option
+from .remote import fetch_results
+from ..utils.format import format_comparison_table, print_error, console
+
+
+@click.command(name="groups")
+@click.option("--system", "system_profile_id", required=True, help="System profile ID")
+@click.option("--tool", required=True, help="Tool name")
+@click.option(
+    "--category",
+    type=click.Choice(["cpu", "memory", "disk", "network"]),
+    help="Filter by category",
+)
+@click.option("--baseline", required=True, help="Label of the baseline runs")
+@click.option("--candidate", required=True, help="Label of the runs to compare")
+@since_option
+@until_option
+@where_option
+@click.option(
+    "--confidence",
+    type=click.FloatRange(0, 1, min_open=True, max_open=True),
+    default=0.95,
+    show_default=True,
+    help="Confidence level of intervals and tests",
+)
+@click.option(
+    "--resamples",
+    type=click.IntRange(min=100),
+    default=10_000,
+    show_default=True,
+    help="Number of bootstrap resamples",
+)
+@click.option(
+    "--seed",
+    type=int,
+    default=0,
+    show_default=True,
+    help="Random seed of the bootstrap",
+)
+@click.pass_context
+def compare_groups_cmd(
+    ctx,
+    system_profile_id,
+    tool,
+    category,
+    baseline,
+    candidate,
+    since,
+    until,
+    where,
+    confidence,
+    resamples,
+    seed,
+):
+    """Compare all runs with one label against all runs with another.
+
+    Reports mean and median changes per metric, a bootstrap confidence
+    interval of the mean delta and a Mann-Whitney U test. Changes whose
+    interval includes zero or whose test is not significant are marked
+    as within the noise.
+    """
+    filters = dict(
+        system_profile_id=system_profile_id,
+        tool=tool,
+        category=category,
+        since=since,
+        until=until,
+        where=where,
+    )
+
+    try:
+        groups = []
+        for label in (baseline, candidate):
+            results = fetch_results(ctx, label=label, **filters)
+            if results is None:
+                results = list_benchmark_results(
+                    ctx.obj["RESULTS_PATH"],
+                    workers=ctx.obj["JOBS"],
+                    strict=ctx.obj["STRICT"],
+                    label=label,
+                    **filters,
+                )
+            results = list(results)
+            if not results:
+                raise ValueError(f"No {tool} results labeled '{label}' found")
+            groups.append(results)
+
+        deltas = compare_groups(
+            *groups, confidence=confidence, resamples=resamples, seed=seed
+        )
+        table = format_comparison_table(
+            deltas,
+            headers=[
+                f"{label} (n={len(group)})"
+                for label, group in zip((baseline, candidate), groups)
+            ],
+            title=f"Group Comparison: {tool} on {system_profile_id}",
+        )
+        console.print(table)
+        console.print(
+            f"[dim]Means are compared; ≈ marks changes within the noise: the "
+            f"{confidence:.0%} bootstrap CI of the delta includes 0, or the "
+            f"Mann-Whitney U p-value is at least {1 - confidence:.2g}[/]"
+        )
+    except ValueError as e:
+        print_error(str(e))
+        ctx.exit(1)
+    except Exception as e:
+        print_error(f"Failed to compare groups: {e}")
+        ctx.exit(1)
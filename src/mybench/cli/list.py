@@ -4,11 +4,23 @@ import click
 import json
 import csv
 import sys
+import textwrap
+from itertools import chain
 
-from ..storage.results import list_benchmark_results
+from ..analysis.registry import lookup_metric, normalize_metrics
+from ..storage.index import scalar_metrics
+from ..storage.results import (
+    iter_benchmark_results,
+    list_benchmark_results,
+    list_metric_names,
+)
+from .options import output_format_option, since_option, until_option, where_option
+from .remote import fetch_metric_names, fetch_results
 from ..utils.format import (
     format_benchmark_results_table,
     print_error,
+    use_plain_output,
+    write_benchmark_results_tsv,
     console,
 )
 
@@ -23,33 +35,142 @@ from ..utils.format import (
     "--system", "system_profile_id", help="Filter by system profile ID"
 )  # noqa: E501
 @click.option("--label", help="Filter by label")
+@click.option("--tool", help="Filter by tool name")
+@since_option
+@until_option
+@where_option
+@click.option(
+    "--sort-by",
+    default="timestamp",
+    show_default=True,
+    help="Sort by timestamp, category, tool, system, label or a metric name",
+)
+@click.option(
+    "--order",
+    type=click.Choice(["desc", "asc"]),
+    default="desc",
+    show_default=True,
+    help="Sort order",
+)
+@click.option(
+    "--limit", type=click.IntRange(min=1), help="Show at most this many results"
+)
+@click.option(
+    "--offset",
+    type=click.IntRange(min=0),
+    default=0,
+    help="Skip this many results first",
+)
 @click.option(
     "--export",
-    type=click.Choice(["json", "csv"]),
-    help="Export results to JSON or CSV format",
+    type=click.Choice(["json", "ndjson", "csv"]),
+    help="Export results to JSON, newline-delimited JSON or CSV format",
+)
+@click.option(
+    "--raw-metrics",
+    is_flag=True,
+    help="With --export csv, keep metric names and units as reported",
 )
+@output_format_option
 @click.pass_context
-def list_cmd(ctx, category, system_profile_id, label, export):
-    """List benchmark results with optional filters."""
+def list_cmd(
+    ctx,
+    category,
+    system_profile_id,
+    label,
+    tool,
+    since,
+    until,
+    where,
+    sort_by,
+    order,
+    limit,
+    offset,
+    export,
+    raw_metrics,
+    output_format,
+    plain,
+):
+    """List benchmark results with optional filters.
+
+    On a terminal results are shown as a table. When piped, or with
+    --plain or --format tsv, rows are written as tab-separated values as
+    they are read.
+
+    CSV exports convert metrics to canonical names and units (see the
+    metric registry) unless --raw-metrics is given; JSON exports keep
+    results as stored.
+    """
     results_dir = ctx.obj["RESULTS_PATH"]
 
+    query = dict(
+        category=category,
+        system_profile_id=system_profile_id,
+        label=label,
+        tool=tool,
+        since=since,
+        until=until,
+        where=where,
+    )
+    paging = dict(
+        sort_by=sort_by, descending=order == "desc", limit=limit, offset=offset
+    )
+    paged = sort_by != "timestamp" or order != "desc" or limit or offset
+    plain = not export and use_plain_output(output_format, plain)
+    # Exports and plain rows are written while results are still being read
+    streamed = (export or plain) and not paged
+    workers = ctx.obj["JOBS"]
+
     try:
-        results = list_benchmark_results(
-            results_dir,
-            category=category,
-            system_profile_id=system_profile_id,
-            label=label,
+        metric_names = None
+        results = fetch_results(
+            ctx, raw_output=export in ("json", "ndjson"), **query, **paging
         )
+        if results is not None and export == "csv" and not paged:
+            metric_names = fetch_metric_names(ctx, by_tool=True, **query)
 
-        if not results:
-            console.print("[yellow]No benchmark results found[/]")
-            return
+        if results is None:
+            if streamed:
+                # Stream rows instead of loading every result first
+                results = iter_benchmark_results(
+                    results_dir, workers=workers, strict=ctx.obj["STRICT"], **query
+                )
+            else:
+                results = list_benchmark_results(
+                    results_dir,
+                    workers=workers,
+                    strict=ctx.obj["STRICT"],
+                    **paging,
+                    **query,
+                )
+
+        if streamed:
+            first = next(results, None)
+            if first is None:
+                console.print("[yellow]No benchmark results found[/]")
+                return
+            results = chain([first], results)
+        else:
+            results = list(results)
+            if not results:
+                console.print("[yellow]No benchmark results found[/]")
+                return
 
         # Export to requested format
         if export == "json":
             _export_json(results)
+        elif export == "ndjson":
+            _export_ndjson(results)
         elif export == "csv":
-            _export_csv(results)
+            if paged:
+                metric_names = {(r.tool, key) for r in results for key in r.results}
+            elif metric_names is None:
+                metric_names = list_metric_names(
+                    results_dir, workers=workers, by_tool=True, **query
+                )
+            _export_csv(results, metric_names, normalize=not raw_metrics)
+        elif plain:
+            write_benchmark_results_tsv(results)
         else:
             # Default table view
             table = format_benchmark_results_table(results)
@@ -60,22 +181,45 @@ def list_cmd(ctx, category, system_profile_id, label, export):
         ctx.exit(1)
 
 
+def _export_data(result):
+    """Dump a result for export, with raw output inline instead of a sidecar."""
+    try:
+        result = result.inline_raw_output()
+    except FileNotFoundError as e:
+        # stdout holds the export
+        print(f"Warning: Exporting without raw output: {e}", file=sys.stderr)
+        result = result.model_copy(update={"raw_output_file": None})
+    return result.model_dump(mode="json")
+
+
 def _export_json(results):
-    """Export results to JSON format."""
-    output = []
+    """Export results to JSON format, writing each result as it is read."""
+    separator = "[\n"
     for result in results:
-        output.append(result.model_dump(mode="json"))
+        text = json.dumps(_export_data(result), indent=2, default=str)
+        sys.stdout.write(separator + textwrap.indent(text, "  "))
+        separator = ",\n"
+    sys.stdout.write("\n]\n" if separator != "[\n" else "[]\n")
 
-    json.dump(output, sys.stdout, indent=2, default=str)
-    sys.stdout.write("\n")
+
+def _export_ndjson(results):
+    """Export results as newline-delimited JSON, one result per line."""
+    for result in results:
+        sys.stdout.write(json.dumps(_export_data(result), default=str))
+        sys.stdout.write("\n")
 
 
-def _export_csv(results):
-    """Export results to CSV format."""
-    if not results:
-        return
+def _export_csv(results, metric_names, normalize=False):
+    """Export results to CSV format with one column per metric name.
 
-    # Extract fields from first result
+    ``metric_names`` are the (tool, name) pairs of the results. With
+    normalize, metrics are written under their canonical names and
+    numeric values converted to canonical units.
+    """
+    if normalize:
+        names = {lookup_metric(tool, name).name for tool, name in metric_names}
+    else:
+        names = {name for _, name in metric_names}
     fieldnames = [
         "timestamp",
         "category",
@@ -85,11 +229,9 @@ def _export_csv(results):
     ]
 
     # Add result metrics as separate columns
-    if results[0].results:
-        for key in results[0].results.keys():
-            fieldnames.append(f"result_{key}")
+    fieldnames.extend(f"result_{name}" for name in sorted(names))
 
-    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames)
+    writer = csv.DictWriter(sys.stdout, fieldnames=fieldnames, restval="")
     writer.writeheader()
 
     for result in results:
@@ -102,7 +244,17 @@ def _export_csv(results):
         }
 
         # Add result metrics
-        for key, value in result.results.items():
+        metrics = result.results
+        if normalize:
+            # Values as stored, so that integers stay integers
+            scalar = {key: metrics[key] for key in scalar_metrics(result)}
+            metrics = {
+                lookup_metric(result.tool, key).name: value
+                for key, value in metrics.items()
+                if key not in scalar
+            }
+            metrics.update(normalize_metrics(result.tool, scalar))
+        for key, value in metrics.items():
             row[f"result_{key}"] = value
 
         writer.writerow(row)
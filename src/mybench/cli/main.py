@@ -1,23 +1,72 @@
 """Main CLI entry point."""
 
+import importlib
+
 import click
 from pathlib import Path
 
-from .system import system
-from .save import save_cmd
-from .list import list_cmd
-from .show import show_cmd
-from .compare import compare
-
 
 # Get project version
 __version__ = "0.1.0"
 
 
-@click.group()
+class LazyGroup(click.Group):
+    """
+    Command group that imports each subcommand's module on first use.
+
+    Subcommands pull in Rich, Pydantic and the storage layer, so
+    ``mybench --version`` or a single command only pays for what it runs.
+    """
+
+    def __init__(self, *args, lazy_subcommands=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        # command name -> "module:attribute", relative to this package
+        self.lazy_subcommands = lazy_subcommands or {}
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | set(self.lazy_subcommands))
+
+    def get_command(self, ctx, cmd_name):
+        if cmd_name not in self.commands and cmd_name in self.lazy_subcommands:
+            module_name, attr = self.lazy_subcommands[cmd_name].split(":")
+            module = importlib.import_module(module_name, __package__)
+            self.add_command(getattr(module, attr), name=cmd_name)
+        return super().get_command(ctx, cmd_name)
+
+
+@click.group(
+    cls=LazyGroup,
+    lazy_subcommands={
+        "system": ".system:system",
+        "save": ".save:save_cmd",
+        "list": ".list:list_cmd",
+        "show": ".show:show_cmd",
+        "compare": ".compare:compare",
+        "migrate": ".migrate:migrate_cmd",
+        "serve": ".serve:serve_cmd",
+    },
+)
 @click.version_option(version=__version__, prog_name="mybench")
+@click.option(
+    "--jobs",
+    "-j",
+    type=click.IntRange(min=0),
+    default=1,
+    show_default=True,
+    help="Worker processes for loading files (0 = one per CPU)",
+)
+@click.option(
+    "--strict",
+    is_flag=True,
+    help="Fully validate every result file, even unchanged ones",
+)
+@click.option(
+    "--no-daemon",
+    is_flag=True,
+    help="Read files directly even if `mybench serve` is running",
+)
 @click.pass_context
-def cli(ctx):
+def cli(ctx, jobs, strict, no_daemon):
     """
     Linux Server Benchmark Documentation Toolkit.
 
@@ -32,14 +81,16 @@ def cli(ctx):
     ctx.obj["SYSTEMS_PATH"] = ctx.obj["BASE_PATH"] / "systems"
     ctx.obj["RESULTS_PATH"] = ctx.obj["BASE_PATH"] / "results"
     ctx.obj["DOCS_PATH"] = ctx.obj["BASE_PATH"] / "docs"
+    ctx.obj["JOBS"] = jobs
+    ctx.obj["STRICT"] = strict
 
+    # Answer queries through a running daemon unless files must be
+    # validated here
+    ctx.obj["DAEMON"] = None
+    if not (strict or no_daemon):
+        from ..daemon.client import DaemonClient
 
-# Register subcommands
-cli.add_command(system)
-cli.add_command(save_cmd, name="save")
-cli.add_command(list_cmd, name="list")
-cli.add_command(show_cmd, name="show")
-cli.add_command(compare)
+        ctx.obj["DAEMON"] = DaemonClient.find(ctx.obj["RESULTS_PATH"])
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+"""CLI command for migrating the results directory layout."""
+
+import click
+
+from ..storage.layout import LAYOUTS
+from ..storage.results import migrate_results_layout
+from ..utils.format import print_success, print_error
+
+
+@click.command(name="migrate")
+@click.option(
+    "--layout",
+    type=click.Choice(LAYOUTS),
+    default="sharded",
+    show_default=True,
+    help="Target layout: flat (<category>/) or sharded (<category>/YYYY/MM/)",
+)
+@click.pass_context
+def migrate_cmd(ctx, layout):
+    """Move result files into another directory layout."""
+    results_dir = ctx.obj["RESULTS_PATH"]
+
+    try:
+        moved = migrate_results_layout(results_dir, layout)
+        print_success(f"Moved {moved} result files to the {layout} layout")
+    except Exception as e:
+        print_error(f"Failed to migrate results: {e}")
+        ctx.exit(1)
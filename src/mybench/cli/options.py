@@ -0,0 +1,74 @@
+"""Reusable CLI options shared by several commands."""
+
+from datetime import time, timedelta
+
+import click
+
+from ..storage.query import parse_where
+
+_TIME_FORMATS = ["%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%Y-%m-%d %H:%M:%S"]
+
+
+def _end_of_day(ctx, param, value):
+    """Make a bare --until date cover the whole day."""
+    if value is not None and value.time() == time(0, 0):
+        return value + timedelta(days=1, microseconds=-1)
+    return value
+
+
+def since_option(func):
+    """Add a --since option for the start of a time range."""
+    return click.option(
+        "--since",
+        type=click.DateTime(formats=_TIME_FORMATS),
+        help="Only results at or after this time (YYYY-MM-DD[ HH:MM:SS])",
+    )(func)
+
+
+def until_option(func):
+    """Add an --until option for the (inclusive) end of a time range."""
+    return click.option(
+        "--until",
+        type=click.DateTime(formats=_TIME_FORMATS),
+        callback=_end_of_day,
+        help="Only results at or before this time (a bare date includes the whole day)",  # noqa: E501
+    )(func)
+
+
+def _parse_where(ctx, param, value):
+    """Compile a --where expression, reporting syntax errors as usage errors."""
+    if value is None:
+        return None
+    try:
+        return parse_where(value)
+    except ValueError as e:
+        raise click.BadParameter(str(e)) from e
+
+
+def where_option(func):
+    """Add a --where option filtering results by metric values."""
+    return click.option(
+        "--where",
+        callback=_parse_where,
+        help="Only results whose metrics match an expression, e.g. \"iops_read>50000 and lat_p99_us<2000\"",  # noqa: E501
+    )(func)
+
+
+def plain_option(func):
+    """Add a --plain flag writing unformatted text instead of Rich output."""
+    return click.option(
+        "--plain",
+        is_flag=True,
+        help="Write plain text without Rich formatting (default when not a terminal)",  # noqa: E501
+    )(func)
+
+
+def output_format_option(func):
+    """Add --format and --plain options choosing a Rich table or TSV rows."""
+    func = plain_option(func)
+    return click.option(
+        "--format",
+        "output_format",
+        type=click.Choice(["table", "tsv"]),
+        help="Output format [default: table on a terminal, tsv otherwise; --plain means tsv]",  # noqa: E501
+    )(func)
@@ -0,0 +1,94 @@
+"""Answer CLI queries through a running ``mybench serve`` daemon.
+
+Each helper returns None when no daemon is available, in which case the
+command reads the files itself.
+"""
+
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Iterator, List, Optional, Sequence
+
+from ..daemon.client import DaemonUnavailable
+from ..models.result import BenchmarkResult
+from ..models.system import SystemProfile
+from ..storage.results import construct_benchmark_result
+
+if TYPE_CHECKING:
+    from ..analysis.compare import TrendSummary
+
+
+def fetch_results(
+    ctx, raw_output: bool = False, **params: Any
+) -> Optional[Iterator[BenchmarkResult]]:
+    """Stream results matching ``list_benchmark_results`` parameters."""
+    client = ctx.obj["DAEMON"]
+    if client is None:
+        return None
+    try:
+        return map(
+            construct_benchmark_result,
+            client.results(raw_output=raw_output, **params),
+        )
+    except DaemonUnavailable:
+        return None
+
+
+def fetch_metric_names(ctx, by_tool: bool = False, **filters: Any) -> Optional[List]:
+    """Get the union of result keys over matching results."""
+    client = ctx.obj["DAEMON"]
+    if client is None:
+        return None
+    try:
+        names = client.get("metric-names", by_tool=by_tool, **filters)
+    except DaemonUnavailable:
+        return None
+    return [tuple(pair) for pair in names] if by_tool else names
+
+
+def fetch_results_by_ids(
+    ctx, result_ids: Sequence[str], raw_output: bool = False
+) -> Optional[List[Optional[BenchmarkResult]]]:
+    """Find results by ID or unique prefix, None where not found."""
+    client = ctx.obj["DAEMON"]
+    if client is None:
+        return None
+    try:
+        found = client.results_by_ids(result_ids, raw_output=raw_output)
+    except DaemonUnavailable:
+        return None
+    return [
+        None if data is None else construct_benchmark_result(data) for data in found
+    ]
+
+
+def fetch_trend_summary(ctx, **filters: Any) -> Optional["TrendSummary"]:
+    """Collect trend data for a system, as ``load_trend_summary``."""
+    # The trend engine loads NumPy, which other commands do not need
+    from ..analysis.compare import TrendSummary
+    from ..analysis.trend import TrendMatrix
+
+    client = ctx.obj["DAEMON"]
+    if client is None:
+        return None
+    try:
+        data = client.get("trend", **filters)
+    except DaemonUnavailable:
+        return None
+
+    trends = TrendMatrix.from_dict(data["trends"])
+    first, last = (
+        None if data[key] is None else datetime.fromisoformat(data[key])
+        for key in ("first", "last")
+    )
+    return TrendSummary(data["total"], first, last, trends)
+
+
+def fetch_system_profiles(ctx) -> Optional[List[SystemProfile]]:
+    """List all system profiles."""
+    client = ctx.obj["DAEMON"]
+    if client is None:
+        return None
+    try:
+        profiles = client.get("profiles")
+    except DaemonUnavailable:
+        return None
+    return [SystemProfile.model_validate(data) for data in profiles]
@@ -2,6 +2,7 @@
 
 import click
 import json
+import sys
 from datetime import datetime
 from pathlib import Path
 from pydantic import ValidationError
@@ -12,20 +13,72 @@ from ..models.config import (
     KernelConfig,
     SoftwareVersions,
 )
-from ..storage.results import save_benchmark_result
+from ..storage import codec
+from ..storage.results import save_benchmark_result, save_benchmark_results
 from ..storage.profiles import profile_exists
 from ..utils.format import print_success, print_error, console
 
 
+def _read_batch(data: bytes) -> list:
+    """Parse a batch file holding a JSON array or one JSON object per line."""
+    if data.lstrip().startswith(b"["):
+        return codec.loads(data)
+    return [codec.loads(line) for line in data.splitlines() if line.strip()]
+
+
+def _save_batch(ctx, batch):
+    """Save every result in a batch file ('-' for stdin)."""
+    systems_dir = ctx.obj["SYSTEMS_PATH"]
+    results_dir = ctx.obj["RESULTS_PATH"]
+
+    try:
+        if batch == "-":
+            entries = _read_batch(sys.stdin.buffer.read())
+        else:
+            with open(batch, "rb") as f:
+                entries = _read_batch(f.read())
+    except (OSError, ValueError) as e:
+        print_error(f"Failed to read batch file: {e}")
+        ctx.exit(1)
+
+    # Validate the whole batch before writing anything
+    results = []
+    errors = []
+    for i, entry in enumerate(entries, 1):
+        try:
+            results.append(BenchmarkResult.model_validate(entry))
+        except ValidationError as e:
+            errors.append(f"Entry {i}: {e}")
+    for system_profile_id in sorted({r.system_profile_id for r in results}):
+        if not profile_exists(system_profile_id, systems_dir):
+            errors.append(f"System profile '{system_profile_id}' not found")
+    if errors:
+        for error in errors:
+            print_error(error)
+        ctx.exit(1)
+
+    try:
+        filepaths = save_benchmark_results(results, results_dir)
+    except Exception as e:
+        print_error(f"Failed to save results: {e}")
+        ctx.exit(1)
+
+    print_success(f"Saved {len(filepaths)} benchmark results")
+
+
 @click.command(name="save")
+@click.option(
+    "--batch",
+    type=click.Path(exists=True, dir_okay=False, allow_dash=True),
+    help="Save all results in a JSON array or JSON Lines file ('-' for stdin)",
+)
 @click.option(
     "--category",
     type=click.Choice(["cpu", "memory", "disk", "network"]),
-    prompt=True,
     help="Benchmark category",
 )
-@click.option("--tool", prompt=True, help="Benchmark tool name")
-@click.option("--system", "system_profile_id", prompt=True, help="System profile ID")
+@click.option("--tool", help="Benchmark tool name")
+@click.option("--system", "system_profile_id", help="System profile ID")
 @click.option("--label", help="Optional label for this result")
 @click.option(
     "--config-file",
@@ -38,8 +91,49 @@ from ..utils.format import print_success, print_error, console
     help="JSON file with benchmark results",
 )
 @click.pass_context
-def save_cmd(ctx, category, tool, system_profile_id, label, config_file, results_file):
-    """Save a benchmark result."""
+def save_cmd(
+    ctx,
+    batch,
+    category,
+    tool,
+    system_profile_id,
+    label,
+    config_file,
+    results_file,
+):
+    """
+    Save a benchmark result.
+
+    With --batch, saves many results in one pass instead of prompting for
+    a single one.
+    """
+    if batch:
+        single = [
+            name
+            for name, value in [
+                ("--category", category),
+                ("--tool", tool),
+                ("--system", system_profile_id),
+                ("--label", label),
+                ("--config-file", config_file),
+                ("--results-file", results_file),
+            ]
+            if value is not None
+        ]
+        if single:
+            raise click.UsageError(f"--batch cannot be combined with {single[0]}")
+        _save_batch(ctx, batch)
+        return
+
+    if category is None:
+        category = click.prompt(
+            "Category", type=click.Choice(["cpu", "memory", "disk", "network"])
+        )
+    if tool is None:
+        tool = click.prompt("Tool", type=str)
+    if system_profile_id is None:
+        system_profile_id = click.prompt("System profile id", type=str)
+
     systems_dir = ctx.obj["SYSTEMS_PATH"]
     results_dir = ctx.obj["RESULTS_PATH"]
 
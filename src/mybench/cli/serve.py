@@ -0,0 +1,44 @@
+"""CLI command for running the query daemon."""
+
+import signal
+import sys
+
+import click
+
+from ..daemon.server import create_server
+from ..utils.format import print_error, print_info
+
+
+@click.command(name="serve")
+@click.option(
+    "--verbose", "-v", is_flag=True, help="Log every request to stderr"
+)
+@click.pass_context
+def serve_cmd(ctx, verbose):
+    """Keep results in memory and answer queries over a Unix socket.
+
+    While the daemon runs, list, show, compare and `system list` are
+    answered by it instead of re-reading files.
+    """
+    results_dir = ctx.obj["RESULTS_PATH"]
+
+    try:
+        server = create_server(
+            results_dir,
+            ctx.obj["SYSTEMS_PATH"],
+            workers=ctx.obj["JOBS"],
+            verbose=verbose,
+        )
+    except Exception as e:
+        print_error(f"Failed to start daemon: {e}")
+        ctx.exit(1)
+
+    # Remove the socket on SIGTERM as well as Ctrl-C
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    print_info(f"Serving {results_dir} on {server.server_address}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -3,30 +3,53 @@
 import click
 
 from ..storage.results import get_result_by_id
+from .options import plain_option
+from .remote import fetch_results_by_ids
 from ..utils.format import (
     format_benchmark_result_detail,
     print_error,
+    print_warning,
+    use_plain_output,
 )
 
 
 @click.command(name="show")
 @click.argument("result_id")
+@plain_option
 @click.pass_context
-def show_cmd(ctx, result_id):
+def show_cmd(ctx, result_id, plain):
     """Show detailed information about a benchmark result.
 
     RESULT_ID should be in the format: YYYY-MM-DD_HHMMSS_tool
-    (e.g., 2025-11-09_143022_sysbench)
+    (e.g., 2025-11-09_143022_sysbench) or a unique prefix of one.
+
+    The JSON is highlighted on a terminal and written as-is when piped
+    or with --plain.
     """
     results_dir = ctx.obj["RESULTS_PATH"]
 
     try:
-        result = get_result_by_id(result_id, results_dir)
+        found = fetch_results_by_ids(ctx, [result_id], raw_output=True)
+        if found is not None:
+            result = found[0]
+        else:
+            result = get_result_by_id(
+                result_id, results_dir, strict=ctx.obj["STRICT"]
+            )
         if result is None:
             print_error(f"Result '{result_id}' not found")
             ctx.exit(1)
 
-        format_benchmark_result_detail(result)
+        # Raw output lives in a compressed sidecar; only read it here
+        try:
+            result = result.inline_raw_output()
+        except FileNotFoundError as e:
+            print_warning(f"Raw output unavailable: {e}")
+
+        format_benchmark_result_detail(result, plain=use_plain_output(plain=plain))
+    except click.exceptions.Exit:
+        # Raised by ctx.exit() above, not a failure
+        raise
     except Exception as e:
         print_error(f"Failed to load result: {e}")
         ctx.exit(1)
@@ -17,15 +17,20 @@ from ..models.system import (
 )
 from ..storage.profiles import (
     save_system_profile,
+    compile_profile_catalog,
     load_system_profile,
     list_system_profiles,
     profile_exists,
 )
+from .options import output_format_option, plain_option
+from .remote import fetch_system_profiles
 from ..utils.format import (
     format_system_profiles_table,
     format_system_profile_detail,
     print_success,
     print_error,
+    use_plain_output,
+    write_system_profiles_tsv,
     console,
 )
 from ..utils.detect import (
@@ -290,34 +295,55 @@ def detect_profile(ctx, profile_id, name):
 
 
 @system.command(name="list")
+@output_format_option
 @click.pass_context
-def list_profiles(ctx):
+def list_profiles(ctx, output_format, plain):
     """List all system profiles."""
     systems_dir = ctx.obj["SYSTEMS_PATH"]
 
     try:
-        profiles = list_system_profiles(systems_dir)
+        profiles = fetch_system_profiles(ctx)
+        if profiles is None:
+            profiles = list_system_profiles(systems_dir, workers=ctx.obj["JOBS"])
         if not profiles:
             console.print("[yellow]No system profiles found[/]")
             return
 
-        table = format_system_profiles_table(profiles)
-        console.print(table)
+        if use_plain_output(output_format, plain):
+            write_system_profiles_tsv(profiles)
+        else:
+            table = format_system_profiles_table(profiles)
+            console.print(table)
     except Exception as e:
         print_error(f"Failed to list profiles: {e}")
         ctx.exit(1)
 
 
+@system.command(name="catalog")
+@click.pass_context
+def compile_catalog(ctx):
+    """Compile all profiles into a single catalog file for fast loading."""
+    systems_dir = ctx.obj["SYSTEMS_PATH"]
+
+    try:
+        filepath = compile_profile_catalog(systems_dir, workers=ctx.obj["JOBS"])
+        print_success(f"Profile catalog written: {filepath.relative_to(Path.cwd())}")
+    except Exception as e:
+        print_error(f"Failed to compile catalog: {e}")
+        ctx.exit(1)
+
+
 @system.command(name="show")
 @click.argument("profile_id")
+@plain_option
 @click.pass_context
-def show_profile(ctx, profile_id):
+def show_profile(ctx, profile_id, plain):
     """Show detailed information about a system profile."""
     systems_dir = ctx.obj["SYSTEMS_PATH"]
 
     try:
         profile = load_system_profile(profile_id, systems_dir)
-        format_system_profile_detail(profile)
+        format_system_profile_detail(profile, plain=use_plain_output(plain=plain))
     except FileNotFoundError:
         print_error(f"Profile '{profile_id}' not found")
         ctx.exit(1)
@@ -0,0 +1,166 @@
+"""Client for a running ``mybench serve`` daemon.
+
+Kept free of Pydantic and Rich so that looking for a daemon costs the
+CLI almost nothing at startup; callers build models from the returned
+JSON themselves.
+"""
+
+import http.client
+import json
+import socket
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+from urllib.parse import urlencode
+
+SOCKET_FILENAME = ".mybench.sock"
+
+
+class DaemonUnavailable(OSError):
+    """No daemon answered on the socket."""
+
+
+def socket_path(results_dir: Path) -> Path:
+    """
+    Get the path of the daemon socket for a results directory.
+
+    Args:
+        results_dir: Base results directory
+
+    Returns:
+        Path to ``results/.mybench.sock``
+    """
+    return results_dir / SOCKET_FILENAME
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP connection over a Unix domain socket."""
+
+    def __init__(self, path: Path, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(str(self.unix_path))
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def _encode(value: Any) -> str:
+    if isinstance(value, bool):
+        return "1" if value else "0"
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+class DaemonClient:
+    """Queries a daemon over HTTP on its Unix socket."""
+
+    def __init__(self, path: Path, timeout: float = 60.0):
+        self.path = path
+        self.timeout = timeout
+
+    @classmethod
+    def find(cls, results_dir: Path) -> Optional["DaemonClient"]:
+        """
+        Look for a daemon serving a results directory.
+
+        Only checks that the socket exists; a stale socket surfaces as
+        DaemonUnavailable on the first request.
+
+        Args:
+            results_dir: Base results directory
+
+        Returns:
+            DaemonClient, or None if no daemon socket exists
+        """
+        path = socket_path(results_dir)
+        return cls(path) if path.is_socket() else None
+
+    def _request(self, endpoint: str, params: Dict[str, Any]) -> Any:
+        """Send a GET request and return the open response."""
+        query = urlencode(
+            [
+                (key, _encode(item))
+                for key, value in params.items()
+                if value is not None
+                for item in (value if isinstance(value, list) else [value])
+            ]
+        )
+        conn = _UnixHTTPConnection(self.path, self.timeout)
+        try:
+            conn.request("GET", f"/{endpoint}?{query}")
+            response = conn.getresponse()
+        except OSError as e:
+            conn.close()
+            raise DaemonUnavailable(f"No daemon at {self.path}: {e}") from e
+
+        if response.status != 200:
+            message = response.read().decode("utf-8", "replace")
+            conn.close()
+            if response.status == 400:
+                raise ValueError(message)
+            raise RuntimeError(f"Daemon error: {message}")
+        return response
+
+    def get(self, endpoint: str, **params: Any) -> Any:
+        """
+        Fetch a JSON document.
+
+        Args:
+            endpoint: Endpoint name, e.g. ``"metric-names"``
+            **params: Query parameters; None values are left out
+
+        Returns:
+            Decoded JSON response
+
+        Raises:
+            DaemonUnavailable: If no daemon answers
+            ValueError: If the daemon rejected the request
+        """
+        response = self._request(endpoint, params)
+        with response:
+            return json.loads(response.read())
+
+    def iter_lines(self, endpoint: str, **params: Any) -> Iterator[Any]:
+        """
+        Fetch a newline-delimited JSON stream.
+
+        The request is sent immediately, so an unavailable daemon is
+        reported by this call rather than on iteration.
+
+        Args:
+            endpoint: Endpoint name, e.g. ``"results"``
+            **params: Query parameters; None values are left out
+
+        Returns:
+            Iterator over the decoded lines
+
+        Raises:
+            DaemonUnavailable: If no daemon answers
+            ValueError: If the daemon rejected the request
+        """
+        response = self._request(endpoint, params)
+
+        def lines() -> Iterator[Any]:
+            with response:
+                for line in response:
+                    yield json.loads(line)
+
+        return lines()
+
+    def results(self, **params: Any) -> Iterator[Dict[str, Any]]:
+        """Stream results as dicts; takes list_benchmark_results' filters."""
+        return self.iter_lines("results", **params)
+
+    def results_by_ids(
+        self, result_ids: Sequence[str], raw_output: bool = False
+    ) -> List[Optional[Dict[str, Any]]]:
+        """Fetch results by ID or unique prefix, None where not found."""
+        return self.get("result", id=list(result_ids), raw_output=raw_output)
@@ -0,0 +1,303 @@
+"""Long-running query daemon behind ``mybench serve``.
+
+The daemon answers read-only queries over HTTP on a Unix socket at
+``results/.mybench.sock``. Compared to a fresh CLI process it skips
+interpreter startup and keeps loaded results, configurations and
+profiles in memory. ``results/`` and ``systems/`` are watched (inotify
+on Linux, polling elsewhere), so each query only re-reads the files
+created, modified, renamed or deleted since the previous one.
+
+Endpoints (all ``GET``, JSON responses):
+
+- ``/ping``: daemon version and process ID
+- ``/results``: matching results as newline-delimited JSON; takes the
+  filter, sorting and paging parameters of ``list_benchmark_results``
+  (``raw_output=1`` includes the raw tool output)
+- ``/result?id=...``: results by ID or unique prefix (``id`` may repeat;
+  ``raw_output=1`` includes the raw tool output)
+- ``/metric-names``: union of result keys over matching results
+  (``by_tool=1`` for ``[tool, name]`` pairs)
+- ``/trend``: trend summary of a system (``system_profile_id`` required)
+- ``/profiles``: all system profiles
+
+For example::
+
+    curl --unix-socket results/.mybench.sock \
+        'http://localhost/results?tool=fio&where=iops>50000&limit=5'
+"""
+
+import json
+import os
+import socket
+import socketserver
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from .. import __version__
+from ..analysis.compare import load_trend_summary
+from ..models.result import BenchmarkResult
+from ..storage.profiles import list_system_profiles
+from ..storage.configurations import CONFIGURATIONS_DIRNAME
+from ..storage.query import parse_where
+from ..storage.results import (
+    enable_result_cache,
+    get_results_by_ids,
+    list_benchmark_results,
+    list_metric_names,
+)
+from ..storage.watch import unwatch, watch
+from .client import socket_path
+
+Query = Dict[str, List[str]]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _dumps(data: Any) -> bytes:
+    return json.dumps(data, default=_json_default).encode("utf-8")
+
+
+def _filters(query: Query) -> Dict[str, Any]:
+    """Parse the result filters shared by several endpoints."""
+    filters: Dict[str, Any] = {}
+    for name in ("category", "system_profile_id", "label", "tool"):
+        if name in query:
+            filters[name] = query[name][-1]
+    for name in ("since", "until"):
+        if name in query:
+            filters[name] = datetime.fromisoformat(query[name][-1])
+    if "where" in query:
+        filters["where"] = parse_where(query["where"][-1])
+    return filters
+
+
+def _int(query: Query, name: str) -> Optional[int]:
+    return int(query[name][-1]) if name in query else None
+
+
+def _flag(query: Query, name: str, default: bool = False) -> bool:
+    return query[name][-1] == "1" if name in query else default
+
+
+class ResultService:
+    """Answers daemon queries against one results and systems directory."""
+
+    def __init__(self, results_dir: Path, systems_dir: Path, workers: int = 1):
+        self.results_dir = results_dir
+        self.systems_dir = systems_dir
+        self.workers = workers
+
+    def warm_up(self) -> int:
+        """
+        Build the index and load every result and profile into memory.
+
+        Returns:
+            Number of results loaded
+        """
+        list_system_profiles(self.systems_dir, workers=self.workers)
+        return len(list_benchmark_results(self.results_dir, workers=self.workers))
+
+    def ping(self, query: Query) -> Dict[str, Any]:
+        return {"version": __version__, "pid": os.getpid()}
+
+    def results(self, query: Query) -> Iterator[Dict[str, Any]]:
+        results = list_benchmark_results(
+            self.results_dir,
+            workers=self.workers,
+            sort_by=query.get("sort_by", ["timestamp"])[-1],
+            descending=_flag(query, "descending", default=True),
+            limit=_int(query, "limit"),
+            offset=_int(query, "offset") or 0,
+            **_filters(query),
+        )
+        return (self._dump(result, query) for result in results)
+
+    def result(self, query: Query) -> List[Optional[Dict[str, Any]]]:
+        results = get_results_by_ids(query.get("id", []), self.results_dir)
+        return [
+            None if result is None else self._dump(result, query)
+            for result in results
+        ]
+
+    def _dump(self, result: BenchmarkResult, query: Query) -> Dict[str, Any]:
+        if _flag(query, "raw_output"):
+            try:
+                result = result.inline_raw_output()
+            except FileNotFoundError:
+                # Reported by the client when it tries to read the sidecar
+                pass
+        return result.model_dump(mode="json")
+
+    def metric_names(self, query: Query) -> List[Any]:
+        return list_metric_names(
+            self.results_dir,
+            workers=self.workers,
+            by_tool=_flag(query, "by_tool"),
+            **_filters(query),
+        )
+
+    def trend(self, query: Query) -> Dict[str, Any]:
+        filters = _filters(query)
+        if "system_profile_id" not in filters:
+            raise ValueError("system_profile_id is required")
+        filters.pop("label", None)
+        summary = load_trend_summary(self.results_dir, workers=self.workers, **filters)
+        return dict(summary._asdict(), trends=summary.trends.to_dict())
+
+    def profiles(self, query: Query) -> List[Dict[str, Any]]:
+        return [
+            profile.model_dump(mode="json")
+            for profile in list_system_profiles(
+                self.systems_dir, workers=self.workers
+            )
+        ]
+
+
+# endpoint -> (ResultService method, streamed as newline-delimited JSON)
+_ENDPOINTS = {
+    "ping": ("ping", False),
+    "results": ("results", True),
+    "result": ("result", False),
+    "metric-names": ("metric_names", False),
+    "trend": ("trend", False),
+    "profiles": ("profiles", False),
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: "DaemonServer"
+
+    def do_GET(self) -> None:
+        url = urlsplit(self.path)
+        endpoint = _ENDPOINTS.get(url.path.strip("/"))
+        if endpoint is None:
+            self._error(404, f"Unknown endpoint: {url.path}")
+            return
+
+        method, streamed = endpoint
+        query = parse_qs(url.query)
+        try:
+            data = getattr(self.server.service, method)(query)
+        except ValueError as e:
+            self._error(400, str(e))
+            return
+        except Exception as e:
+            self._error(500, str(e))
+            return
+
+        self.send_response(200)
+        if streamed:
+            # No Content-Length: the body ends when the connection closes
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for item in data:
+                self.wfile.write(_dumps(item) + b"\n")
+        else:
+            body = _dumps(data)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    def _error(self, status: int, message: str) -> None:
+        body = message.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def address_string(self) -> str:
+        # Unix socket peers have no address
+        return "local"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class DaemonServer(HTTPServer):
+    """
+    HTTP server on a Unix socket.
+
+    Requests are handled one at a time: the result index and the caches
+    are not shared between threads, and each query is short.
+    """
+
+    address_family = socket.AF_UNIX
+
+    def __init__(self, path: Path, service: ResultService, verbose: bool = False):
+        self.service = service
+        self.verbose = verbose
+        super().__init__(str(path), _Handler)
+
+    def server_bind(self) -> None:
+        # HTTPServer.server_bind expects a (host, port) address
+        socketserver.TCPServer.server_bind(self)
+        self.server_name = "localhost"
+        self.server_port = 0
+
+    def server_close(self) -> None:
+        super().server_close()
+        Path(self.server_address).unlink(missing_ok=True)
+        unwatch(self.service.results_dir)
+        unwatch(self.service.systems_dir)
+
+
+def create_server(
+    results_dir: Path,
+    systems_dir: Path,
+    workers: int = 1,
+    path: Optional[Path] = None,
+    verbose: bool = False,
+) -> DaemonServer:
+    """
+    Create a daemon server bound to its socket, with warm caches.
+
+    A socket left behind by a daemon that is no longer running is
+    replaced.
+
+    Args:
+        results_dir: Base results directory
+        systems_dir: Directory containing system profiles
+        workers: Number of processes used to load files
+        path: Socket path (defaults to ``results/.mybench.sock``)
+        verbose: Log each request to stderr
+
+    Returns:
+        DaemonServer ready for ``serve_forever``
+
+    Raises:
+        RuntimeError: If another daemon is already listening on the socket
+    """
+    path = path or socket_path(results_dir)
+    if path.is_socket():
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(str(path))
+        except OSError:
+            path.unlink()
+        else:
+            raise RuntimeError(f"A daemon is already listening on {path}")
+        finally:
+            probe.close()
+
+    enable_result_cache()
+    results_dir.mkdir(parents=True, exist_ok=True)
+    watch(results_dir, ignore=[CONFIGURATIONS_DIRNAME])
+    watch(systems_dir)
+    service = ResultService(results_dir, systems_dir, workers)
+    try:
+        service.warm_up()
+        return DaemonServer(path, service, verbose=verbose)
+    except Exception:
+        unwatch(results_dir)
+        unwatch(systems_dir)
+        raise
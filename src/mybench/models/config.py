@@ -1,5 +1,7 @@
 """System configuration data models for mutable system state."""
 
+import hashlib
+import json
 from typing import Dict, Optional
 from pydantic import BaseModel, Field
 
@@ -7,6 +9,8 @@ from pydantic import BaseModel, Field
 class KernelConfig(BaseModel):
     """Kernel configuration."""
 
+    model_config = {"frozen": True}
+
     version: str = Field(description="Kernel version")
     parameters: Optional[Dict[str, str]] = Field(
         None, description="Kernel parameters affecting performance"
@@ -20,11 +24,19 @@ class KernelConfig(BaseModel):
 class SoftwareVersions(BaseModel):
     """Software version information."""
 
-    model_config = {"extra": "allow"}
+    model_config = {"extra": "allow", "frozen": True}
 
 
 class SystemConfiguration(BaseModel):
-    """Mutable system configuration captured at benchmark time."""
+    """
+    System configuration captured at benchmark time.
+
+    The configuration may change between runs, but instances are frozen:
+    loaded results share one instance per stored snapshot, so use
+    ``model_copy(update=...)`` to derive a changed one.
+    """
+
+    model_config = {"frozen": True}
 
     os: str = Field(description="Operating system name and version")
     kernel: KernelConfig = Field(description="Kernel configuration")
@@ -34,3 +46,21 @@ class SystemConfiguration(BaseModel):
     environment: Optional[Dict[str, str]] = Field(
         None, description="Environment variables"
     )
+
+    def content_hash(self) -> str:
+        """
+        Return the content address of this configuration.
+
+        The hash is the SHA-256 of the canonical JSON form (sorted keys,
+        no whitespace), so equal configurations always hash the same.
+
+        Returns:
+            Hex digest
+        """
+        canonical = json.dumps(
+            self.model_dump(mode="json"),
+            sort_keys=True,
+            separators=(",", ":"),
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
@@ -1,8 +1,10 @@
 """Benchmark result data models."""
 
+import gzip
 from typing import Any, Dict, Literal, Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+from pathlib import Path
+from pydantic import BaseModel, Field, PrivateAttr, model_validator
 
 from .config import SystemConfiguration
 
@@ -20,11 +22,73 @@ class BenchmarkResult(BaseModel):
     tool: str = Field(description="Benchmark tool name")
     label: Optional[str] = Field(None, description="Optional label for this result")
     system_profile_id: str = Field(description="Reference to system profile")
-    configuration: SystemConfiguration = Field(
-        description="System configuration at benchmark time"
+    configuration: Optional[SystemConfiguration] = Field(
+        None, description="System configuration at benchmark time"
+    )
+    configuration_ref: Optional[str] = Field(
+        None,
+        description="Content hash of the configuration in results/configurations",
     )
     benchmark_parameters: Dict[str, Any] = Field(
         description="Parameters used for the benchmark"
     )
     results: Dict[str, Any] = Field(description="Benchmark results and metrics")
     raw_output: Optional[str] = Field(None, description="Raw benchmark output")
+    raw_output_file: Optional[str] = Field(
+        None,
+        description="Gzip-compressed raw output stored next to the result file",
+    )
+
+    # Location the result was loaded from, used to resolve raw_output_file
+    _source_path: Optional[Path] = PrivateAttr(default=None)
+
+    @model_validator(mode="after")
+    def check_configuration(self) -> "BenchmarkResult":
+        """Require an inline configuration or a reference to a stored one."""
+        if self.configuration is None and self.configuration_ref is None:
+            raise ValueError("Either configuration or configuration_ref is required")
+        return self
+
+    def load_raw_output(self) -> Optional[str]:
+        """
+        Return the raw benchmark output, reading the sidecar file if needed.
+
+        Results written before raw output was split out keep it inline in
+        ``raw_output``; newer results reference a compressed sidecar that
+        is only read when this method is called.
+
+        Returns:
+            Raw output text, or None if the result has none
+
+        Raises:
+            FileNotFoundError: If the referenced sidecar file is missing
+        """
+        if self.raw_output is not None or not self.raw_output_file:
+            return self.raw_output
+        if self._source_path is None:
+            raise FileNotFoundError(
+                f"Cannot locate {self.raw_output_file}: result was not loaded "
+                "from a file"
+            )
+        raw_path = self._source_path.parent / self.raw_output_file
+        return gzip.decompress(raw_path.read_bytes()).decode("utf-8")
+
+    def inline_raw_output(self) -> "BenchmarkResult":
+        """
+        Return the result with its raw output inline instead of in a sidecar.
+
+        Used where the result leaves its results directory (exports, the
+        daemon), since ``raw_output_file`` only resolves next to the JSON
+        file it was loaded from.
+
+        Returns:
+            This result if it references no sidecar, else a copy
+
+        Raises:
+            FileNotFoundError: If the referenced sidecar file is missing
+        """
+        if not self.raw_output_file:
+            return self
+        return self.model_copy(
+            update={"raw_output": self.load_raw_output(), "raw_output_file": None}
+        )
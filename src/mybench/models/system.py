@@ -8,6 +8,8 @@ from pydantic import BaseModel, Field
 class CPUSpec(BaseModel):
     """CPU specifications."""
 
+    model_config = {"frozen": True}
+
     model: str = Field(description="CPU model name")
     cores: int = Field(description="Number of physical cores", gt=0)
     threads: int = Field(description="Number of threads", gt=0)
@@ -20,6 +22,8 @@ class CPUSpec(BaseModel):
 class VirtualCPUSpec(BaseModel):
     """Virtual CPU specifications for VMs."""
 
+    model_config = {"frozen": True}
+
     vcpus: int = Field(description="Number of virtual CPUs", gt=0)
     cpu_mode: Optional[str] = Field(
         None, description="CPU mode (e.g., host-passthrough)"
@@ -30,6 +34,8 @@ class VirtualCPUSpec(BaseModel):
 class MemorySpec(BaseModel):
     """Memory specifications."""
 
+    model_config = {"frozen": True}
+
     total_gb: int = Field(description="Total memory in GB", gt=0)
     type: Optional[str] = Field(None, description="Memory type (e.g., DDR4)")
     speed_mhz: Optional[int] = Field(None, description="Memory speed in MHz")
@@ -40,6 +46,8 @@ class MemorySpec(BaseModel):
 class DiskSpec(BaseModel):
     """Disk specifications."""
 
+    model_config = {"frozen": True}
+
     model: Optional[str] = Field(None, description="Disk model name")
     type: str = Field(description="Disk type (e.g., NVMe SSD, qcow2)")
     capacity_gb: int = Field(description="Disk capacity in GB", gt=0)
@@ -53,6 +61,8 @@ class DiskSpec(BaseModel):
 class NetworkSpec(BaseModel):
     """Network specifications."""
 
+    model_config = {"frozen": True}
+
     interface: Optional[str] = Field(None, description="Network interface name")
     model: Optional[str] = Field(None, description="Network model")
     speed_gbps: Optional[float] = Field(None, description="Network speed in Gbps")
@@ -62,6 +72,8 @@ class NetworkSpec(BaseModel):
 class HardwareSpecs(BaseModel):
     """Complete hardware specifications."""
 
+    model_config = {"frozen": True}
+
     cpu: CPUSpec | VirtualCPUSpec = Field(description="CPU specifications")
     memory: MemorySpec = Field(description="Memory specifications")
     disk: DiskSpec = Field(description="Disk specifications")
@@ -71,6 +83,8 @@ class HardwareSpecs(BaseModel):
 class VirtualizationSpecs(BaseModel):
     """Virtualization-specific specifications."""
 
+    model_config = {"frozen": True}
+
     hypervisor: str = Field(description="Hypervisor type (e.g., QEMU/KVM)")
     host_system: Optional[str] = Field(
         None, description="Reference to host system profile ID"
@@ -80,7 +94,14 @@ class VirtualizationSpecs(BaseModel):
 
 
 class SystemProfile(BaseModel):
-    """System profile containing immutable hardware specifications."""
+    """
+    System profile containing immutable hardware specifications.
+
+    Instances are frozen, as loaded profiles are cached and shared by
+    every caller; use ``model_copy(update=...)`` to derive a changed one.
+    """
+
+    model_config = {"frozen": True}
 
     profile_id: str = Field(description="Unique profile identifier")
     profile_name: str = Field(description="Human-readable profile name")
@@ -1,13 +1,21 @@
 """Storage layer for file operations."""
 
 from .base import (
+    atomic_save_bytes,
     atomic_save_json,
+    atomic_save_many,
+    iter_load_and_validate_json,
     load_and_validate_json,
+    load_many_and_validate_json,
     save_model_to_json,
 )
 
 __all__ = [
+    "atomic_save_bytes",
     "atomic_save_json",
+    "atomic_save_many",
+    "iter_load_and_validate_json",
     "load_and_validate_json",
+    "load_many_and_validate_json",
     "save_model_to_json",
 ]
@@ -1,21 +1,40 @@
 """Base storage functions for JSON file operations."""
 
-import json
+import hashlib
+import os
 import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
-from typing import Any, Dict, TypeVar
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 from pydantic import BaseModel
 
+from . import codec
+
 T = TypeVar("T", bound=BaseModel)
 
 
-def atomic_save_json(filepath: Path, data: Dict[str, Any]) -> None:
+def atomic_save_bytes(filepath: Path, data: bytes) -> None:
     """
-    Save JSON data to file atomically using temp-and-move pattern.
+    Save raw bytes to file atomically using temp-and-move pattern.
 
     Args:
         filepath: Target file path
-        data: Dictionary to save as JSON
+        data: Bytes to write
 
     Raises:
         IOError: If file operations fail
@@ -29,9 +48,8 @@ def atomic_save_json(filepath: Path, data: Dict[str, Any]) -> None:
     )
 
     try:
-        with open(temp_fd, "w", encoding="utf-8") as f:
-            json.dump(data, f, indent=2, ensure_ascii=False, default=str)
-            f.write("\n")  # Trailing newline for Git-friendly files
+        with open(temp_fd, "wb") as f:
+            f.write(data)
 
         # Atomic move
         Path(temp_path).replace(filepath)
@@ -41,10 +59,83 @@ def atomic_save_json(filepath: Path, data: Dict[str, Any]) -> None:
         raise
 
 
+def atomic_save_many(files: Sequence[Tuple[Path, bytes]]) -> None:
+    """
+    Save many files atomically behind a single durability barrier.
+
+    Every file is written to a temporary file in its target directory,
+    then all temporary files are fsynced, renamed into place, and each
+    target directory is fsynced once. Readers see either the old or the
+    new version of each file, and all files are durable on return.
+
+    Args:
+        files: (target path, contents) pairs
+
+    Raises:
+        IOError: If file operations fail
+    """
+    directories = {filepath.parent for filepath, _data in files}
+    for directory in directories:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    pending: List[Tuple[str, Path]] = []
+    moved = 0
+    try:
+        for filepath, data in files:
+            temp_fd, temp_path = tempfile.mkstemp(
+                dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp"
+            )
+            pending.append((temp_path, filepath))
+            with open(temp_fd, "wb") as f:
+                f.write(data)
+
+        for temp_path, _filepath in pending:
+            fd = os.open(temp_path, os.O_RDONLY)
+            try:
+                os.fsync(fd)
+            finally:
+                os.close(fd)
+
+        for temp_path, filepath in pending:
+            Path(temp_path).replace(filepath)
+            moved += 1
+    except Exception:
+        # Clean up temp files that were not moved into place
+        for temp_path, _filepath in pending[moved:]:
+            Path(temp_path).unlink(missing_ok=True)
+        raise
+
+    # Persist the renames
+    for directory in directories:
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def atomic_save_json(filepath: Path, data: Dict[str, Any]) -> None:
+    """
+    Save JSON data to file atomically using temp-and-move pattern.
+
+    Args:
+        filepath: Target file path
+        data: Dictionary to save as JSON
+
+    Raises:
+        IOError: If file operations fail
+    """
+    # Pretty-printed with a trailing newline for Git-friendly files
+    atomic_save_bytes(filepath, codec.dumps(data))
+
+
 def load_and_validate_json(filepath: Path, model: type[T]) -> T:
     """
     Load JSON file and validate against Pydantic model.
 
+    The raw bytes are parsed and validated in one step by Pydantic's
+    native JSON parser, without building an intermediate dict.
+
     Args:
         filepath: File path to load
         model: Pydantic model class for validation
@@ -54,13 +145,185 @@ def load_and_validate_json(filepath: Path, model: type[T]) -> T:
 
     Raises:
         FileNotFoundError: If file doesn't exist
-        ValidationError: If JSON doesn't match model schema
-        JSONDecodeError: If file is not valid JSON
+        ValidationError: If JSON is malformed or doesn't match model schema
+    """
+    with open(filepath, "rb") as f:
+        data = f.read()
+
+    return model.model_validate_json(data)
+
+
+def content_hash(data: bytes) -> str:
+    """
+    Hash file contents for change detection and trusted loading.
+
+    Args:
+        data: File contents
+
+    Returns:
+        Hex digest (BLAKE2b, 128-bit)
+    """
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class LoadedFile(NamedTuple, Generic[T]):
+    """Outcome of loading one file with load_many_and_validate_json."""
+
+    value: Optional[T]
+    error: Optional[str]
+    content_hash: Optional[str]
+
+
+def _load_or_error(
+    filepath: Path,
+    model: type[T],
+    trusted_hash: Optional[str] = None,
+    construct: Optional[Callable[[Dict[str, Any]], T]] = None,
+) -> LoadedFile[T]:
+    """Load one file, returning the error message instead of raising."""
+    try:
+        with open(filepath, "rb") as f:
+            data = f.read()
+        digest = content_hash(data)
+        if construct is not None and trusted_hash == digest:
+            # Unchanged since it was validated; skip validation
+            return LoadedFile(construct(codec.loads(data)), None, digest)
+        return LoadedFile(model.model_validate_json(data), None, digest)
+    except Exception as e:
+        return LoadedFile(None, str(e), None)
+
+
+def resolve_workers(workers: Optional[int]) -> int:
+    """
+    Normalize a worker count option.
+
+    Args:
+        workers: Requested worker count; None or 0 means one per CPU
+
+    Returns:
+        Number of workers to use (at least 1)
+    """
+    if not workers:
+        return os.cpu_count() or 1
+    return max(1, workers)
+
+
+def load_many_and_validate_json(
+    filepaths: Sequence[Path],
+    model: type[T],
+    workers: Optional[int] = 1,
+    trusted_hashes: Optional[Sequence[Optional[str]]] = None,
+    construct: Optional[Callable[[Dict[str, Any]], T]] = None,
+) -> List[LoadedFile[T]]:
+    """
+    Load and validate many JSON files, optionally in a process pool.
+
+    Errors are returned rather than raised or printed so that the caller
+    can report them in input order once loading has finished.
+
+    Files whose content hash equals the matching entry in
+    ``trusted_hashes`` were validated before and have not changed since;
+    they are built with ``construct`` instead of being validated again.
+
+    Args:
+        filepaths: Files to load
+        model: Pydantic model class for validation
+        workers: Number of worker processes; 1 loads in this process,
+            None or 0 uses one per CPU
+        trusted_hashes: Content hashes recorded when each file was last
+            validated (None entries are always validated)
+        construct: Builds a model from trusted data without validation;
+            must be a module-level function when workers > 1
+
+    Returns:
+        List aligned with ``filepaths`` of LoadedFile tuples holding the
+        model instance or error message and the file's content hash
+    """
+    if trusted_hashes is None or construct is None:
+        trusted_hashes = [None] * len(filepaths)
+
+    workers = min(resolve_workers(workers), len(filepaths))
+    if workers <= 1:
+        return [
+            _load_or_error(filepath, model, trusted_hash, construct)
+            for filepath, trusted_hash in zip(filepaths, trusted_hashes)
+        ]
+
+    # Large chunks keep inter-process overhead small relative to parsing
+    chunksize = max(1, len(filepaths) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                _load_or_error,
+                filepaths,
+                [model] * len(filepaths),
+                trusted_hashes,
+                [construct] * len(filepaths),
+                chunksize=chunksize,
+            )
+        )
+
+
+def _load_chunk(
+    items: List[Tuple[Path, Optional[str]]],
+    model: type[T],
+    construct: Optional[Callable[[Dict[str, Any]], T]],
+) -> List[LoadedFile[T]]:
+    return [
+        _load_or_error(filepath, model, trusted_hash, construct)
+        for filepath, trusted_hash in items
+    ]
+
+
+def iter_load_and_validate_json(
+    items: Iterable[Tuple[Path, Optional[str]]],
+    model: type[T],
+    workers: Optional[int] = 1,
+    construct: Optional[Callable[[Dict[str, Any]], T]] = None,
+    chunksize: int = 64,
+) -> Iterator[Tuple[Path, LoadedFile[T]]]:
+    """
+    Lazily load and validate JSON files, optionally in a process pool.
+
+    Like ``load_many_and_validate_json``, but consumes its input lazily and
+    yields results in input order as soon as they are ready. At most a
+    few chunks per worker are in flight, so memory stays bounded however
+    many files are loaded.
+
+    Args:
+        items: (file path, trusted content hash or None) pairs
+        model: Pydantic model class for validation
+        workers: Number of worker processes; 1 loads in this process,
+            None or 0 uses one per CPU
+        construct: Builds a model from trusted data without validation;
+            must be a module-level function when workers > 1
+        chunksize: Files per task sent to a worker
+
+    Yields:
+        (file path, LoadedFile) tuples
     """
-    with open(filepath, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    items = iter(items)
+    workers = resolve_workers(workers)
+    if workers <= 1:
+        for filepath, trusted_hash in items:
+            yield filepath, _load_or_error(filepath, model, trusted_hash, construct)
+        return
 
-    return model.model_validate(data)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        in_flight: deque = deque()
+        while True:
+            while len(in_flight) < workers * 2:
+                chunk = list(islice(items, chunksize))
+                if not chunk:
+                    break
+                in_flight.append(
+                    (chunk, executor.submit(_load_chunk, chunk, model, construct))
+                )
+            if not in_flight:
+                return
+            chunk, future = in_flight.popleft()
+            for (filepath, _trusted_hash), loaded in zip(chunk, future.result()):
+                yield filepath, loaded
 
 
 def save_model_to_json(filepath: Path, model: BaseModel) -> None:
@@ -0,0 +1,68 @@
+"""JSON codec with an optional fast backend.
+
+When ``orjson`` is installed it is used for encoding and decoding;
+otherwise the standard library ``json`` module is used. Both backends
+produce the same Git-friendly on-disk format: UTF-8, two-space
+indentation, keys in insertion order and a trailing newline. The only
+difference is the spelling of float exponents (``1e16`` vs ``1e+16``),
+which parse to identical values.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised when orjson is absent
+    orjson = None
+
+
+def backend_name() -> str:
+    """Return the name of the active JSON backend."""
+    return "orjson" if orjson is not None else "json"
+
+
+def dumps(data: Any) -> bytes:
+    """
+    Encode data as pretty-printed JSON bytes.
+
+    Args:
+        data: JSON-compatible data; unknown types are converted with str()
+
+    Returns:
+        UTF-8 encoded JSON with two-space indentation and trailing newline
+    """
+    if orjson is not None:
+        try:
+            return (
+                orjson.dumps(
+                    data,
+                    option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                    default=str,
+                )
+                + b"\n"
+            )
+        except TypeError:
+            # e.g. integers beyond 64 bits; the stdlib encoder handles them
+            pass
+
+    text = json.dumps(data, indent=2, ensure_ascii=False, default=str)
+    return (text + "\n").encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """
+    Decode JSON bytes.
+
+    Args:
+        data: UTF-8 encoded JSON
+
+    Returns:
+        Decoded data
+
+    Raises:
+        ValueError: If data is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
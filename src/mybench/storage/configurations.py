@@ -0,0 +1,59 @@
+"""Content-addressed storage of system configuration snapshots.
+
+Snapshots are written by ``save_benchmark_results`` together with the
+results referencing them.
+"""
+
+from pathlib import Path
+from typing import Dict, Tuple
+
+from ..models.config import SystemConfiguration
+from .base import load_and_validate_json
+
+CONFIGURATIONS_DIRNAME = "configurations"
+
+# Stored snapshots never change, so each is loaded once and the (frozen)
+# instance is shared by every result referencing it
+_cache: Dict[Tuple[Path, str], SystemConfiguration] = {}
+
+
+def configuration_path(results_dir: Path, config_hash: str) -> Path:
+    """
+    Get the file path of a stored configuration.
+
+    Args:
+        results_dir: Base results directory
+        config_hash: Configuration content hash
+
+    Returns:
+        Path to ``results/configurations/<hash>.json``
+    """
+    return results_dir / CONFIGURATIONS_DIRNAME / f"{config_hash}.json"
+
+
+def load_configuration(config_hash: str, results_dir: Path) -> SystemConfiguration:
+    """
+    Load a stored configuration by content hash.
+
+    Each snapshot is read and validated at most once per process, and
+    every call for the same hash returns the same instance.
+
+    Args:
+        config_hash: Configuration content hash
+        results_dir: Base results directory
+
+    Returns:
+        Stored SystemConfiguration
+
+    Raises:
+        FileNotFoundError: If no configuration with this hash is stored
+        ValidationError: If JSON doesn't match schema
+    """
+    key = (results_dir, config_hash)
+    config = _cache.get(key)
+    if config is None:
+        config = load_and_validate_json(
+            configuration_path(results_dir, config_hash), SystemConfiguration
+        )
+        _cache[key] = config
+    return config
@@ -0,0 +1,682 @@
+"""Persistent SQLite index over benchmark result files."""
+
+import os
+import sqlite3
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+from ..models.result import BenchmarkResult
+from .base import content_hash, load_many_and_validate_json
+from .layout import is_result_relpath, scan_result_files
+from .watch import drain_changes, invalidate
+
+if TYPE_CHECKING:
+    from .query import Predicate
+
+INDEX_FILENAME = ".index.sqlite"
+SCHEMA_VERSION = 3
+
+# Result fields that can be sorted on, mapped to index columns
+SORT_FIELDS = {
+    "timestamp": "ts",
+    "category": "category",
+    "tool": "tool",
+    "system": "system_profile_id",
+    "label": "label",
+}
+
+_SCHEMA = """
+CREATE TABLE results (
+    path TEXT PRIMARY KEY,
+    id TEXT NOT NULL,
+    category TEXT NOT NULL,
+    tool TEXT NOT NULL,
+    system_profile_id TEXT NOT NULL,
+    label TEXT,
+    timestamp TEXT NOT NULL,
+    ts REAL NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL
+);
+CREATE INDEX results_id ON results (id);
+CREATE INDEX results_ts ON results (ts);
+CREATE INDEX results_system ON results (system_profile_id, ts);
+CREATE INDEX results_category ON results (category, ts);
+CREATE INDEX results_label ON results (label);
+CREATE TABLE metrics (
+    path TEXT NOT NULL REFERENCES results (path) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (path, name)
+);
+CREATE INDEX metrics_name ON metrics (name, value);
+"""
+
+
+def timestamp_sort_key(timestamp: datetime) -> float:
+    """
+    Convert a result timestamp to a sortable POSIX value.
+
+    Naive timestamps are treated as UTC so that ordering is stable
+    regardless of the local timezone of the machine building the index.
+
+    Args:
+        timestamp: Result timestamp
+
+    Returns:
+        Seconds since the epoch
+    """
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return timestamp.timestamp()
+
+
+def scalar_metrics(result: BenchmarkResult) -> Dict[str, float]:
+    """
+    Extract numeric metrics from a benchmark result.
+
+    Args:
+        result: Benchmark result
+
+    Returns:
+        Dict mapping metric names to float values (booleans excluded)
+    """
+    return {
+        name: float(value)
+        for name, value in result.results.items()
+        if isinstance(value, (int, float)) and not isinstance(value, bool)
+    }
+
+
+class ResultIndex:
+    """
+    SQLite sidecar index stored at ``results/.index.sqlite``.
+
+    The index records the identifying fields, file mtime/size, scalar
+    metrics and the names of all other results of every result file so
+    that listing and filtering can be answered without opening and
+    validating each JSON file. It is refreshed incrementally: only files
+    whose mtime or size changed are re-parsed.
+    """
+
+    def __init__(self, results_dir: Path):
+        self.results_dir = results_dir
+        self.path = results_dir / INDEX_FILENAME
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def __enter__(self) -> "ResultIndex":
+        self.connect()
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    def connect(self) -> sqlite3.Connection:
+        """
+        Open the index database, creating or rebuilding the schema if needed.
+
+        Returns:
+            Open SQLite connection
+
+        Raises:
+            sqlite3.Error: If the database cannot be opened
+        """
+        if self._conn is not None:
+            return self._conn
+
+        self.results_dir.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=30)
+        conn.execute("PRAGMA foreign_keys = ON")
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        if version != SCHEMA_VERSION:
+            # Index is a cache; rebuild from scratch on schema changes
+            with conn:
+                conn.execute("DROP TABLE IF EXISTS metrics")
+                conn.execute("DROP TABLE IF EXISTS results")
+                conn.executescript(_SCHEMA)
+                conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+
+        self._conn = conn
+        return conn
+
+    def close(self) -> None:
+        """Close the index database."""
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def _relpath(self, filepath: Path) -> str:
+        return filepath.relative_to(self.results_dir).as_posix()
+
+    def _scan_files(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> Tuple[Set[str], Dict[str, os.stat_result]]:
+        """Stat result files without opening them, skipping far-off shards."""
+        directories = set()
+        files = {}
+        for reldir, entries in scan_result_files(
+            self.results_dir, since=since, until=until
+        ):
+            directories.add(reldir)
+            for entry in entries:
+                files[f"{reldir}/{entry.name}"] = entry.stat()
+        return directories, files
+
+    def refresh(
+        self,
+        workers: Optional[int] = 1,
+        name_filter: Optional[Callable[[str], bool]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """
+        Bring the index up to date with the files on disk.
+
+        Only new files and files whose mtime or size changed are loaded
+        and validated; rows for deleted files are dropped. If the results
+        directory is watched (see ``storage.watch``), only the files
+        reported changed since the last refresh are checked, and the
+        filters below are not needed.
+
+        Args:
+            workers: Number of processes used to load changed files
+            name_filter: Only load changed files whose result ID (filename
+                stem) passes this check; others are left for a later
+                refresh. Used to push query filters down to filenames.
+            since: Only scan month shards that may hold results at or
+                after this time
+            until: Only scan month shards that may hold results at or
+                before this time
+
+        Returns:
+            Dict with counts of added, updated and removed entries
+        """
+        changes = drain_changes(self.results_dir)
+        try:
+            if changes is not None:
+                return self._refresh_paths(changes, workers)
+            return self._refresh_all(workers, name_filter, since, until)
+        except BaseException:
+            # The drained changes were not applied; rescan next time
+            invalidate(self.results_dir)
+            raise
+
+    def _refresh_all(
+        self,
+        workers: Optional[int] = 1,
+        name_filter: Optional[Callable[[str], bool]] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, int]:
+        """Bring the index up to date by scanning the results directory."""
+        conn = self.connect()
+        known: Dict[str, Tuple[int, int]] = {
+            path: (mtime_ns, size)
+            for path, mtime_ns, size in conn.execute(
+                "SELECT path, mtime_ns, size FROM results"
+            )
+        }
+        scanned, on_disk = self._scan_files(since, until)
+        if since is not None or until is not None:
+            # Shards that were not scanned keep their rows
+            gone = [
+                relpath
+                for relpath in known.keys() - on_disk.keys()
+                if relpath.rpartition("/")[0] in scanned
+            ]
+        else:
+            gone = list(known.keys() - on_disk.keys())
+        changed = [
+            relpath
+            for relpath, st in sorted(on_disk.items())
+            if known.get(relpath) != (st.st_mtime_ns, st.st_size)
+            and (name_filter is None or name_filter(Path(relpath).stem))
+        ]
+        return self._apply_changes(known, gone, changed, on_disk, workers)
+
+    def _refresh_paths(
+        self, filepaths: Set[Path], workers: Optional[int] = 1
+    ) -> Dict[str, int]:
+        """Bring the index up to date for the given files only."""
+        relpaths = []
+        for filepath in filepaths:
+            try:
+                relpath = filepath.relative_to(self.results_dir).as_posix()
+            except ValueError:
+                continue
+            if is_result_relpath(relpath):
+                relpaths.append(relpath)
+
+        conn = self.connect()
+        known: Dict[str, Tuple[int, int]] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(relpaths), 500):
+            chunk = relpaths[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            for path, mtime_ns, size in conn.execute(
+                "SELECT path, mtime_ns, size FROM results"
+                f" WHERE path IN ({placeholders})",
+                chunk,
+            ):
+                known[path] = (mtime_ns, size)
+
+        on_disk: Dict[str, os.stat_result] = {}
+        for relpath in relpaths:
+            try:
+                on_disk[relpath] = os.stat(self.results_dir / relpath)
+            except FileNotFoundError:
+                pass
+        gone = [relpath for relpath in known if relpath not in on_disk]
+        changed = [
+            relpath
+            for relpath, st in sorted(on_disk.items())
+            if known.get(relpath) != (st.st_mtime_ns, st.st_size)
+        ]
+        return self._apply_changes(known, gone, changed, on_disk, workers)
+
+    def _apply_changes(
+        self,
+        known: Dict[str, Tuple[int, int]],
+        gone: List[str],
+        changed: List[str],
+        on_disk: Dict[str, os.stat_result],
+        workers: Optional[int],
+    ) -> Dict[str, int]:
+        """Drop rows of deleted files and (re)load changed ones."""
+        conn = self.connect()
+        loaded = load_many_and_validate_json(
+            [self.results_dir / relpath for relpath in changed],
+            BenchmarkResult,
+            workers=workers,
+        )
+
+        stats = {"added": 0, "updated": 0, "removed": 0}
+        with conn:
+            for relpath in gone:
+                conn.execute("DELETE FROM results WHERE path = ?", (relpath,))
+                stats["removed"] += 1
+
+            for relpath, (result, error, digest) in zip(changed, loaded):
+                previous = known.get(relpath)
+                if error is not None:
+                    # Log error but continue processing other files
+                    filepath = self.results_dir / relpath
+                    print(f"Warning: Failed to load {filepath}: {error}")
+                    if previous is not None:
+                        conn.execute(
+                            "DELETE FROM results WHERE path = ?", (relpath,)
+                        )
+                    continue
+
+                self._upsert(conn, relpath, result, on_disk[relpath], digest)
+                stats["updated" if previous else "added"] += 1
+
+        return stats
+
+    def _upsert(
+        self,
+        conn: sqlite3.Connection,
+        relpath: str,
+        result: BenchmarkResult,
+        st: os.stat_result,
+        digest: str,
+    ) -> None:
+        conn.execute("DELETE FROM results WHERE path = ?", (relpath,))
+        conn.execute(
+            "INSERT INTO results (path, id, category, tool, system_profile_id,"
+            " label, timestamp, ts, mtime_ns, size, content_hash)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                relpath,
+                Path(relpath).stem,
+                result.category,
+                result.tool,
+                result.system_profile_id,
+                result.label,
+                result.timestamp.isoformat(),
+                timestamp_sort_key(result.timestamp),
+                st.st_mtime_ns,
+                st.st_size,
+                digest,
+            ),
+        )
+        # Non-numeric results are recorded by name only (NULL value)
+        scalars = scalar_metrics(result)
+        conn.executemany(
+            "INSERT INTO metrics (path, name, value) VALUES (?, ?, ?)",
+            [(relpath, name, scalars.get(name)) for name in result.results],
+        )
+
+    def add(self, result: BenchmarkResult, filepath: Path) -> None:
+        """
+        Record a freshly written result file in the index.
+
+        Args:
+            result: The result that was saved
+            filepath: Path the result was written to
+        """
+        self.add_many([(result, filepath, None)])
+
+    def add_many(
+        self, entries: Sequence[Tuple[BenchmarkResult, Path, Optional[str]]]
+    ) -> None:
+        """
+        Record freshly written result files in a single transaction.
+
+        Args:
+            entries: (result, path, content hash) tuples; a None hash is
+                computed from the file
+        """
+        conn = self.connect()
+        with conn:
+            for result, filepath, digest in entries:
+                # Stat before reading so a concurrent rewrite is caught on
+                # refresh
+                st = filepath.stat()
+                if digest is None:
+                    digest = content_hash(filepath.read_bytes())
+                self._upsert(conn, self._relpath(filepath), result, st, digest)
+
+    def move(self, moves: Sequence[Tuple[Path, Path]]) -> None:
+        """
+        Record that result files were renamed without being changed.
+
+        Args:
+            moves: (old path, new path) pairs
+        """
+        conn = self.connect()
+        with conn:
+            for old, new in moves:
+                old_rel, new_rel = self._relpath(old), self._relpath(new)
+                conn.execute("DELETE FROM results WHERE path = ?", (new_rel,))
+                conn.execute(
+                    "INSERT INTO results (path, id, category, tool,"
+                    " system_profile_id, label, timestamp, ts, mtime_ns, size,"
+                    " content_hash)"
+                    " SELECT ?, id, category, tool, system_profile_id, label,"
+                    " timestamp, ts, mtime_ns, size, content_hash"
+                    " FROM results WHERE path = ?",
+                    (new_rel, old_rel),
+                )
+                conn.execute(
+                    "UPDATE metrics SET path = ? WHERE path = ?", (new_rel, old_rel)
+                )
+                conn.execute("DELETE FROM results WHERE path = ?", (old_rel,))
+
+    def content_hashes(self, paths: List[Path]) -> List[Optional[str]]:
+        """
+        Look up the content hashes recorded when files were validated.
+
+        Args:
+            paths: Result file paths
+
+        Returns:
+            List aligned with ``paths`` of recorded hashes (None if the
+            file is not indexed)
+        """
+        conn = self.connect()
+        relpaths = [self._relpath(path) for path in paths]
+        hashes: Dict[str, str] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(relpaths), 500):
+            chunk = relpaths[start : start + 500]
+            placeholders = ", ".join("?" * len(chunk))
+            hashes.update(
+                conn.execute(
+                    "SELECT path, content_hash FROM results"
+                    f" WHERE path IN ({placeholders})",
+                    chunk,
+                )
+            )
+        return [hashes.get(relpath) for relpath in relpaths]
+
+    @staticmethod
+    def _filters(
+        category: Optional[str] = None,
+        system_profile_id: Optional[str] = None,
+        label: Optional[str] = None,
+        tool: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        where: Optional["Predicate"] = None,
+    ) -> Tuple[List[str], List[object]]:
+        """Build WHERE clauses and parameters for result filters."""
+        clauses = []
+        params: List[object] = []
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if system_profile_id:
+            clauses.append("system_profile_id = ?")
+            params.append(system_profile_id)
+        if label:
+            clauses.append("label = ?")
+            params.append(label)
+        if tool:
+            clauses.append("tool = ?")
+            params.append(tool)
+        if since:
+            clauses.append("ts >= ?")
+            params.append(timestamp_sort_key(since))
+        if until:
+            clauses.append("ts <= ?")
+            params.append(timestamp_sort_key(until))
+        if where is not None:
+            clause, where_params = where.to_sql()
+            clauses.append(f"({clause})")
+            params.extend(where_params)
+        return clauses, params
+
+    def query(
+        self,
+        category: Optional[str] = None,
+        system_profile_id: Optional[str] = None,
+        label: Optional[str] = None,
+        tool: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        where: Optional["Predicate"] = None,
+        sort_by: str = "timestamp",
+        descending: bool = True,
+        limit: Optional[int] = None,
+        offset: int = 0,
+    ) -> List[Path]:
+        """
+        Find result files matching the given filters.
+
+        Sorting and paging are done by SQLite, so only the requested page
+        of paths is returned.
+
+        Args:
+            category: Filter by category
+            system_profile_id: Filter by system profile ID
+            label: Filter by label
+            tool: Filter by tool name
+            since: Only results at or after this time
+            until: Only results at or before this time
+            where: Only results whose metrics satisfy this predicate
+            sort_by: A key of SORT_FIELDS, or a metric name; results
+                without a numeric value for the metric are excluded
+            descending: Sort in descending order; ties are broken by
+                timestamp in the same direction
+            limit: Maximum number of paths to return
+            offset: Number of leading paths to skip
+
+        Returns:
+            Paths of matching result files
+        """
+        clauses, params = self._filters(
+            category, system_profile_id, label, tool, since, until, where
+        )
+        order = "DESC" if descending else "ASC"
+        sql = "SELECT results.path FROM results"
+        if sort_by in SORT_FIELDS:
+            sort_column = SORT_FIELDS[sort_by]
+        else:
+            sql += (
+                " JOIN metrics m ON m.path = results.path AND m.name = ?"
+                " AND m.value IS NOT NULL"
+            )
+            params.insert(0, sort_by)
+            sort_column = "m.value"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += f" ORDER BY {sort_column} {order}"
+        if sort_column != "ts":
+            sql += f", ts {order}"
+        sql += f", results.path {order}"
+        if limit is not None or offset:
+            sql += " LIMIT ? OFFSET ?"
+            params.extend([-1 if limit is None else limit, offset])
+
+        conn = self.connect()
+        return [self.results_dir / path for (path,) in conn.execute(sql, params)]
+
+    def iter_query(
+        self,
+        category: Optional[str] = None,
+        system_profile_id: Optional[str] = None,
+        label: Optional[str] = None,
+        tool: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        where: Optional["Predicate"] = None,
+        newest_first: bool = True,
+        page_size: int = 1000,
+    ) -> Iterator[List[Tuple[Path, str]]]:
+        """
+        Find result files matching the given filters, one page at a time.
+
+        Pages are fetched with keyset pagination on (ts, path), so no
+        read transaction stays open between pages and memory is bounded
+        by the page size.
+
+        Args:
+            category: Filter by category
+            system_profile_id: Filter by system profile ID
+            label: Filter by label
+            tool: Filter by tool name
+            since: Only results at or after this time
+            until: Only results at or before this time
+            where: Only results whose metrics satisfy this predicate
+            newest_first: Order by descending rather than ascending time
+            page_size: Rows per page
+
+        Yields:
+            Lists of (path, recorded content hash) tuples
+        """
+        clauses, params = self._filters(
+            category, system_profile_id, label, tool, since, until, where
+        )
+        op, order = ("<", "DESC") if newest_first else (">", "ASC")
+        conn = self.connect()
+        after: Optional[Tuple[float, str]] = None
+        while True:
+            page_clauses = list(clauses)
+            page_params = list(params)
+            if after is not None:
+                page_clauses.append(f"(ts {op} ? OR (ts = ? AND path {op} ?))")
+                page_params.extend([after[0], after[0], after[1]])
+            sql = "SELECT ts, path, content_hash FROM results"
+            if page_clauses:
+                sql += " WHERE " + " AND ".join(page_clauses)
+            sql += f" ORDER BY ts {order}, path {order} LIMIT ?"
+            rows = conn.execute(sql, page_params + [page_size]).fetchall()
+            if not rows:
+                return
+            yield [(self.results_dir / path, digest) for _ts, path, digest in rows]
+            if len(rows) < page_size:
+                return
+            after = (rows[-1][0], rows[-1][1])
+
+    def metric_names(
+        self,
+        category: Optional[str] = None,
+        system_profile_id: Optional[str] = None,
+        label: Optional[str] = None,
+        tool: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        where: Optional["Predicate"] = None,
+        by_tool: bool = False,
+    ) -> Union[List[str], List[Tuple[str, str]]]:
+        """
+        Get the union of result keys over the results matching filters.
+
+        Args:
+            category: Filter by category
+            system_profile_id: Filter by system profile ID
+            label: Filter by label
+            tool: Filter by tool name
+            since: Only results at or after this time
+            until: Only results at or before this time
+            where: Only results whose metrics satisfy this predicate
+            by_tool: Return (tool, name) pairs instead, for the tools that
+                reported each name
+
+        Returns:
+            Sorted metric names, including non-numeric ones
+        """
+        clauses, params = self._filters(
+            category, system_profile_id, label, tool, since, until, where
+        )
+        if by_tool:
+            sql = (
+                "SELECT DISTINCT results.tool, metrics.name FROM metrics"
+                " JOIN results ON results.path = metrics.path"
+            )
+        else:
+            sql = "SELECT DISTINCT name FROM metrics"
+        if clauses:
+            sql += (
+                " WHERE metrics.path IN (SELECT path FROM results WHERE "
+                + " AND ".join(clauses)
+                + ")"
+            )
+        sql += " ORDER BY metrics.name" + (", results.tool" if by_tool else "")
+
+        conn = self.connect()
+        rows = conn.execute(sql, params)
+        return [tuple(row) for row in rows] if by_tool else [name for (name,) in rows]
+
+    def find(self, result_id: str) -> List[Path]:
+        """
+        Find result files by exact ID or, failing that, by ID prefix.
+
+        Args:
+            result_id: Full result ID or a prefix of one
+
+        Returns:
+            Paths of exact matches if any exist, otherwise of all results
+            whose ID starts with ``result_id``
+        """
+        conn = self.connect()
+        rows = conn.execute(
+            "SELECT path FROM results WHERE id = ? ORDER BY path", (result_id,)
+        ).fetchall()
+        if not rows and result_id:
+            # Range scan on the id index instead of LIKE, which SQLite
+            # cannot serve from a case-sensitive index by default
+            upper = result_id[:-1] + chr(ord(result_id[-1]) + 1)
+            rows = conn.execute(
+                "SELECT path FROM results WHERE id >= ? AND id < ?"
+                " ORDER BY id, path",
+                (result_id, upper),
+            ).fetchall()
+        return [self.results_dir / path for (path,) in rows]
+
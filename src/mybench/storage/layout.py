@@ -0,0 +1,374 @@
+"""Result file naming conventions, directory layouts and filtering."""
+
+import heapq
+import os
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, Iterator, List, Literal, Optional, Tuple
+
+from . import codec
+from .base import atomic_save_json
+
+CATEGORIES = ["cpu", "memory", "disk", "network"]
+
+# flat:    results/<category>/<id>.json
+# sharded: results/<category>/<YYYY>/<MM>/<id>.json
+Layout = Literal["flat", "sharded"]
+LAYOUTS = ["flat", "sharded"]
+LAYOUT_FILENAME = ".layout.json"
+
+RESULT_ID_TIME_FORMAT = "%Y-%m-%d_%H%M%S"
+_RESULT_ID_TIME_LENGTH = len("YYYY-MM-DD_HHMMSS")
+
+# Filenames carry the wall-clock time of the result, which may be in any
+# UTC offset; widen range checks so filename pruning never drops a match
+_OFFSET_MARGIN = timedelta(hours=14)
+
+
+def make_result_id(timestamp: datetime, tool: str) -> str:
+    """
+    Build a result ID (and filename stem) from timestamp and tool.
+
+    Args:
+        timestamp: Result timestamp
+        tool: Benchmark tool name
+
+    Returns:
+        Result ID in the format YYYY-MM-DD_HHMMSS_tool
+    """
+    return f"{timestamp.strftime(RESULT_ID_TIME_FORMAT)}_{tool}"
+
+
+def read_layout(results_dir: Path) -> Layout:
+    """
+    Get the layout new results are saved in.
+
+    Args:
+        results_dir: Base results directory
+
+    Returns:
+        Layout recorded in ``results/.layout.json`` ("flat" if none)
+    """
+    try:
+        layout = codec.loads((results_dir / LAYOUT_FILENAME).read_bytes())["layout"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return "flat"
+    return layout if layout in LAYOUTS else "flat"
+
+
+def write_layout(results_dir: Path, layout: Layout) -> None:
+    """
+    Record the layout new results are saved in.
+
+    Args:
+        results_dir: Base results directory
+        layout: "flat" or "sharded"
+    """
+    atomic_save_json(results_dir / LAYOUT_FILENAME, {"layout": layout})
+
+
+def result_path(
+    results_dir: Path, category: str, result_id: str, layout: Layout
+) -> Path:
+    """
+    Get the path of a result file in a given layout.
+
+    Args:
+        results_dir: Base results directory
+        category: Result category
+        result_id: Result ID
+        layout: "flat" or "sharded"
+
+    Returns:
+        Path to the result JSON file. IDs that do not follow the naming
+        convention are always stored flat.
+    """
+    category_dir = results_dir / category
+    parsed = parse_result_id(result_id) if layout == "sharded" else None
+    if parsed is None:
+        return category_dir / f"{result_id}.json"
+    timestamp = parsed[0]
+    shard_dir = category_dir / f"{timestamp.year:04d}" / f"{timestamp.month:02d}"
+    return shard_dir / f"{result_id}.json"
+
+
+def candidate_paths(results_dir: Path, category: str, result_id: str) -> List[Path]:
+    """
+    Get every path a result may be stored at, in any layout.
+
+    Args:
+        results_dir: Base results directory
+        category: Result category
+        result_id: Result ID
+
+    Returns:
+        Distinct candidate paths, flat first
+    """
+    paths = [
+        result_path(results_dir, category, result_id, layout) for layout in LAYOUTS
+    ]
+    return list(dict.fromkeys(paths))
+
+
+def path_category(filepath: Path) -> str:
+    """
+    Get the category of a result file from its location in either layout.
+
+    Args:
+        filepath: Path to a result file
+
+    Returns:
+        Category name
+    """
+    if filepath.parent.name in CATEGORIES:
+        return filepath.parent.name
+    return filepath.parents[2].name
+
+
+def results_root(filepath: Path) -> Path:
+    """
+    Get the base results directory that contains a result file.
+
+    Args:
+        filepath: Path to a result file in either layout
+
+    Returns:
+        Base results directory
+    """
+    if filepath.parent.name in CATEGORIES:
+        return filepath.parent.parent
+    return filepath.parents[3]
+
+
+def _shard_bounds(
+    since: Optional[datetime], until: Optional[datetime]
+) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+    """Get the (year, month) range of shards that may hold matching results."""
+    low = (0, 0)
+    high = (9999, 99)
+    if since is not None:
+        start = since.replace(tzinfo=None) - _OFFSET_MARGIN
+        low = (start.year, start.month)
+    if until is not None:
+        end = until.replace(tzinfo=None) + _OFFSET_MARGIN
+        high = (end.year, end.month)
+    return low, high
+
+
+def _subdirs(directory: str) -> Dict[str, str]:
+    with os.scandir(directory) as entries:
+        return {
+            entry.name: entry.path
+            for entry in entries
+            if entry.name.isdigit() and entry.is_dir()
+        }
+
+
+def scan_result_files(
+    results_dir: Path,
+    categories: Optional[List[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """
+    Find result files in either layout without opening them.
+
+    Month shards entirely outside the time range are not visited. Files
+    stored flat are always returned, so callers must still filter by
+    time.
+
+    Args:
+        results_dir: Base results directory
+        categories: Categories to scan (default: all)
+        since: Earliest timestamp of interest
+        until: Latest timestamp of interest
+
+    Yields:
+        (directory path relative to ``results_dir``, DirEntries of its
+        ``*.json`` result files) for every visited directory, including
+        empty ones
+    """
+    low, high = _shard_bounds(since, until)
+    for cat in categories or CATEGORIES:
+        cat_dir = results_dir / cat
+        if not cat_dir.is_dir():
+            continue
+
+        directories = [(cat, str(cat_dir))]
+        for year, year_path in sorted(_subdirs(str(cat_dir)).items()):
+            if not low[0] <= int(year) <= high[0]:
+                continue
+            for month, month_path in sorted(_subdirs(year_path).items()):
+                if low <= (int(year), int(month)) <= high:
+                    directories.append((f"{cat}/{year}/{month}", month_path))
+
+        for reldir, directory in directories:
+            with os.scandir(directory) as entries:
+                yield reldir, [
+                    entry
+                    for entry in entries
+                    if entry.name.endswith(".json")
+                    and not entry.name.startswith(".")
+                    and entry.is_file()
+                ]
+
+
+def is_result_relpath(relpath: str) -> bool:
+    """
+    Check whether a path is where ``scan_result_files`` looks for results.
+
+    Args:
+        relpath: Path relative to the results directory, with ``/``
+            separators
+
+    Returns:
+        True for ``<category>/<name>.json`` and
+        ``<category>/<YYYY>/<MM>/<name>.json``
+    """
+    parts = relpath.split("/")
+    name = parts[-1]
+    if parts[0] not in CATEGORIES or not name.endswith(".json") or name[0] == ".":
+        return False
+    if len(parts) == 2:
+        return True
+    return len(parts) == 4 and parts[1].isdigit() and parts[2].isdigit()
+
+
+def parse_result_id(result_id: str) -> Optional[Tuple[datetime, str]]:
+    """
+    Split a result ID into its timestamp and tool parts.
+
+    Args:
+        result_id: Result ID or filename stem
+
+    Returns:
+        (naive timestamp, tool) tuple, or None if the ID does not follow
+        the YYYY-MM-DD_HHMMSS_tool convention
+    """
+    stamp = result_id[:_RESULT_ID_TIME_LENGTH]
+    rest = result_id[_RESULT_ID_TIME_LENGTH:]
+    if not rest.startswith("_") or len(rest) < 2:
+        return None
+    try:
+        timestamp = datetime.strptime(stamp, RESULT_ID_TIME_FORMAT)
+    except ValueError:
+        return None
+    return timestamp, rest[1:]
+
+
+def result_id_may_match(
+    result_id: str,
+    tool: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> bool:
+    """
+    Decide from a result ID alone whether the result can match filters.
+
+    This is a conservative pre-filter: it only returns False when the
+    filename proves the result cannot match, so callers must still apply
+    the exact filters to the loaded result.
+
+    Args:
+        result_id: Result ID or filename stem
+        tool: Required tool name
+        since: Earliest timestamp (inclusive)
+        until: Latest timestamp (inclusive)
+
+    Returns:
+        False if the result certainly does not match, True otherwise
+    """
+    parsed = parse_result_id(result_id)
+    if parsed is None:
+        return True
+
+    timestamp, id_tool = parsed
+    if tool is not None and id_tool != tool:
+        return False
+    if since is not None and (
+        timestamp < since.replace(tzinfo=None) - _OFFSET_MARGIN
+    ):
+        return False
+    if until is not None and (
+        timestamp > until.replace(tzinfo=None) + _OFFSET_MARGIN
+    ):
+        return False
+    return True
+
+
+def _sorted_result_names(directory: str, reverse: bool) -> List[str]:
+    with os.scandir(directory) as entries:
+        names = [
+            entry.name
+            for entry in entries
+            if entry.name.endswith(".json")
+            and not entry.name.startswith(".")
+            and entry.is_file()
+        ]
+    names.sort(reverse=reverse)
+    return names
+
+
+def _iter_category_paths(
+    cat_dir: Path,
+    low: Tuple[int, int],
+    high: Tuple[int, int],
+    newest_first: bool,
+) -> Iterator[Path]:
+    """Stream one category's result files in filename order."""
+
+    def shard_paths() -> Iterator[Path]:
+        # Shards hold disjoint, ordered ID ranges; list one at a time
+        for year, year_path in sorted(
+            _subdirs(str(cat_dir)).items(), reverse=newest_first
+        ):
+            if not low[0] <= int(year) <= high[0]:
+                continue
+            for month, month_path in sorted(
+                _subdirs(year_path).items(), reverse=newest_first
+            ):
+                if low <= (int(year), int(month)) <= high:
+                    for name in _sorted_result_names(month_path, newest_first):
+                        yield Path(month_path) / name
+
+    flat_paths = (
+        cat_dir / name for name in _sorted_result_names(str(cat_dir), newest_first)
+    )
+    return heapq.merge(
+        flat_paths, shard_paths(), key=lambda path: path.name, reverse=newest_first
+    )
+
+
+def iter_result_paths(
+    results_dir: Path,
+    categories: Optional[List[str]] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    newest_first: bool = True,
+) -> Iterator[Path]:
+    """
+    Stream result file paths in result ID order, in either layout.
+
+    Result IDs start with the wall-clock timestamp, so this is timestamp
+    order without a global sort: only one directory is listed at a time
+    and categories are merged lazily. Like ``scan_result_files``, month
+    shards outside the time range are skipped and callers must still
+    filter by time.
+
+    Args:
+        results_dir: Base results directory
+        categories: Categories to scan (default: all)
+        since: Earliest timestamp of interest
+        until: Latest timestamp of interest
+        newest_first: Order by descending rather than ascending ID
+
+    Returns:
+        Iterator over result file paths
+    """
+    low, high = _shard_bounds(since, until)
+    streams = [
+        _iter_category_paths(results_dir / cat, low, high, newest_first)
+        for cat in categories or CATEGORIES
+        if (results_dir / cat).is_dir()
+    ]
+    return heapq.merge(*streams, key=lambda path: path.name, reverse=newest_first)
@@ -0,0 +1,355 @@
+"""Columnar metric store derived from the result index."""
+
+import hashlib
+import sqlite3
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+import numpy as np
+
+from . import codec
+from .base import atomic_save_bytes, atomic_save_json
+from .index import ResultIndex, timestamp_sort_key
+from .query import Predicate
+
+METRICS_DIRNAME = ".metrics"
+STORE_VERSION = 1
+
+
+@dataclass
+class MetricSeries:
+    """
+    All scalar metrics of one (system, category, tool) series.
+
+    Rows are results ordered by timestamp. ``ts`` and every column in
+    ``columns`` are float64 arrays of the same length, with NaN where a
+    result did not report a metric. Loaded series are memory-mapped from
+    the store and read-only.
+    """
+
+    system_profile_id: str
+    category: str
+    tool: str
+    ids: List[str]
+    timestamps: List[str]
+    labels: List[Optional[str]]
+    ts: np.ndarray
+    columns: Dict[str, np.ndarray] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def timestamp(self, row: int) -> datetime:
+        """Return the timestamp of a row as a datetime."""
+        return datetime.fromisoformat(self.timestamps[row])
+
+    def points(self, metric: str) -> Iterator[Tuple[int, float]]:
+        """
+        Iterate over the rows that reported a metric.
+
+        Args:
+            metric: Metric name
+
+        Yields:
+            (row, value) tuples in timestamp order
+        """
+        column = self.columns.get(metric)
+        if column is None:
+            return
+        for row in np.flatnonzero(~np.isnan(column)).tolist():
+            yield row, float(column[row])
+
+    def between(
+        self, since: Optional[datetime] = None, until: Optional[datetime] = None
+    ) -> "MetricSeries":
+        """
+        Slice the series to a time range using binary search on ``ts``.
+
+        The slice shares the columns of this series.
+
+        Args:
+            since: Earliest timestamp (inclusive)
+            until: Latest timestamp (inclusive)
+
+        Returns:
+            New MetricSeries holding only rows within the range
+        """
+        start = (
+            int(np.searchsorted(self.ts, timestamp_sort_key(since), side="left"))
+            if since
+            else 0
+        )
+        end = (
+            int(np.searchsorted(self.ts, timestamp_sort_key(until), side="right"))
+            if until
+            else len(self)
+        )
+        if start == 0 and end == len(self):
+            return self
+        return MetricSeries(
+            system_profile_id=self.system_profile_id,
+            category=self.category,
+            tool=self.tool,
+            ids=self.ids[start:end],
+            timestamps=self.timestamps[start:end],
+            labels=self.labels[start:end],
+            ts=self.ts[start:end],
+            columns={
+                name: column[start:end] for name, column in self.columns.items()
+            },
+        )
+
+    def matching(self, predicate: Predicate) -> "MetricSeries":
+        """
+        Keep only the rows whose metrics satisfy a predicate.
+
+        Args:
+            predicate: Parsed ``--where`` expression
+
+        Returns:
+            New MetricSeries holding only matching rows
+        """
+        columns = self.columns
+        rows = [
+            row
+            for row in range(len(self))
+            if predicate.evaluate(
+                lambda name: columns[name][row] if name in columns else None
+            )
+        ]
+        if len(rows) == len(self):
+            return self
+        return self._select(rows)
+
+    def _select(self, rows: Sequence[int]) -> "MetricSeries":
+        return MetricSeries(
+            system_profile_id=self.system_profile_id,
+            category=self.category,
+            tool=self.tool,
+            ids=[self.ids[row] for row in rows],
+            timestamps=[self.timestamps[row] for row in rows],
+            labels=[self.labels[row] for row in rows],
+            ts=self.ts[rows],
+            columns={name: column[rows] for name, column in self.columns.items()},
+        )
+
+
+def series_dir(
+    results_dir: Path, system_profile_id: str, category: str, tool: str
+) -> Path:
+    """
+    Get the directory holding the stored columns of a series.
+
+    Each key is encoded as a single path component, so IDs containing
+    ``/`` or ``..`` cannot point outside the store.
+
+    Args:
+        results_dir: Base results directory
+        system_profile_id: System profile ID
+        category: Result category
+        tool: Tool name
+
+    Returns:
+        Path to ``results/.metrics/<system>/<category>/<tool>``
+
+    Raises:
+        ValueError: If a key is empty
+    """
+    return results_dir.joinpath(
+        METRICS_DIRNAME,
+        *(_path_component(key) for key in (system_profile_id, category, tool)),
+    )
+
+
+def _path_component(key: str) -> str:
+    if not key:
+        raise ValueError("Metric series keys must not be empty")
+    # Percent-encode separators, "%" and leading dots ("." and "..")
+    encoded = quote(key, safe="")
+    return "%2E" + encoded[1:] if encoded.startswith(".") else encoded
+
+
+def _fingerprint(conn: sqlite3.Connection, key: Tuple[str, str, str]) -> str:
+    """Hash the file stats of a series so any add/change/delete is noticed."""
+    digest = hashlib.sha1()
+    for path, mtime_ns, size in conn.execute(
+        "SELECT path, mtime_ns, size FROM results"
+        " WHERE system_profile_id = ? AND category = ? AND tool = ?"
+        " ORDER BY path",
+        key,
+    ):
+        digest.update(f"{path}\0{mtime_ns}\0{size}\n".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def _read_column(filepath: Path, length: int) -> np.ndarray:
+    if not length:
+        # An empty file cannot be mapped
+        return np.empty(0)
+    # Raises ValueError if the file is shorter than expected
+    return np.memmap(filepath, dtype=np.float64, mode="r", shape=(length,))
+
+
+def _load_series(
+    series_dir: Path, key: Tuple[str, str, str], fingerprint: str
+) -> Optional[MetricSeries]:
+    """Load a stored series if it is complete and current."""
+    meta_path = series_dir / "meta.json"
+    try:
+        meta = codec.loads(meta_path.read_bytes())
+        if (
+            meta.get("store_version") != STORE_VERSION
+            or meta.get("fingerprint") != fingerprint
+        ):
+            return None
+
+        length = len(meta["ids"])
+        return MetricSeries(
+            system_profile_id=key[0],
+            category=key[1],
+            tool=key[2],
+            ids=meta["ids"],
+            timestamps=meta["timestamps"],
+            labels=meta["labels"],
+            ts=_read_column(series_dir / "ts.f64", length),
+            columns={
+                name: _read_column(series_dir / f"col{i}.f64", length)
+                for i, name in enumerate(meta["metrics"])
+            },
+        )
+    except (OSError, ValueError, KeyError):
+        return None
+
+
+def _build_series(
+    conn: sqlite3.Connection,
+    series_dir: Path,
+    key: Tuple[str, str, str],
+    fingerprint: str,
+) -> MetricSeries:
+    """Materialize a series from the index and write it to disk."""
+    rows = conn.execute(
+        "SELECT path, id, timestamp, ts, label FROM results"
+        " WHERE system_profile_id = ? AND category = ? AND tool = ?"
+        " ORDER BY ts, path",
+        key,
+    ).fetchall()
+    row_of = {path: i for i, (path, *_rest) in enumerate(rows)}
+
+    columns: Dict[str, np.ndarray] = {}
+    for path, name, value in conn.execute(
+        "SELECT m.path, m.name, m.value FROM metrics m"
+        " JOIN results r ON r.path = m.path"
+        " WHERE r.system_profile_id = ? AND r.category = ? AND r.tool = ?"
+        " AND m.value IS NOT NULL",
+        key,
+    ):
+        column = columns.get(name)
+        if column is None:
+            column = columns[name] = np.full(len(rows), np.nan)
+        column[row_of[path]] = value
+
+    series = MetricSeries(
+        system_profile_id=key[0],
+        category=key[1],
+        tool=key[2],
+        ids=[row[1] for row in rows],
+        timestamps=[row[2] for row in rows],
+        labels=[row[4] for row in rows],
+        ts=np.array([row[3] for row in rows], dtype=np.float64),
+        columns=dict(sorted(columns.items())),
+    )
+
+    # Columns first, metadata last: readers only trust a matching meta.json
+    atomic_save_bytes(series_dir / "ts.f64", series.ts.tobytes())
+    for i, column in enumerate(series.columns.values()):
+        atomic_save_bytes(series_dir / f"col{i}.f64", column.tobytes())
+    for stale in series_dir.glob("col*.f64"):
+        if int(stale.stem[3:]) >= len(series.columns):
+            stale.unlink(missing_ok=True)
+    atomic_save_json(
+        series_dir / "meta.json",
+        {
+            "store_version": STORE_VERSION,
+            "fingerprint": fingerprint,
+            "metrics": list(series.columns),
+            "ids": series.ids,
+            "timestamps": series.timestamps,
+            "labels": series.labels,
+        },
+    )
+    return series
+
+
+def load_metric_series(
+    results_dir: Path,
+    system_profile_id: str,
+    category: Optional[str] = None,
+    tool: Optional[str] = None,
+    workers: Optional[int] = 1,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    where: Optional[Predicate] = None,
+) -> List[MetricSeries]:
+    """
+    Load columnar metric series for a system, rebuilding stale ones.
+
+    Series live under ``results/.metrics/<system>/<category>/<tool>/`` as
+    raw float64 column files plus a ``meta.json``. A series is rebuilt
+    from the result index only when the stats of its result files change.
+
+    Args:
+        results_dir: Base results directory
+        system_profile_id: System profile ID
+        category: Only load series of this category
+        tool: Only load series of this tool
+        workers: Number of processes used to refresh the index
+        since: Only rows at or after this time
+        until: Only rows at or before this time
+        where: Only rows whose metrics satisfy this predicate
+
+    Returns:
+        One non-empty MetricSeries per (category, tool), ordered by
+        category and tool
+
+    Raises:
+        sqlite3.Error: If the result index cannot be used
+    """
+    if not results_dir.exists():
+        return []
+
+    clauses = ["system_profile_id = ?"]
+    params = [system_profile_id]
+    if category:
+        clauses.append("category = ?")
+        params.append(category)
+    if tool:
+        clauses.append("tool = ?")
+        params.append(tool)
+
+    series_list = []
+    with ResultIndex(results_dir) as index:
+        index.refresh(workers=workers)
+        conn = index.connect()
+        keys = conn.execute(
+            "SELECT DISTINCT system_profile_id, category, tool FROM results"
+            f" WHERE {' AND '.join(clauses)} ORDER BY category, tool",
+            params,
+        ).fetchall()
+        for key in keys:
+            directory = series_dir(results_dir, *key)
+            fingerprint = _fingerprint(conn, key)
+            series = _load_series(directory, key, fingerprint)
+            if series is None:
+                series = _build_series(conn, directory, key, fingerprint)
+            series = series.between(since, until)
+            if where is not None:
+                series = series.matching(where)
+            if len(series):
+                series_list.append(series)
+
+    return series_list
+
@@ -1,10 +1,94 @@
 """System profile storage operations."""
 
+import os
 from pathlib import Path
-from typing import List
+from typing import Any, Dict, List, Optional, Tuple
 
 from ..models.system import SystemProfile
-from .base import load_and_validate_json, save_model_to_json
+from . import codec
+from .base import (
+    atomic_save_json,
+    load_and_validate_json,
+    load_many_and_validate_json,
+    save_model_to_json,
+)
+from .watch import drain_changes
+
+CATALOG_FILENAME = ".catalog.json"
+CATALOG_VERSION = 1
+
+# In-process caches, invalidated by file and directory mtimes:
+# profile file -> ((mtime_ns, size), profile)
+_profiles: Dict[Path, Tuple[Tuple[int, int], SystemProfile]] = {}
+# systems directory -> (mtime_ns, profile file names)
+_listings: Dict[Path, Tuple[int, List[str]]] = {}
+# systems directory -> last list_system_profiles result, reused while a
+# watcher reports no changes
+_listed: Dict[Path, List[SystemProfile]] = {}
+
+
+def _file_key(st: os.stat_result) -> Tuple[int, int]:
+    return st.st_mtime_ns, st.st_size
+
+
+def _profile_names(systems_dir: Path) -> List[str]:
+    """List profile file names, re-reading the directory only if it changed."""
+    try:
+        mtime_ns = systems_dir.stat().st_mtime_ns
+    except FileNotFoundError:
+        return []
+
+    cached = _listings.get(systems_dir)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+
+    with os.scandir(systems_dir) as entries:
+        names = sorted(
+            entry.name
+            for entry in entries
+            if entry.name.endswith(".json")
+            and not entry.name.startswith(".")
+            and entry.is_file()
+        )
+    _listings[systems_dir] = (mtime_ns, names)
+    return names
+
+
+def _read_catalog(systems_dir: Path) -> Optional[Dict[str, Any]]:
+    """Read the compiled profile catalog, or None if there is none."""
+    try:
+        catalog = codec.loads((systems_dir / CATALOG_FILENAME).read_bytes())
+    except (OSError, ValueError):
+        return None
+    if catalog.get("catalog_version") != CATALOG_VERSION:
+        return None
+    return catalog.get("profiles", {})
+
+
+def _write_catalog(
+    systems_dir: Path, entries: Dict[str, Tuple[Tuple[int, int], SystemProfile]]
+) -> None:
+    atomic_save_json(
+        systems_dir / CATALOG_FILENAME,
+        {
+            "catalog_version": CATALOG_VERSION,
+            "profiles": {
+                name: {
+                    "mtime_ns": key[0],
+                    "size": key[1],
+                    "profile": profile.model_dump(mode="json"),
+                }
+                for name, (key, profile) in sorted(entries.items())
+            },
+        },
+    )
+
+
+def clear_profile_cache() -> None:
+    """Forget all profiles cached in this process."""
+    _profiles.clear()
+    _listings.clear()
+    _listed.clear()
 
 
 def save_system_profile(profile: SystemProfile, systems_dir: Path) -> Path:
@@ -24,6 +108,10 @@ def save_system_profile(profile: SystemProfile, systems_dir: Path) -> Path:
     systems_dir.mkdir(parents=True, exist_ok=True)
     filepath = systems_dir / f"{profile.profile_id}.json"
     save_model_to_json(filepath, profile)
+    _profiles[filepath] = (_file_key(filepath.stat()), profile)
+    # Directory mtimes may be too coarse to notice a quick successive add
+    _listings.pop(systems_dir, None)
+    _listed.pop(systems_dir, None)
     return filepath
 
 
@@ -31,6 +119,9 @@ def load_system_profile(profile_id: str, systems_dir: Path) -> SystemProfile:
     """
     Load a system profile from JSON file.
 
+    Profiles are cached in-process and only re-read when the file's
+    mtime or size changes.
+
     Args:
         profile_id: Profile identifier
         systems_dir: Directory containing profiles
@@ -43,15 +134,33 @@ def load_system_profile(profile_id: str, systems_dir: Path) -> SystemProfile:
         ValidationError: If JSON doesn't match schema
     """
     filepath = systems_dir / f"{profile_id}.json"
-    return load_and_validate_json(filepath, SystemProfile)
+    key = _file_key(filepath.stat())
+    cached = _profiles.get(filepath)
+    if cached is not None and cached[0] == key:
+        return cached[1]
+
+    profile = load_and_validate_json(filepath, SystemProfile)
+    _profiles[filepath] = (key, profile)
+    return profile
 
 
-def list_system_profiles(systems_dir: Path) -> List[SystemProfile]:
+def list_system_profiles(
+    systems_dir: Path, workers: Optional[int] = 1
+) -> List[SystemProfile]:
     """
     List all system profiles in the directory.
 
+    Unchanged profiles are served from the in-process cache, then from
+    the compiled catalog (``systems/.catalog.json``) if one exists; only
+    the remaining files are read and validated. An existing catalog is
+    rewritten when any of its entries were stale. If the directory is
+    watched (see ``storage.watch``), the previous listing is reused until
+    a profile changes.
+
     Args:
         systems_dir: Directory containing profiles
+        workers: Number of processes used to load files (None or 0 for
+            one per CPU)
 
     Returns:
         List of SystemProfile objects, sorted by profile_id
@@ -59,19 +168,96 @@ def list_system_profiles(systems_dir: Path) -> List[SystemProfile]:
     Raises:
         ValidationError: If any JSON file is invalid
     """
-    if not systems_dir.exists():
+    changes = drain_changes(systems_dir)
+    if changes is not None:
+        if not changes and systems_dir in _listed:
+            return list(_listed[systems_dir])
+        for filepath in changes:
+            _profiles.pop(systems_dir / filepath.name, None)
+        _listings.pop(systems_dir, None)
+    _listed.pop(systems_dir, None)
+
+    names = _profile_names(systems_dir)
+    if not names:
         return []
 
-    profiles = []
-    for filepath in sorted(systems_dir.glob("*.json")):
+    catalog = None
+    current: Dict[str, Tuple[Tuple[int, int], SystemProfile]] = {}
+    stale: List[Tuple[str, Tuple[int, int]]] = []
+    for name in names:
+        filepath = systems_dir / name
         try:
-            profile = load_and_validate_json(filepath, SystemProfile)
-            profiles.append(profile)
-        except Exception as e:
+            key = _file_key(filepath.stat())
+        except FileNotFoundError:
+            continue
+
+        cached = _profiles.get(filepath)
+        if cached is not None and cached[0] == key:
+            current[name] = cached
+            continue
+
+        if catalog is None:
+            catalog = _read_catalog(systems_dir) or {}
+        entry = catalog.get(name)
+        if entry is not None and (entry["mtime_ns"], entry["size"]) == key:
+            try:
+                profile = SystemProfile.model_validate(entry["profile"])
+            except ValueError:
+                pass
+            else:
+                current[name] = _profiles[filepath] = (key, profile)
+                continue
+
+        stale.append((name, key))
+
+    filepaths = [systems_dir / name for name, _key in stale]
+    loaded = load_many_and_validate_json(filepaths, SystemProfile, workers=workers)
+    for filepath, (name, key), (profile, error, _digest) in zip(
+        filepaths, stale, loaded
+    ):
+        if error is not None:
             # Log error but continue processing other files
-            print(f"Warning: Failed to load {filepath}: {e}")
+            print(f"Warning: Failed to load {filepath}: {error}")
+            continue
+        current[name] = _profiles[filepath] = (key, profile)
+
+    if stale and (systems_dir / CATALOG_FILENAME).exists():
+        _write_catalog(systems_dir, current)
+
+    profiles = [current[name][1] for name in names if name in current]
+    _listed[systems_dir] = profiles
+    return list(profiles)
 
-    return profiles
+
+def compile_profile_catalog(
+    systems_dir: Path, workers: Optional[int] = 1
+) -> Path:
+    """
+    Write all valid profiles to a single catalog file.
+
+    Once the catalog exists, processes with a cold cache read one file
+    instead of one per profile, and ``list_system_profiles`` keeps it
+    current.
+
+    Args:
+        systems_dir: Directory containing profiles
+        workers: Number of processes used to load files
+
+    Returns:
+        Path to the catalog file
+
+    Raises:
+        IOError: If file cannot be written
+    """
+    list_system_profiles(systems_dir, workers=workers)
+    entries = {
+        name: _profiles[systems_dir / name]
+        for name in _profile_names(systems_dir)
+        if systems_dir / name in _profiles
+    }
+    systems_dir.mkdir(parents=True, exist_ok=True)
+    _write_catalog(systems_dir, entries)
+    return systems_dir / CATALOG_FILENAME
 
 
 def profile_exists(profile_id: str, systems_dir: Path) -> bool:
@@ -85,5 +271,12 @@ def profile_exists(profile_id: str, systems_dir: Path) -> bool:
     Returns:
         True if profile exists, False otherwise
     """
-    filepath = systems_dir / f"{profile_id}.json"
-    return filepath.exists()
+    name = f"{profile_id}.json"
+    if name in _profile_names(systems_dir):
+        return True
+    # The cached listing may predate a file created within the same
+    # directory mtime tick
+    if (systems_dir / name).is_file():
+        _listings.pop(systems_dir, None)
+        return True
+    return False
@@ -0,0 +1,245 @@
+"""Metric predicate expressions for filtering results.
+
+A small expression language over the numeric values in
+``BenchmarkResult.results``::
+
+    iops_read > 50000 and lat_p99_us < 2000
+    not (errors > 0) or label_score >= 1e3
+
+Comparisons are ``<``, ``<=``, ``>``, ``>=``, ``==`` (or ``=``) and
+``!=`` between a metric name and a number, combined with ``and``, ``or``,
+``not`` and parentheses. A comparison against a metric that a result
+does not report as a number is false.
+
+An expression is parsed once into a ``Predicate`` that can be evaluated
+against results (or any metric lookup) and compiled into SQL for the
+result index.
+"""
+
+import math
+import re
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple, Union
+
+from ..models.result import BenchmarkResult
+from .index import scalar_metrics
+
+MetricLookup = Callable[[str], Optional[float]]
+
+_OPERATORS = {
+    "<": lambda a, b: a < b,
+    "<=": lambda a, b: a <= b,
+    ">": lambda a, b: a > b,
+    ">=": lambda a, b: a >= b,
+    "==": lambda a, b: a == b,
+    "!=": lambda a, b: a != b,
+}
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<number>[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?)(?![\w.])
+      | (?P<op><=|>=|==|!=|<|>|=)
+      | (?P<paren>[()])
+      | (?P<name>[A-Za-z_][\w.]*)
+    )""",
+    re.VERBOSE,
+)
+
+
+@dataclass(frozen=True)
+class Comparison:
+    """``metric <op> value``."""
+
+    metric: str
+    op: str
+    value: float
+
+    def evaluate(self, lookup: MetricLookup) -> bool:
+        actual = lookup(self.metric)
+        if actual is None or math.isnan(actual):
+            return False
+        return _OPERATORS[self.op](actual, self.value)
+
+    def to_sql(self) -> Tuple[str, List[object]]:
+        return (
+            "EXISTS (SELECT 1 FROM metrics m WHERE m.path = results.path"
+            f" AND m.name = ? AND m.value {self.op} ?)",
+            [self.metric, self.value],
+        )
+
+
+@dataclass(frozen=True)
+class Not:
+    operand: "Node"
+
+    def evaluate(self, lookup: MetricLookup) -> bool:
+        return not self.operand.evaluate(lookup)
+
+    def to_sql(self) -> Tuple[str, List[object]]:
+        sql, params = self.operand.to_sql()
+        return f"NOT ({sql})", params
+
+
+@dataclass(frozen=True)
+class BoolOp:
+    op: str  # "and" or "or"
+    operands: Tuple["Node", ...]
+
+    def evaluate(self, lookup: MetricLookup) -> bool:
+        if self.op == "and":
+            return all(operand.evaluate(lookup) for operand in self.operands)
+        return any(operand.evaluate(lookup) for operand in self.operands)
+
+    def to_sql(self) -> Tuple[str, List[object]]:
+        parts = []
+        params: List[object] = []
+        for operand in self.operands:
+            sql, operand_params = operand.to_sql()
+            parts.append(f"({sql})")
+            params.extend(operand_params)
+        return f" {self.op.upper()} ".join(parts), params
+
+
+Node = Union[Comparison, Not, BoolOp]
+
+
+class Predicate:
+    """A parsed ``--where`` expression."""
+
+    def __init__(self, text: str, root: Node):
+        self.text = text
+        self.root = root
+
+    def __repr__(self) -> str:
+        return f"Predicate({self.text!r})"
+
+    def __str__(self) -> str:
+        return self.text
+
+    def evaluate(self, lookup: MetricLookup) -> bool:
+        """
+        Evaluate the expression against metric values.
+
+        Args:
+            lookup: Returns a metric's numeric value, or None if missing
+
+        Returns:
+            True if the expression holds
+        """
+        return self.root.evaluate(lookup)
+
+    def matches(self, result: BenchmarkResult) -> bool:
+        """
+        Evaluate the expression against a benchmark result.
+
+        Args:
+            result: Benchmark result
+
+        Returns:
+            True if the expression holds for the result's numeric metrics
+        """
+        return self.evaluate(scalar_metrics(result).get)
+
+    def to_sql(self) -> Tuple[str, List[object]]:
+        """
+        Compile the expression into a condition on the index.
+
+        Returns:
+            (SQL condition on the ``results`` table, parameters)
+        """
+        return self.root.to_sql()
+
+
+class _Parser:
+    def __init__(self, text: str):
+        self.text = text
+        self.tokens: List[Tuple[str, str, int]] = []
+        pos = 0
+        while text[pos:].strip():
+            match = _TOKEN.match(text, pos)
+            if match is None:
+                unexpected = len(text) - len(text[pos:].lstrip())
+                raise self.error("unexpected character", unexpected)
+            kind = match.lastgroup
+            value = match.group(kind)
+            start = match.start(kind)
+            if kind == "name" and value.lower() in ("and", "or", "not"):
+                kind, value = "keyword", value.lower()
+            self.tokens.append((kind, value, start))
+            pos = match.end()
+        self.index = 0
+
+    def error(self, message: str, pos: Optional[int] = None) -> ValueError:
+        if pos is None:
+            pos = (
+                self.tokens[self.index][2]
+                if self.index < len(self.tokens)
+                else len(self.text)
+            )
+        return ValueError(f"{message} at position {pos + 1} in {self.text!r}")
+
+    def peek(self) -> Optional[Tuple[str, str, int]]:
+        return self.tokens[self.index] if self.index < len(self.tokens) else None
+
+    def accept(self, kind: str, value: Optional[str] = None) -> Optional[str]:
+        token = self.peek()
+        if token is not None and token[0] == kind and value in (None, token[1]):
+            self.index += 1
+            return token[1]
+        return None
+
+    def expect(self, kind: str, what: str) -> str:
+        value = self.accept(kind)
+        if value is None:
+            raise self.error(f"expected {what}")
+        return value
+
+    def parse(self) -> Node:
+        if not self.tokens:
+            raise self.error("empty expression")
+        node = self.parse_or()
+        if self.peek() is not None:
+            raise self.error("unexpected token")
+        return node
+
+    def parse_or(self) -> Node:
+        operands = [self.parse_and()]
+        while self.accept("keyword", "or"):
+            operands.append(self.parse_and())
+        return operands[0] if len(operands) == 1 else BoolOp("or", tuple(operands))
+
+    def parse_and(self) -> Node:
+        operands = [self.parse_not()]
+        while self.accept("keyword", "and"):
+            operands.append(self.parse_not())
+        return operands[0] if len(operands) == 1 else BoolOp("and", tuple(operands))
+
+    def parse_not(self) -> Node:
+        if self.accept("keyword", "not"):
+            return Not(self.parse_not())
+        if self.accept("paren", "("):
+            node = self.parse_or()
+            if not self.accept("paren", ")"):
+                raise self.error("expected ')'")
+            return node
+        metric = self.expect("name", "a metric name")
+        op = self.expect("op", "a comparison operator")
+        value = self.expect("number", "a number")
+        return Comparison(metric, "==" if op == "=" else op, float(value))
+
+
+def parse_where(text: str) -> Predicate:
+    """
+    Parse a ``--where`` expression.
+
+    Args:
+        text: Expression, e.g. ``"iops_read>50000 and lat_p99_us<2000"``
+
+    Returns:
+        Compiled Predicate
+
+    Raises:
+        ValueError: If the expression is malformed
+    """
+    return Predicate(text, _Parser(text).parse())
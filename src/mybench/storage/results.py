@@ -1,10 +1,71 @@
 """Benchmark result storage operations."""
 
+import gzip
+import heapq
+import os
+import sqlite3
+from datetime import datetime
+from functools import partial
+from itertools import chain
 from pathlib import Path
-from typing import List, Literal, Optional
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+from ..models.config import KernelConfig, SoftwareVersions, SystemConfiguration
 from ..models.result import BenchmarkResult
-from .base import load_and_validate_json, save_model_to_json
+from . import codec
+from .base import (
+    atomic_save_many,
+    content_hash,
+    iter_load_and_validate_json,
+    load_and_validate_json,
+    load_many_and_validate_json,
+)
+from .configurations import configuration_path, load_configuration
+from .index import SORT_FIELDS, ResultIndex, scalar_metrics, timestamp_sort_key
+from .layout import (
+    CATEGORIES,
+    Layout,
+    candidate_paths,
+    iter_result_paths,
+    make_result_id,
+    path_category,
+    read_layout,
+    result_id_may_match,
+    result_path,
+    results_root,
+    scan_result_files,
+    write_layout,
+)
+from .query import Predicate
+
+# Opt-in cache for long-running processes: result file -> (content hash,
+# result). Only consulted for files whose indexed hash is trusted.
+_result_cache: Optional[Dict[Path, Tuple[str, BenchmarkResult]]] = None
+
+
+def enable_result_cache() -> None:
+    """
+    Keep loaded results in memory for the rest of the process.
+
+    Results are reused as long as their file's content hash recorded in
+    the index is unchanged, so repeated queries only load new or changed
+    files. Meant for ``mybench serve``; a one-shot command gains nothing.
+    """
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = {}
 
 
 def save_benchmark_result(
@@ -13,6 +74,12 @@ def save_benchmark_result(
     """
     Save a benchmark result to JSON file with timestamp filename.
 
+    Raw output is written to a gzip-compressed ``<id>.raw.gz`` sidecar next
+    to the JSON file and referenced through ``raw_output_file``, so that
+    listing results never has to parse it. The system configuration is
+    stored once under ``results/configurations/`` and referenced through
+    ``configuration_ref``.
+
     Args:
         result: BenchmarkResult to save
         results_dir: Base results directory
@@ -25,17 +92,101 @@ def save_benchmark_result(
     Raises:
         IOError: If file cannot be written
     """
-    cat = category or result.category
-    category_dir = results_dir / cat
-    category_dir.mkdir(parents=True, exist_ok=True)
+    return save_benchmark_results([result], results_dir, category=category)[0]
+
+
+def save_benchmark_results(
+    results: Sequence[BenchmarkResult],
+    results_dir: Path,
+    category: Optional[str] = None,
+) -> List[Path]:
+    """
+    Save many benchmark results in one pass.
+
+    Files are laid out as in ``save_benchmark_result``, in the flat or
+    sharded directory layout recorded for ``results_dir``. All files of
+    the batch are written atomically with a single durability barrier,
+    and the index is updated in one transaction.
+
+    Args:
+        results: BenchmarkResults to save
+        results_dir: Base results directory
+        category: Optional category override for every result
 
-    # Generate filename: YYYY-MM-DD_HHMMSS_tool.json
-    timestamp = result.timestamp.strftime("%Y-%m-%d_%H%M%S")
-    filename = f"{timestamp}_{result.tool}.json"
-    filepath = category_dir / filename
+    Returns:
+        Paths to the saved result files, in input order
 
-    save_model_to_json(filepath, result)
-    return filepath
+    Raises:
+        IOError: If files cannot be written
+    """
+    # Keyed by path so a later result with the same ID wins, as it would
+    # with successive single saves
+    files: Dict[Path, bytes] = {}
+    saved = []
+    layout = read_layout(results_dir)
+    for result in results:
+        cat = category or result.category
+
+        # Generate filename: YYYY-MM-DD_HHMMSS_tool.json, replacing an
+        # existing file with the same ID in whichever layout it is stored
+        result_id = make_result_id(result.timestamp, result.tool)
+        filepath = next(
+            (
+                path
+                for path in candidate_paths(results_dir, cat, result_id)
+                if path.exists()
+            ),
+            result_path(results_dir, cat, result_id, layout),
+        )
+
+        if (
+            result.raw_output is None
+            and result.raw_output_file
+            and not (filepath.parent / result.raw_output_file).exists()
+        ):
+            # A result from another tree (e.g. an export): bring its raw
+            # output along, or drop a reference that would not resolve
+            try:
+                result = result.inline_raw_output()
+            except FileNotFoundError as e:
+                print(f"Warning: Dropping raw output of {filepath.stem}: {e}")
+                result = result.model_copy(update={"raw_output_file": None})
+
+        if result.raw_output:
+            raw_path = filepath.with_suffix(".raw.gz")
+            # mtime=0 keeps the blob byte-identical across re-saves
+            files[raw_path] = gzip.compress(
+                result.raw_output.encode("utf-8"), mtime=0
+            )
+            result = result.model_copy(
+                update={"raw_output": None, "raw_output_file": raw_path.name}
+            )
+
+        if result.configuration is not None:
+            config_hash = result.configuration.content_hash()
+            config_path = configuration_path(results_dir, config_hash)
+            if config_path not in files and not config_path.exists():
+                files[config_path] = codec.dumps(
+                    result.configuration.model_dump(mode="json")
+                )
+            result = result.model_copy(
+                update={"configuration": None, "configuration_ref": config_hash}
+            )
+
+        data = codec.dumps(result.model_dump(mode="json"))
+        files[filepath] = data
+        saved.append((result, filepath, content_hash(data)))
+
+    atomic_save_many(list(files.items()))
+
+    # Keep the index current; a failure here is repaired by the next refresh
+    try:
+        with ResultIndex(results_dir) as index:
+            index.add_many(saved)
+    except sqlite3.Error:
+        pass
+
+    return [filepath for _result, filepath, _digest in saved]
 
 
 def load_benchmark_result(filepath: Path) -> BenchmarkResult:
@@ -49,10 +200,22 @@ def load_benchmark_result(filepath: Path) -> BenchmarkResult:
         Loaded BenchmarkResult
 
     Raises:
-        FileNotFoundError: If result file doesn't exist
+        FileNotFoundError: If result file or its stored configuration
+            doesn't exist
         ValidationError: If JSON doesn't match schema
     """
-    return load_and_validate_json(filepath, BenchmarkResult)
+    result = load_and_validate_json(filepath, BenchmarkResult)
+    return _attach_source(result, filepath)
+
+
+def _attach_source(result: BenchmarkResult, filepath: Path) -> BenchmarkResult:
+    """Remember where a result was loaded from and resolve its configuration."""
+    result._source_path = filepath
+    if result.configuration is None:
+        result.configuration = load_configuration(
+            result.configuration_ref, results_root(filepath)
+        )
+    return result
 
 
 def list_benchmark_results(
@@ -60,18 +223,62 @@ def list_benchmark_results(
     category: Optional[Literal["cpu", "memory", "disk", "network"]] = None,
     system_profile_id: Optional[str] = None,
     label: Optional[str] = None,
+    use_index: bool = True,
+    workers: Optional[int] = 1,
+    tool: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    where: Optional[Predicate] = None,
+    strict: bool = False,
+    sort_by: str = "timestamp",
+    descending: bool = True,
+    limit: Optional[int] = None,
+    offset: int = 0,
 ) -> List[BenchmarkResult]:
     """
     List benchmark results with optional filters.
 
+    Filters are answered by the SQLite index under ``results/`` (refreshed
+    incrementally from file mtimes), so only matching files are loaded.
+    If the index cannot be used, every file is scanned instead. In both
+    cases the tool and time-range filters are first checked against the
+    ``YYYY-MM-DD_HHMMSS_tool`` filename, so non-matching files are never
+    opened. Files whose content hash matches the one recorded when the
+    index validated them are loaded without re-validation unless
+    ``strict`` is set.
+
+    With the index, metric predicates, sorting and paging are evaluated
+    in SQLite and only the requested page of files is loaded. When
+    scanning, results are streamed through a bounded heap of
+    ``offset + limit`` entries.
+
+    Use ``iter_benchmark_results`` to process large stores without
+    holding every result in memory.
+
     Args:
         results_dir: Base results directory
         category: Filter by category (cpu, memory, disk, network)
         system_profile_id: Filter by system profile ID
         label: Filter by label
+        use_index: Answer filters from the result index
+        workers: Number of processes used to load files (None or 0 for
+            one per CPU)
+        tool: Filter by tool name
+        since: Only results at or after this time
+        until: Only results at or before this time
+        where: Only results whose metrics satisfy this predicate
+        strict: Fully validate every file, even unchanged ones
+        sort_by: "timestamp", "category", "tool", "system", "label" or a
+            metric name; results without a numeric value for the metric
+            are left out
+        descending: Sort in descending order; ties are broken by
+            timestamp in the same direction
+        limit: Maximum number of results to return
+        offset: Number of leading results to skip
 
     Returns:
-        List of BenchmarkResult objects, sorted by timestamp (newest first)
+        List of BenchmarkResult objects in the requested order (newest
+        first by default)
 
     Raises:
         ValidationError: If any JSON file is invalid
@@ -79,66 +286,517 @@ def list_benchmark_results(
     if not results_dir.exists():
         return []
 
-    results = []
+    if use_index:
+        name_filter = None
+        if tool or since or until:
+            name_filter = partial(
+                result_id_may_match, tool=tool, since=since, until=until
+            )
+        try:
+            with ResultIndex(results_dir) as index:
+                index.refresh(
+                    workers=workers, name_filter=name_filter, since=since, until=until
+                )
+                paths = index.query(
+                    category=category,
+                    system_profile_id=system_profile_id,
+                    label=label,
+                    tool=tool,
+                    since=since,
+                    until=until,
+                    where=where,
+                    sort_by=sort_by,
+                    descending=descending,
+                    limit=limit,
+                    offset=offset,
+                )
+                trusted_hashes = None if strict else index.content_hashes(paths)
+        except sqlite3.Error as e:
+            print(f"Warning: Result index unavailable, scanning files: {e}")
+        else:
+            loaded = _load_results(paths, workers, trusted_hashes)
+            return [result for result in loaded if result is not None]
+
+    results = iter_benchmark_results(
+        results_dir,
+        category=category,
+        system_profile_id=system_profile_id,
+        label=label,
+        use_index=False,
+        workers=workers,
+        tool=tool,
+        since=since,
+        until=until,
+        where=where,
+    )
+    key = _result_sort_key(sort_by)
+    if sort_by not in SORT_FIELDS:
+        results = (r for r in results if key(r)[0] is not None)
+
+    if limit is None:
+        return sorted(results, key=key, reverse=descending)[offset:]
+    # Bounded heap instead of a full sort
+    select = heapq.nlargest if descending else heapq.nsmallest
+    return select(offset + limit, results, key=key)[offset:]
+
+
+def _result_sort_key(
+    sort_by: str,
+) -> Callable[[BenchmarkResult], Tuple[Any, float]]:
+    """Build a sort key matching ResultIndex.query's ordering."""
+
+    def key(result: BenchmarkResult) -> Tuple[Any, float]:
+        ts = timestamp_sort_key(result.timestamp)
+        if sort_by == "timestamp":
+            return ts, ts
+        if sort_by in SORT_FIELDS:
+            value = getattr(result, SORT_FIELDS[sort_by])
+            return value or "", ts
+        return scalar_metrics(result).get(sort_by), ts
+
+    return key
+
+
+def iter_benchmark_results(
+    results_dir: Path,
+    category: Optional[Literal["cpu", "memory", "disk", "network"]] = None,
+    system_profile_id: Optional[str] = None,
+    label: Optional[str] = None,
+    use_index: bool = True,
+    workers: Optional[int] = 1,
+    tool: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    where: Optional[Predicate] = None,
+    strict: bool = False,
+    newest_first: bool = True,
+) -> Iterator[BenchmarkResult]:
+    """
+    Lazily yield benchmark results with optional filters.
+
+    Takes the same filters as ``list_benchmark_results``, but results are
+    loaded and yielded a page at a time, so memory stays bounded and the
+    first results arrive before the rest are read. With the index, results
+    come in exact timestamp order. Without it, they come in result ID
+    order, which is the wall-clock time in the filename, and directories
+    are listed one at a time with no global sort.
 
-    # Determine which directories to scan
-    if category:
-        search_dirs = [results_dir / category]
-    else:
-        search_dirs = [
-            results_dir / cat for cat in ["cpu", "memory", "disk", "network"]
-        ]
+    Args:
+        results_dir: Base results directory
+        category: Filter by category (cpu, memory, disk, network)
+        system_profile_id: Filter by system profile ID
+        label: Filter by label
+        use_index: Answer filters from the result index
+        workers: Number of processes used to load files (None or 0 for
+            one per CPU)
+        tool: Filter by tool name
+        since: Only results at or after this time
+        until: Only results at or before this time
+        where: Only results whose metrics satisfy this predicate
+        strict: Fully validate every file, even unchanged ones
+        newest_first: Yield newest results first rather than oldest
+
+    Yields:
+        BenchmarkResult objects
+    """
+    if not results_dir.exists():
+        return
 
-    # Load results from all applicable directories
-    for cat_dir in search_dirs:
-        if not cat_dir.exists():
-            continue
+    name_filter = None
+    if tool or since or until:
+        name_filter = partial(
+            result_id_may_match, tool=tool, since=since, until=until
+        )
 
-        for filepath in cat_dir.glob("*.json"):
+    if use_index:
+        index = ResultIndex(results_dir)
+        try:
             try:
-                result = load_and_validate_json(filepath, BenchmarkResult)
+                index.refresh(
+                    workers=workers, name_filter=name_filter, since=since, until=until
+                )
+                pages = index.iter_query(
+                    category=category,
+                    system_profile_id=system_profile_id,
+                    label=label,
+                    tool=tool,
+                    since=since,
+                    until=until,
+                    where=where,
+                    newest_first=newest_first,
+                )
+                first_page = next(pages, [])
+            except sqlite3.Error as e:
+                print(f"Warning: Result index unavailable, scanning files: {e}")
+            else:
+                # Only fall back before anything was yielded
+                items = (
+                    (path, None if strict else digest)
+                    for page in chain([first_page], pages)
+                    for path, digest in page
+                )
+                yield from _iter_load_results(items, workers)
+                return
+        finally:
+            index.close()
+
+    # Stream the category directories, skipping month shards out of range
+    paths = iter_result_paths(
+        results_dir,
+        categories=[category] if category else None,
+        since=since,
+        until=until,
+        newest_first=newest_first,
+    )
+    items = (
+        (path, None)
+        for path in paths
+        if name_filter is None or name_filter(path.stem)
+    )
+
+    since_key = timestamp_sort_key(since) if since else None
+    until_key = timestamp_sort_key(until) if until else None
+    for result in _iter_load_results(items, workers):
+        # Apply filters
+        if system_profile_id and result.system_profile_id != system_profile_id:
+            continue
+        if label and result.label != label:
+            continue
+        if tool and result.tool != tool:
+            continue
+        if since_key is not None or until_key is not None:
+            key = timestamp_sort_key(result.timestamp)
+            if since_key is not None and key < since_key:
+                continue
+            if until_key is not None and key > until_key:
+                continue
+        if where is not None and not where.matches(result):
+            continue
+        yield result
 
-                # Apply filters
-                if system_profile_id and (
-                    result.system_profile_id != system_profile_id
-                ):
-                    continue
-                if label and result.label != label:
-                    continue
 
-                results.append(result)
-            except Exception as e:
-                # Log error but continue processing other files
-                print(f"Warning: Failed to load {filepath}: {e}")
+def list_metric_names(
+    results_dir: Path,
+    category: Optional[Literal["cpu", "memory", "disk", "network"]] = None,
+    system_profile_id: Optional[str] = None,
+    label: Optional[str] = None,
+    use_index: bool = True,
+    workers: Optional[int] = 1,
+    tool: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    where: Optional[Predicate] = None,
+    by_tool: bool = False,
+) -> Union[List[str], List[Tuple[str, str]]]:
+    """
+    Get the union of result keys over all results matching the filters.
 
-    # Sort by timestamp, newest first
-    results.sort(key=lambda r: r.timestamp, reverse=True)
+    Answered from the result index without loading any result file. If
+    the index cannot be used, matching results are streamed once to
+    collect their keys.
+
+    Args:
+        results_dir: Base results directory
+        category: Filter by category (cpu, memory, disk, network)
+        system_profile_id: Filter by system profile ID
+        label: Filter by label
+        use_index: Answer filters from the result index
+        workers: Number of processes used to load files
+        tool: Filter by tool name
+        since: Only results at or after this time
+        until: Only results at or before this time
+        where: Only results whose metrics satisfy this predicate
+        by_tool: Return (tool, name) pairs instead, for the tools that
+            reported each name
+
+    Returns:
+        Sorted metric names
+    """
+    if not results_dir.exists():
+        return []
+
+    if use_index:
+        name_filter = None
+        if tool or since or until:
+            name_filter = partial(
+                result_id_may_match, tool=tool, since=since, until=until
+            )
+        try:
+            with ResultIndex(results_dir) as index:
+                index.refresh(
+                    workers=workers, name_filter=name_filter, since=since, until=until
+                )
+                return index.metric_names(
+                    category=category,
+                    system_profile_id=system_profile_id,
+                    label=label,
+                    tool=tool,
+                    since=since,
+                    until=until,
+                    where=where,
+                    by_tool=by_tool,
+                )
+        except sqlite3.Error as e:
+            print(f"Warning: Result index unavailable, scanning files: {e}")
+
+    names = set()
+    for result in iter_benchmark_results(
+        results_dir,
+        category=category,
+        system_profile_id=system_profile_id,
+        label=label,
+        use_index=False,
+        workers=workers,
+        tool=tool,
+        since=since,
+        until=until,
+        where=where,
+    ):
+        if by_tool:
+            names.update((result.tool, name) for name in result.results)
+        else:
+            names.update(result.results)
+    return sorted(names, key=lambda item: item[::-1]) if by_tool else sorted(names)
+
+
+def construct_benchmark_result(data: Dict[str, Any]) -> BenchmarkResult:
+    """
+    Build a BenchmarkResult from trusted data without validation.
+
+    Only used for files whose content is byte-identical to a version that
+    was fully validated before. Nested models are constructed explicitly
+    since ``model_construct`` does not recurse.
+
+    Args:
+        data: Decoded result JSON
+
+    Returns:
+        BenchmarkResult instance
+    """
+    fields = dict(data)
+    fields["timestamp"] = datetime.fromisoformat(data["timestamp"])
+
+    if data.get("configuration") is not None:
+        config = dict(data["configuration"])
+        config["kernel"] = KernelConfig.model_construct(**config["kernel"])
+        if config.get("software") is not None:
+            config["software"] = SoftwareVersions.model_construct(
+                **config["software"]
+            )
+        fields["configuration"] = SystemConfiguration.model_construct(**config)
+
+    return BenchmarkResult.model_construct(**fields)
+
+
+def _load_results(
+    paths: Sequence[Path],
+    workers: Optional[int],
+    trusted_hashes: Optional[Sequence[Optional[str]]] = None,
+) -> List[Optional[BenchmarkResult]]:
+    """Load result files in order, reporting failures as warnings."""
+    results: List[Optional[BenchmarkResult]] = [None] * len(paths)
+    pending = list(range(len(paths)))
+    if _result_cache is not None and trusted_hashes is not None:
+        pending = []
+        for i, (filepath, trusted_hash) in enumerate(zip(paths, trusted_hashes)):
+            cached = _result_cache.get(filepath)
+            if cached is not None and cached[0] == trusted_hash:
+                results[i] = cached[1]
+            else:
+                pending.append(i)
+
+    loaded = load_many_and_validate_json(
+        [paths[i] for i in pending],
+        BenchmarkResult,
+        workers=workers,
+        trusted_hashes=(
+            None if trusted_hashes is None else [trusted_hashes[i] for i in pending]
+        ),
+        construct=construct_benchmark_result,
+    )
+    for i, (result, error, digest) in zip(pending, loaded):
+        filepath = paths[i]
+        if error is None:
+            try:
+                result = _attach_source(result, filepath)
+            except Exception as e:
+                error = str(e)
+        if error is not None:
+            # Log error but continue processing other files
+            print(f"Warning: Failed to load {filepath}: {error}")
+            continue
+        if _result_cache is not None:
+            _result_cache[filepath] = (digest, result)
+        results[i] = result
     return results
 
 
-def get_result_by_id(result_id: str, results_dir: Path) -> Optional[BenchmarkResult]:
+def _iter_load_results(
+    items: Iterable[Tuple[Path, Optional[str]]], workers: Optional[int]
+) -> Iterator[BenchmarkResult]:
+    """Lazily load result files in order, reporting failures as warnings."""
+    loaded = iter_load_and_validate_json(
+        items, BenchmarkResult, workers=workers, construct=construct_benchmark_result
+    )
+    for filepath, (result, error, _digest) in loaded:
+        if error is None:
+            try:
+                result = _attach_source(result, filepath)
+            except Exception as e:
+                error = str(e)
+        if error is not None:
+            # Log error but continue processing other files
+            print(f"Warning: Failed to load {filepath}: {error}")
+            continue
+        yield result
+
+
+def get_result_by_id(
+    result_id: str, results_dir: Path, strict: bool = False
+) -> Optional[BenchmarkResult]:
     """
     Find and load a result by its ID (timestamp_tool pattern).
 
     Args:
         result_id: Result identifier (e.g., "2025-11-09_143022_sysbench")
+            or a unique prefix of one (e.g., "2025-11-09_1430")
         results_dir: Base results directory
+        strict: Fully validate the file even if it is unchanged
 
     Returns:
         BenchmarkResult if found, None otherwise
+
+    Raises:
+        ValueError: If a prefix matches more than one result
     """
-    # Search all category directories
-    for cat in ["cpu", "memory", "disk", "network"]:
-        cat_dir = results_dir / cat
-        if not cat_dir.exists():
-            continue
+    return get_results_by_ids([result_id], results_dir, strict=strict)[0]
 
-        filepath = cat_dir / f"{result_id}.json"
-        if filepath.exists():
-            try:
-                return load_and_validate_json(filepath, BenchmarkResult)
-            except Exception as e:
-                print(f"Warning: Failed to load {filepath}: {e}")
-                return None
 
+def get_results_by_ids(
+    result_ids: Sequence[str], results_dir: Path, strict: bool = False
+) -> List[Optional[BenchmarkResult]]:
+    """
+    Find and load several results by ID in one pass.
+
+    IDs are resolved through the result index, which is refreshed at most
+    once per call and only when an ID is missing or stale.
+
+    Args:
+        result_ids: Result identifiers or unique prefixes
+        results_dir: Base results directory
+        strict: Fully validate files even if they are unchanged
+
+    Returns:
+        List aligned with ``result_ids`` holding each BenchmarkResult, or
+        None where no result was found
+
+    Raises:
+        ValueError: If a prefix matches more than one result
+    """
+    trusted_hashes = None
+    try:
+        with ResultIndex(results_dir) as index:
+            paths = [_resolve_result_path(index, rid) for rid in result_ids]
+            if any(path is None or not path.exists() for path in paths):
+                index.refresh()
+                paths = [_resolve_result_path(index, rid) for rid in result_ids]
+            found = [path for path in paths if path is not None]
+            if not strict:
+                trusted_hashes = index.content_hashes(found)
+    except sqlite3.Error:
+        paths = [_probe_result_path(rid, results_dir) for rid in result_ids]
+        found = [path for path in paths if path is not None]
+
+    loaded = iter(_load_results(found, 1, trusted_hashes))
+    return [None if path is None else next(loaded) for path in paths]
+
+
+def _resolve_result_path(index: ResultIndex, result_id: str) -> Optional[Path]:
+    """Resolve an exact ID or unique ID prefix to a file path."""
+    matches = index.find(result_id)
+    if not matches:
+        return None
+
+    ids = sorted({path.stem for path in matches})
+    if len(ids) > 1:
+        shown = ", ".join(ids[:5]) + (", ..." if len(ids) > 5 else "")
+        raise ValueError(
+            f"Ambiguous result ID '{result_id}' matches {len(ids)} results: "
+            f"{shown}"
+        )
+
+    # The same ID may exist in several categories; keep category order
+    matches.sort(key=lambda path: CATEGORIES.index(path_category(path)))
+    return matches[0]
+
+
+def _probe_result_path(result_id: str, results_dir: Path) -> Optional[Path]:
+    """Look for an exact result ID in each category directory."""
+    for cat in CATEGORIES:
+        for filepath in candidate_paths(results_dir, cat, result_id):
+            if filepath.exists():
+                return filepath
     return None
+
+
+def migrate_results_layout(results_dir: Path, layout: Layout) -> int:
+    """
+    Move result files and their raw output sidecars into a layout.
+
+    The layout is recorded so that new results are saved in it. Files are
+    renamed, not rewritten, and the index is updated in place, so nothing
+    has to be re-parsed. Reads work throughout, since both layouts are
+    always searched.
+
+    Args:
+        results_dir: Base results directory
+        layout: "flat" or "sharded"
+
+    Returns:
+        Number of result files moved
+
+    Raises:
+        OSError: If a file cannot be moved
+    """
+    moves = []
+    for reldir, entries in scan_result_files(results_dir):
+        category = reldir.split("/")[0]
+        for entry in entries:
+            source = Path(entry.path)
+            target = result_path(results_dir, category, source.stem, layout)
+            if target != source:
+                moves.append((source, target))
+
+    moved = []
+    try:
+        for source, target in moves:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            raw_source = source.with_suffix(".raw.gz")
+            if raw_source.exists():
+                os.replace(raw_source, target.with_suffix(".raw.gz"))
+            os.replace(source, target)
+            moved.append((source, target))
+    finally:
+        try:
+            with ResultIndex(results_dir) as index:
+                index.move(moved)
+        except sqlite3.Error:
+            # Repaired by the next refresh
+            pass
+
+    # Drop month and year shards left empty
+    for cat in CATEGORIES:
+        cat_dir = results_dir / cat
+        if not cat_dir.is_dir():
+            continue
+        for year_dir in cat_dir.iterdir():
+            if not (year_dir.is_dir() and year_dir.name.isdigit()):
+                continue
+            for month_dir in year_dir.iterdir():
+                if month_dir.is_dir() and not any(month_dir.iterdir()):
+                    month_dir.rmdir()
+            if not any(year_dir.iterdir()):
+                year_dir.rmdir()
+
+    write_layout(results_dir, layout)
+    return len(moved)
@@ -0,0 +1,286 @@
+"""Change notification for the results and systems directories.
+
+A long-running process (``mybench serve``) registers a watcher per
+directory tree with ``watch``. ``ResultIndex.refresh`` and
+``list_system_profiles`` then ask ``drain_changes`` which files changed
+since they last looked and re-read only those, instead of stat-ing every
+file. Without a registered watcher, or after events were lost, they fall
+back to a full scan.
+
+On Linux, watchers use inotify through libc. Elsewhere, or if inotify is
+unavailable (e.g. the watch limit is reached), they poll file mtimes and
+sizes when drained.
+"""
+
+import ctypes
+import errno
+import os
+import struct
+import sys
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+# inotify event masks (linux/inotify.h)
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_MOVE_SELF = 0x00000800
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+IN_ISDIR = 0x40000000
+
+_WATCH_MASK = (
+    IN_ATTRIB
+    | IN_CLOSE_WRITE
+    | IN_MOVED_FROM
+    | IN_MOVED_TO
+    | IN_CREATE
+    | IN_DELETE
+    | IN_DELETE_SELF
+    | IN_MOVE_SELF
+)
+_EVENT = struct.Struct("iIII")
+
+# Watched directory (absolute) -> watcher
+_watchers: Dict[Path, "Watcher"] = {}
+
+
+class Watcher(ABC):
+    """Collects the files changed under a directory tree."""
+
+    def __init__(self, root: Path, ignore: Iterable[str] = ()):
+        self.root = root
+        # Directory names (besides dot-directories) that are not watched
+        self.ignore = frozenset(ignore)
+        # The first drain always asks for a full scan
+        self._lost = True
+
+    def _skip_dir(self, name: str) -> bool:
+        return name.startswith(".") or name in self.ignore
+
+    @abstractmethod
+    def drain(self) -> Optional[Set[Path]]:
+        """
+        Collect the files changed since the previous call.
+
+        Returns:
+            Absolute paths of created, modified, renamed or deleted files,
+            or None if changes may have been missed and a full scan is
+            needed
+        """
+
+    def invalidate(self) -> None:
+        """Make the next drain ask for a full scan."""
+        self._lost = True
+
+    def close(self) -> None:
+        """Stop watching."""
+
+
+class InotifyWatcher(Watcher):
+    """Watcher fed by inotify events, read without blocking when drained."""
+
+    def __init__(self, root: Path, ignore: Iterable[str] = ()):
+        super().__init__(root, ignore)
+        self._libc = ctypes.CDLL(None, use_errno=True)
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self._dirs: Dict[int, Path] = {}
+        # Set once a new directory could not be watched
+        self._incomplete = False
+        try:
+            self._add_tree(root)
+        except OSError:
+            os.close(self._fd)
+            raise
+
+    def _add_tree(self, directory: Path) -> None:
+        """Watch a directory and every non-ignored directory below it."""
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), _WATCH_MASK | IN_ONLYDIR
+        )
+        if wd < 0:
+            code = ctypes.get_errno()
+            if code in (errno.ENOENT, errno.ENOTDIR):
+                # Removed again before it could be watched
+                return
+            raise OSError(code, f"Cannot watch {directory}: {os.strerror(code)}")
+        self._dirs[wd] = directory
+
+        with os.scandir(directory) as entries:
+            subdirs = [
+                entry.name
+                for entry in entries
+                if entry.is_dir(follow_symlinks=False)
+                and not self._skip_dir(entry.name)
+            ]
+        for name in subdirs:
+            self._add_tree(directory / name)
+
+    def drain(self) -> Optional[Set[Path]]:
+        changed: Set[Path] = set()
+        lost, self._lost = self._lost, False
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                break
+
+            offset = 0
+            while offset < len(data):
+                wd, mask, _cookie, length = _EVENT.unpack_from(data, offset)
+                offset += _EVENT.size
+                name = os.fsdecode(data[offset : offset + length].rstrip(b"\0"))
+                offset += length
+
+                if mask & IN_Q_OVERFLOW:
+                    lost = True
+                    continue
+                if mask & IN_IGNORED:
+                    self._dirs.pop(wd, None)
+                    continue
+                directory = self._dirs.get(wd)
+                if directory is None:
+                    continue
+                if mask & (IN_DELETE_SELF | IN_MOVE_SELF):
+                    # A watched directory itself went away or moved
+                    lost = True
+                elif not name or name.startswith("."):
+                    continue
+                elif mask & IN_ISDIR:
+                    if not self._skip_dir(name):
+                        # Files may have appeared before the directory was
+                        # watched, or left with it
+                        lost = True
+                        if mask & (IN_CREATE | IN_MOVED_TO):
+                            self._watch_new(directory / name)
+                else:
+                    changed.add(directory / name)
+
+        return None if lost or self._incomplete else changed
+
+    def _watch_new(self, directory: Path) -> None:
+        try:
+            self._add_tree(directory)
+        except OSError as e:
+            # Without a watch on every directory, only full scans are safe
+            print(f"Warning: {e}; falling back to full scans of {self.root}")
+            self._incomplete = True
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+class PollingWatcher(Watcher):
+    """Watcher comparing file mtimes and sizes with the previous drain."""
+
+    def __init__(self, root: Path, ignore: Iterable[str] = ()):
+        super().__init__(root, ignore)
+        self._snapshot = self._scan()
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        files = {}
+        for directory, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [name for name in dirnames if not self._skip_dir(name)]
+            for name in filenames:
+                if name.startswith("."):
+                    continue
+                filepath = Path(directory, name)
+                try:
+                    st = filepath.stat()
+                except FileNotFoundError:
+                    continue
+                files[filepath] = (st.st_mtime_ns, st.st_size)
+        return files
+
+    def drain(self) -> Optional[Set[Path]]:
+        previous, self._snapshot = self._snapshot, self._scan()
+        lost, self._lost = self._lost, False
+        if lost:
+            return None
+        return {
+            filepath
+            for filepath in previous.keys() | self._snapshot.keys()
+            if previous.get(filepath) != self._snapshot.get(filepath)
+        }
+
+
+def watch(root: Path, ignore: Iterable[str] = ()) -> Optional[Watcher]:
+    """
+    Start watching a directory tree for changed files.
+
+    Uses inotify on Linux and falls back to polling elsewhere or if
+    inotify fails. Dot-files and dot-directories are never reported.
+
+    Args:
+        root: Directory to watch
+        ignore: Names of subdirectories to leave out
+
+    Returns:
+        The registered Watcher, or None if ``root`` is not a directory
+    """
+    root = root.absolute()
+    if not root.is_dir():
+        return None
+
+    unwatch(root)
+    watcher: Optional[Watcher] = None
+    if sys.platform.startswith("linux"):
+        try:
+            watcher = InotifyWatcher(root, ignore)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable, polling {root}: {e}")
+    if watcher is None:
+        watcher = PollingWatcher(root, ignore)
+    _watchers[root] = watcher
+    return watcher
+
+
+def unwatch(root: Path) -> None:
+    """
+    Stop watching a directory tree.
+
+    Args:
+        root: Directory passed to ``watch``
+    """
+    watcher = _watchers.pop(root.absolute(), None)
+    if watcher is not None:
+        watcher.close()
+
+
+def invalidate(root: Path) -> None:
+    """
+    Make the next ``drain_changes`` of a watched directory ask for a full scan.
+
+    Used when drained changes could not be applied, so they are not lost.
+
+    Args:
+        root: Watched directory
+    """
+    watcher = _watchers.get(root.absolute())
+    if watcher is not None:
+        watcher.invalidate()
+
+
+def drain_changes(root: Path) -> Optional[Set[Path]]:
+    """
+    Get the files changed under a watched directory since the last call.
+
+    Args:
+        root: Watched directory
+
+    Returns:
+        Absolute paths of changed files, or None if ``root`` is not
+        watched or changes may have been missed (scan everything)
+    """
+    if not _watchers:
+        return None
+    watcher = _watchers.get(root.absolute())
+    return None if watcher is None else watcher.drain()
@@ -1,19 +1,110 @@
 """Rich formatting utilities for CLI output."""
 
-from typing import Any, Dict, List
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence
 from rich.console import Console
 from rich.table import Table
-from rich.panel import Panel
-from rich.syntax import Syntax
 import json
+import sys
 
-from ..models.system import SystemProfile
-from ..models.result import BenchmarkResult
+if TYPE_CHECKING:
+    from ..analysis.changepoints import ChangePoint
+    from ..analysis.gate import GateReport
+    from ..analysis.trend import TrendStats
+    from ..models.system import SystemProfile
+    from ..models.result import BenchmarkResult
 
 console = Console()
 
+RESULT_COLUMNS = ["Timestamp", "Category", "Tool", "System", "Label", "Key Metrics"]
+PROFILE_COLUMNS = ["Profile ID", "Name", "Type", "CPU", "Memory", "Created"]
+
+# Characters that would split a TSV cell or row
+_TSV_ESCAPES = str.maketrans({"\t": " ", "\n": " ", "\r": " "})
+
+
+def use_plain_output(
+    output_format: Optional[str] = None, plain: bool = False
+) -> bool:
+    """
+    Decide whether to skip Rich and write plain text.
+
+    Args:
+        output_format: Format requested with --format ("table" or "tsv"),
+            None to choose by the output
+        plain: Whether --plain was given
+
+    Returns:
+        True for plain output: when requested, or by default when stdout
+        is not a terminal
+    """
+    if plain or output_format == "tsv":
+        return True
+    if output_format == "table":
+        return False
+    return not console.is_terminal
+
+
+def write_tsv(columns: Sequence[str], rows: Iterable[Sequence[str]]) -> int:
+    """
+    Write a header and rows as tab-separated values, one row at a time.
+
+    Args:
+        columns: Column names for the header line
+        rows: Cell strings of each row; tabs and newlines become spaces
+
+    Returns:
+        Number of rows written
+    """
+    write = sys.stdout.write
+    write("\t".join(columns) + "\n")
+    count = 0
+    for row in rows:
+        write("\t".join(cell.translate(_TSV_ESCAPES) for cell in row) + "\n")
+        count += 1
+    return count
+
+
+def _profile_row(profile: "SystemProfile") -> List[str]:
+    """Cells of a system profile for PROFILE_COLUMNS."""
+    # Extract CPU info based on type
+    if hasattr(profile.hardware.cpu, "model"):
+        cpu_info = f"{profile.hardware.cpu.model} ({profile.hardware.cpu.cores}c)"
+    else:
+        cpu_info = f"{profile.hardware.cpu.vcpus} vCPUs"
+
+    memory_info = f"{profile.hardware.memory.total_gb}GB"
+
+    return [
+        profile.profile_id,
+        profile.profile_name,
+        profile.type,
+        cpu_info,
+        memory_info,
+        str(profile.created),
+    ]
+
+
+def _result_row(result: "BenchmarkResult") -> List[str]:
+    """Cells of a benchmark result for RESULT_COLUMNS."""
+    # Extract key metrics (first few items)
+    metrics = []
+    for key, value in list(result.results.items())[:3]:
+        if isinstance(value, float):
+            metrics.append(f"{key}: {value:.2f}")
+        else:
+            metrics.append(f"{key}: {value}")
+
+    return [
+        result.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+        result.category,
+        result.tool,
+        result.system_profile_id,
+        result.label or "-",
+        ", ".join(metrics),
+    ]
 
-def format_system_profiles_table(profiles: List[SystemProfile]) -> Table:
+
+def format_system_profiles_table(profiles: Iterable["SystemProfile"]) -> Table:
     """Format system profiles as a Rich table."""
     table = Table(title="System Profiles", show_header=True)
     table.add_column("Profile ID", style="cyan")
@@ -24,31 +115,34 @@ def format_system_profiles_table(profiles: List[SystemProfile]) -> Table:
     table.add_column("Created", style="dim")
 
     for profile in profiles:
-        # Extract CPU info based on type
-        if hasattr(profile.hardware.cpu, "model"):
-            cpu_info = f"{profile.hardware.cpu.model} ({profile.hardware.cpu.cores}c)"  # noqa: E501
-        else:
-            cpu_info = f"{profile.hardware.cpu.vcpus} vCPUs"
+        table.add_row(*_profile_row(profile))
 
-        memory_info = f"{profile.hardware.memory.total_gb}GB"
+    return table
 
-        table.add_row(
-            profile.profile_id,
-            profile.profile_name,
-            profile.type,
-            cpu_info,
-            memory_info,
-            str(profile.created),
-        )
 
-    return table
+def write_system_profiles_tsv(profiles: Iterable["SystemProfile"]) -> int:
+    """Write system profiles as TSV rows without building a table."""
+    return write_tsv(PROFILE_COLUMNS, map(_profile_row, profiles))
+
 
+def format_system_profile_detail(
+    profile: "SystemProfile", plain: bool = False
+) -> None:
+    """Display detailed system profile information.
 
-def format_system_profile_detail(profile: SystemProfile) -> None:
-    """Display detailed system profile information."""
+    With ``plain``, the JSON is written as-is instead of highlighted.
+    """
     # Convert to dict and pretty print
     data = profile.model_dump(exclude_none=True)
     json_str = json.dumps(data, indent=2, default=str)
+    if plain:
+        sys.stdout.write(json_str + "\n")
+        return
+
+    # Syntax highlighting loads Pygments, so only import it when needed
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+
     syntax = Syntax(json_str, "json", theme="monokai", line_numbers=True)
 
     console.print(
@@ -60,7 +154,7 @@ def format_system_profile_detail(profile: SystemProfile) -> None:
     )
 
 
-def format_benchmark_results_table(results: List[BenchmarkResult]) -> Table:
+def format_benchmark_results_table(results: Iterable["BenchmarkResult"]) -> Table:
     """Format benchmark results as a Rich table."""
     table = Table(title="Benchmark Results", show_header=True)
     table.add_column("Timestamp", style="cyan")
@@ -71,32 +165,35 @@ def format_benchmark_results_table(results: List[BenchmarkResult]) -> Table:
     table.add_column("Key Metrics", style="white")
 
     for result in results:
-        # Extract key metrics (first few items)
-        metrics = []
-        for key, value in list(result.results.items())[:3]:
-            if isinstance(value, float):
-                metrics.append(f"{key}: {value:.2f}")
-            else:
-                metrics.append(f"{key}: {value}")
-        metrics_str = ", ".join(metrics)
-
-        table.add_row(
-            result.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
-            result.category,
-            result.tool,
-            result.system_profile_id,
-            result.label or "-",
-            metrics_str,
-        )
+        table.add_row(*_result_row(result))
 
     return table
 
 
-def format_benchmark_result_detail(result: BenchmarkResult) -> None:
-    """Display detailed benchmark result information."""
-    # Convert to dict and pretty print
-    data = result.model_dump(exclude_none=True)
+def write_benchmark_results_tsv(results: Iterable["BenchmarkResult"]) -> int:
+    """Write benchmark results as TSV rows, each as soon as it is read."""
+    return write_tsv(RESULT_COLUMNS, map(_result_row, results))
+
+
+def format_benchmark_result_detail(
+    result: "BenchmarkResult", plain: bool = False
+) -> None:
+    """Display detailed benchmark result information.
+
+    With ``plain``, the JSON is written as-is instead of highlighted.
+    """
+    # Convert to dict and pretty print; the stored configuration's hash
+    # would only repeat the configuration shown inline
+    exclude = {"configuration_ref"} if result.configuration is not None else None
+    data = result.model_dump(exclude_none=True, exclude=exclude)
     json_str = json.dumps(data, indent=2, default=str)
+    if plain:
+        sys.stdout.write(json_str + "\n")
+        return
+
+    from rich.panel import Panel
+    from rich.syntax import Syntax
+
     syntax = Syntax(json_str, "json", theme="monokai", line_numbers=True)
 
     result_id = result.timestamp.strftime("%Y-%m-%d_%H%M%S")
@@ -110,17 +207,31 @@ def format_benchmark_result_detail(result: BenchmarkResult) -> None:
 
 
 def format_comparison_table(
-    result1: BenchmarkResult,
-    result2: BenchmarkResult,
     deltas: Dict[str, Dict[str, Any]],
+    headers: Sequence[str] = ("Result 1", "Result 2"),
+    title: str = "Benchmark Comparison",
 ) -> Table:
-    """Format comparison results as a Rich table."""
-    table = Table(title="Benchmark Comparison", show_header=True)
+    """Format comparison results as a Rich table.
+
+    Changes are green when they are improvements and red when they are
+    regressions, following each metric's ``direction`` (higher is better
+    if it has none).
+
+    Deltas of group comparisons (see compare_groups) add median change,
+    confidence interval and p-value columns; their changes within the
+    noise are dimmed and marked with "≈" instead of colored.
+    """
+    grouped = any("p_value" in info for info in deltas.values())
+    table = Table(title=title, show_header=True)
     table.add_column("Metric", style="cyan")
-    table.add_column("Result 1", style="white")
-    table.add_column("Result 2", style="white")
+    table.add_column(headers[0], style="white")
+    table.add_column(headers[1], style="white")
     table.add_column("Delta", style="yellow")
     table.add_column("Change %", style="green")
+    if grouped:
+        table.add_column("Median %", style="white")
+        table.add_column("Delta CI", style="white")
+        table.add_column("p", style="white")
 
     for metric, delta_info in deltas.items():
         value1 = delta_info.get("value1", "N/A")
@@ -144,22 +255,152 @@ def format_comparison_table(
         else:
             delta_str = str(delta)
 
-        if isinstance(percent, float):
+        if isinstance(percent, float) and delta_info.get("within_noise"):
+            percent_str = f"[dim]≈{percent:+.2f}%[/]"
+        elif isinstance(percent, float):
             # Color code: green for improvement, red for regression
-            if percent > 0:
-                percent_str = f"[green]+{percent:.2f}%[/]"
-            elif percent < 0:
-                percent_str = f"[red]{percent:.2f}%[/]"
+            if delta_info.get("direction") == "lower":
+                color = "red" if percent > 0 else "green"
             else:
+                color = "green" if percent > 0 else "red"
+            if percent == 0:
                 percent_str = "0.00%"
+            else:
+                percent_str = f"[{color}]{percent:+.2f}%[/]"
         else:
             percent_str = str(percent)
 
-        table.add_row(metric, value1_str, value2_str, delta_str, percent_str)
+        cells = [metric, value1_str, value2_str, delta_str, percent_str]
+        if grouped and "p_value" in delta_info:
+            cells += [
+                f"{delta_info['median_percent_change']:+.2f}%",
+                f"[{delta_info['ci_low']:+.4g}, {delta_info['ci_high']:+.4g}]",
+                f"{delta_info['p_value']:.3g}",
+            ]
+        elif grouped:
+            cells += ["N/A", "N/A", "N/A"]
+        table.add_row(*cells)
 
     return table
 
 
+def format_trend_stats_table(
+    metric: str, stats: "TrendStats", bucket: Optional[str] = None
+) -> Table:
+    """Format rolling-window or per-bucket statistics of a metric as a Rich table."""
+    if bucket:
+        table = Table(title=f"Trend: {metric} per {bucket}", show_header=True)
+        table.add_column(bucket.capitalize(), style="cyan")
+        table.add_column("Points", style="white")
+    else:
+        table = Table(title=f"Trend: {metric} (rolling)", show_header=True)
+        table.add_column("Timestamp", style="cyan")
+        table.add_column("Value", style="green")
+    for name in ["Mean", "Median", "Std Dev", "Min", "Max"]:
+        table.add_column(name, style="yellow" if name == "Mean" else "white")
+
+    rows = zip(
+        stats.timestamps,
+        (stats.count if bucket else stats.value).tolist(),
+        *(
+            column.tolist()
+            for column in [stats.mean, stats.median, stats.std, stats.min, stats.max]
+        ),
+    )
+    for timestamp, first, *values in rows:
+        if bucket:
+            cells = [timestamp.strftime("%Y-%m-%d"), str(first)]
+        else:
+            cells = [timestamp.strftime("%Y-%m-%d %H:%M:%S"), f"{first:.4f}"]
+        # NaN (the deviation of a single point) is shown as "-"
+        cells.extend("-" if value != value else f"{value:.4f}" for value in values)
+        table.add_row(*cells)
+
+    return table
+
+
+def format_gate_table(report: "GateReport") -> Table:
+    """Format the per-metric checks of a regression gate as a Rich table."""
+    table = Table(
+        title=f"Gate: {report.candidate_id} vs {report.baseline} "
+        f"(n={len(report.baseline_ids)})",
+        show_header=True,
+    )
+    table.add_column("Metric", style="cyan")
+    table.add_column("Better", style="white")
+    table.add_column("Baseline", style="white")
+    table.add_column("Value", style="white")
+    table.add_column("Change %", style="yellow")
+    table.add_column("Limit", style="white")
+    table.add_column("Status", style="white")
+
+    for check in report.checks:
+        if check.status == "pass":
+            status = "[green]pass[/]"
+        else:
+            status = f"[red]{check.status}[/]"
+        table.add_row(
+            check.metric,
+            check.direction,
+            "-" if check.baseline is None else f"{check.baseline:.4f}",
+            "-" if check.value is None else f"{check.value:.4f}",
+            "-" if check.percent_change is None else f"{check.percent_change:+.2f}%",
+            f"{check.max_regression:g}%",
+            status,
+        )
+
+    return table
+
+
+def format_changepoints_table(
+    system_profile_id: str, changes: Iterable["ChangePoint"]
+) -> Table:
+    """Format detected step changes as a Rich table, colored by direction."""
+    from ..analysis.registry import lookup_metric
+
+    table = Table(title=f"Change Points: {system_profile_id}")
+    table.add_column("Timestamp", style="cyan")
+    table.add_column("Tool", style="green")
+    table.add_column("Metric", style="white")
+    table.add_column("Before", style="white")
+    table.add_column("After", style="white")
+    table.add_column("Change %", style="yellow")
+    for change in changes:
+        percent = change.percent_change
+        better = lookup_metric(change.tool, change.metric).direction == "higher"
+        color = "green" if (percent > 0) == better else "red"
+        table.add_row(
+            change.timestamp.strftime("%Y-%m-%d %H:%M:%S"),
+            change.tool,
+            change.metric,
+            f"{change.mean_before:.4f}",
+            f"{change.mean_after:.4f}",
+            f"[{color}]{percent:+.2f}%[/]",
+        )
+
+    return table
+
+
+def print_config_changes(changes: Dict[str, Any]) -> None:
+    """Print the configuration differences found by detect_config_changes."""
+    has_changes = False
+    if changes["os"]:
+        console.print(
+            f"[yellow]OS:[/] {changes['os']['old']} → {changes['os']['new']}"
+        )
+        has_changes = True
+
+    for section in ["kernel", "software", "environment"]:
+        if changes[section]:
+            console.print(f"\n[yellow]{section.capitalize()}:[/]")
+            for key, change in changes[section].items():
+                console.print(f"  {key}: {change['old']} → {change['new']}")
+            has_changes = True
+
+    if not has_changes:
+        console.print("[dim]No configuration changes detected[/]")
+
+
 def print_success(message: str) -> None:
     """Print a success message."""
     console.print(f"[green]✓[/] {message}")
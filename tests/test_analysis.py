@@ -1,15 +1,40 @@
 """Tests for benchmark analysis and comparison functions."""
 
+import math
+import statistics
+
+import numpy as np
 import pytest
-from datetime import datetime
+from datetime import datetime, timedelta
 from mybench.analysis.compare import (
     calculate_delta,
     compare_results,
     detect_config_changes,
-    generate_trend_data,
 )
+from mybench.analysis.changepoints import (
+    CHANGEPOINTS_FILENAME,
+    binary_segmentation,
+    find_changepoints,
+)
+from mybench.analysis.gate import (
+    PASS,
+    REGRESSION,
+    Threshold,
+    baseline_rows,
+    evaluate_gate,
+    parse_thresholds,
+)
+from mybench.analysis.registry import (
+    TOOL_METRICS,
+    lookup_metric,
+    normalize_metrics,
+)
+from mybench.analysis.groups import compare_groups, mann_whitney_u
+from mybench.analysis.trend import TrendMatrix
 from mybench.models.result import BenchmarkResult
 from mybench.models.config import SystemConfiguration, KernelConfig
+from mybench.storage.metrics import load_metric_series
+from mybench.storage.results import save_benchmark_result, save_benchmark_results
 
 
 class TestCalculateDelta:
@@ -162,9 +187,14 @@ class TestCompareResults:
         # Check bandwidth improvement
         assert deltas["read_bw_kb"]["percent_change"] == 20.0
 
-        # Check latency improvement (lower is better, so negative change)
-        assert deltas["lat_avg_us"]["percent_change"] < 0
-        assert deltas["lat_99th_us"]["percent_change"] < 0
+        # Check latency improvement (lower is better, so negative change);
+        # microseconds are normalized to milliseconds
+        assert deltas["lat_avg_ms"]["percent_change"] < 0
+        assert deltas["lat_99th_ms"]["percent_change"] < 0
+        assert deltas["lat_avg_ms"]["value1"] == pytest.approx(0.64)
+        assert deltas["lat_avg_ms"]["unit"] == "ms"
+        assert deltas["lat_avg_ms"]["direction"] == "lower"
+        assert deltas["read_iops"]["direction"] == "higher"
 
     def test_compare_non_numeric_values(self):
         """Test that non-numeric values are handled gracefully."""
@@ -396,8 +426,8 @@ class TestDetectConfigChanges:
         assert len(changes["environment"]) == 0
 
 
-class TestGenerateTrendData:
-    """Tests for generate_trend_data function."""
+class TestTrendMatrix:
+    """Tests for the TrendMatrix trend engine."""
 
     def test_trend_data_with_multiple_results(self):
         """Test generating trend data from multiple results."""
@@ -446,18 +476,19 @@ class TestGenerateTrendData:
             ),
         ]
 
-        trends = generate_trend_data(results)
+        trends = TrendMatrix.from_results(results)
 
-        assert "events_per_second" in trends
-        assert len(trends["events_per_second"]) == 3
-        assert trends["events_per_second"][0]["value"] == 10000.0
-        assert trends["events_per_second"][1]["value"] == 11000.0
-        assert trends["events_per_second"][2]["value"] == 12000.0
+        assert trends.metrics == ["events_per_second"]
+        points = trends.points("events_per_second")
+        assert [point["value"] for point in points] == [10000.0, 11000.0, 12000.0]
+        assert points[1]["label"] == "after-tuning"
+        assert points[2]["timestamp"] == datetime(2025, 11, 9, 12, 0, 0)
 
     def test_trend_data_with_empty_results(self):
         """Test generating trend data with empty list."""
-        trends = generate_trend_data([])
-        assert trends == {}
+        trends = TrendMatrix.from_results([])
+        assert len(trends) == 0
+        assert trends.counts() == {}
 
     def test_trend_data_with_missing_metrics(self):
         """Test trend data handles missing metrics gracefully."""
@@ -490,7 +521,384 @@ class TestGenerateTrendData:
             ),
         ]
 
-        trends = generate_trend_data(results)
+        trends = TrendMatrix.from_results(results)
+
+        # Only the first result has total_events
+        assert trends.counts() == {"events_per_second": 2, "total_events": 1}
+        with pytest.raises(KeyError):
+            trends.points("missing")
+
+    def test_trend_data_from_series_matches_results(self, tmp_path):
+        """Test columnar trends match trends built from result objects."""
+        results_dir = tmp_path / "results"
+        results = []
+        for i, tool in enumerate(["sysbench", "stress-ng", "sysbench"]):
+            result = BenchmarkResult(
+                timestamp=datetime(2025, 11, 9, 10 + i, 0, 0),
+                category="cpu",
+                tool=tool,
+                system_profile_id="test-system",
+                label=f"run-{i}",
+                configuration=SystemConfiguration(
+                    os="Ubuntu 22.04",
+                    kernel=KernelConfig(version="5.15.0"),
+                ),
+                benchmark_parameters={"threads": 8},
+                results={"events_per_second": 10000.0 + i, "status": "ok"},
+            )
+            save_benchmark_result(result, results_dir)
+            results.append(result)
+
+        series_list = load_metric_series(results_dir, "test-system")
+        trends = TrendMatrix.from_series(series_list)
+
+        expected = TrendMatrix.from_results(results)
+        assert trends.points("events_per_second") == expected.points(
+            "events_per_second"
+        )
+        # Only numeric metrics are kept
+        assert trends.metrics == expected.metrics == ["events_per_second"]
+
+        # Daemon responses rebuild the same matrix
+        rebuilt = TrendMatrix.from_dict(trends.to_dict())
+        assert rebuilt.points("events_per_second") == trends.points(
+            "events_per_second"
+        )
+
+    @staticmethod
+    def _nightly_results(values, start=datetime(2025, 11, 1, 2, 0, 0)):
+        return [
+            BenchmarkResult(
+                timestamp=start + timedelta(days=i),
+                category="cpu",
+                tool="sysbench",
+                system_profile_id="test-system",
+                configuration=SystemConfiguration(
+                    os="Ubuntu 22.04",
+                    kernel=KernelConfig(version="5.15.0"),
+                ),
+                benchmark_parameters={},
+                results={"score": value, **({"extra": 1.0} if i % 2 else {})},
+            )
+            for i, value in enumerate(values)
+        ]
+
+    def test_rolling_statistics(self):
+        """Test rolling windows match statistics over the latest points."""
+        values = [5.0, 1.0, 4.0, 4.0, 9.0, 2.0, 6.0]
+        trends = TrendMatrix.from_results(self._nightly_results(values))
+
+        stats = trends.rolling("score", 3)
+        assert list(stats.value) == values
+        for i in range(len(values)):
+            window = values[max(0, i - 2) : i + 1]
+            assert stats.count[i] == len(window)
+            assert stats.mean[i] == pytest.approx(statistics.mean(window))
+            assert stats.median[i] == statistics.median(window)
+            assert stats.min[i] == min(window)
+            assert stats.max[i] == max(window)
+            if len(window) > 1:
+                assert stats.std[i] == pytest.approx(statistics.stdev(window))
+            else:
+                assert math.isnan(stats.std[i])
+
+        # Windows count points that reported the metric, not rows
+        assert list(trends.rolling("extra", 2).count) == [1, 2, 2]
+        with pytest.raises(ValueError):
+            trends.rolling("score", 0)
+
+    def test_bucket_statistics(self):
+        """Test daily and weekly buckets group points by calendar period."""
+        # Nightly from Saturday 2025-11-01 to Monday 2025-11-17
+        values = [float(i % 5) for i in range(17)]
+        trends = TrendMatrix.from_results(self._nightly_results(values))
+
+        daily = trends.buckets("score", "day")
+        assert daily.timestamps[0] == datetime(2025, 11, 1)
+        assert list(daily.count) == [1] * 17
+        assert list(daily.mean) == values
+
+        weekly = trends.buckets("score", "week")
+        # Weeks start on Monday
+        assert weekly.timestamps == [
+            datetime(2025, 10, 27),
+            datetime(2025, 11, 3),
+            datetime(2025, 11, 10),
+            datetime(2025, 11, 17),
+        ]
+        groups = [values[:2], values[2:9], values[9:16], values[16:]]
+        assert list(weekly.count) == [len(group) for group in groups]
+        for i, group in enumerate(groups):
+            assert weekly.mean[i] == pytest.approx(statistics.mean(group))
+            assert weekly.median[i] == statistics.median(group)
+            assert weekly.min[i] == min(group)
+            assert weekly.max[i] == max(group)
+        assert weekly.std[1] == pytest.approx(statistics.stdev(groups[1]))
+        assert math.isnan(weekly.std[3])
+
+        with pytest.raises(ValueError):
+            trends.buckets("score", "month")
+
+
+def _group_results(label, values, tool="sysbench"):
+    return [
+        BenchmarkResult(
+            timestamp=datetime(2025, 11, 9, 10, 0, 0) + timedelta(minutes=i),
+            category="cpu",
+            tool=tool,
+            system_profile_id="test-system",
+            label=label,
+            configuration=SystemConfiguration(
+                os="Ubuntu 22.04",
+                kernel=KernelConfig(version="5.15.0"),
+            ),
+            benchmark_parameters={},
+            results=results,
+        )
+        for i, results in enumerate(values)
+    ]
+
+
+class TestCompareGroups:
+    """Tests for comparing groups of runs."""
+
+    def test_shift_is_significant_and_noise_is_not(self):
+        """Test a consistent shift is flagged while run-to-run noise is not."""
+        noise = [0.3, -0.5, 0.1, 0.4, -0.2, -0.1, 0.5, -0.4, 0.2, 0.0]
+        baseline = _group_results(
+            "A", [{"eps": 1000 + 10 * n, "lat": 5 + n} for n in noise]
+        )
+        candidate = _group_results(
+            "B",
+            [{"eps": 1100 + 10 * n, "lat": 5 - n, "extra": 1} for n in noise],
+        )
+
+        deltas = compare_groups(baseline, candidate, resamples=2000, seed=1)
+
+        eps = deltas["eps"]
+        assert eps["value1"] == pytest.approx(1000.3)
+        assert eps["percent_change"] == pytest.approx(10.0, rel=0.01)
+        assert eps["median_delta"] == pytest.approx(100.0)
+        assert 0 < eps["ci_low"] < 100 < eps["ci_high"]
+        assert eps["p_value"] < 0.001
+        assert not eps["within_noise"]
+
+        # Only noise around the same level
+        lat = deltas["lat"]
+        assert lat["ci_low"] < 0 < lat["ci_high"]
+        assert lat["p_value"] > 0.5
+        assert lat["within_noise"]
+
+        assert deltas["extra"]["delta"] == "N/A"
+        assert deltas == compare_groups(baseline, candidate, resamples=2000, seed=1)
+
+    def test_invalid_groups_raise_error(self):
+        """Test empty groups and mixed tools are rejected."""
+        baseline = _group_results("A", [{"eps": 1.0}])
+        with pytest.raises(ValueError, match="at least one"):
+            compare_groups(baseline, [])
+        with pytest.raises(ValueError, match="different tools"):
+            compare_groups(baseline, _group_results("B", [{"eps": 1.0}], "fio"))
+
+    def test_mann_whitney_u(self):
+        """Test exact and approximate p-values of the Mann-Whitney U test."""
+        # Fully separated groups of 3: 2 of 20 rankings are as extreme
+        u, p = mann_whitney_u(np.array([1.0, 2.0, 3.0]), np.array([4.0, 5.0, 6.0]))
+        assert u == 0
+        assert p == pytest.approx(0.1)
+
+        # Ties use the normal approximation
+        u, p = mann_whitney_u(np.array([1.0, 1.0, 2.0]), np.array([1.0, 2.0, 2.0]))
+        assert u == 3
+        assert 0.3 < p < 1
+
+        u, p = mann_whitney_u(np.full(30, 2.0), np.full(30, 2.0))
+        assert p == 1.0
+
+
+class TestChangePoints:
+    """Tests for change-point detection."""
+
+    def test_binary_segmentation(self):
+        """Test steps are found and pure noise is left alone."""
+        rng = np.random.default_rng(0)
+        noise = rng.normal(0, 1, 300)
+        steps = noise + np.repeat([0.0, 4.0, 1.0], [100, 120, 80])
+
+        assert binary_segmentation(steps, penalty=3 * math.log(300)) == [100, 220]
+        assert binary_segmentation(noise, penalty=3 * math.log(300)) == []
+
+    def test_changepoints_are_updated_incrementally(self, tmp_path):
+        """Test saved results only extend the stored segmentation."""
+        results_dir = tmp_path / "results"
+        rng = np.random.default_rng(1)
+
+        def save_nights(first, count, level, kernel):
+            results = _group_results(
+                None,
+                [
+                    {"eps": float(level + rng.normal(0, 5)), "lat": 2.0}
+                    for _ in range(count)
+                ],
+            )
+            save_benchmark_results(
+                [
+                    result.model_copy(
+                        update={
+                            "timestamp": datetime(2025, 1, 1)
+                            + timedelta(days=first + i),
+                            "configuration": SystemConfiguration(
+                                os="Ubuntu 22.04",
+                                kernel=KernelConfig(version=kernel),
+                            ),
+                        }
+                    )
+                    for i, result in enumerate(results)
+                ],
+                results_dir,
+            )
+
+        save_nights(0, 30, 1000, "5.15.0")
+        assert find_changepoints(results_dir, "test-system") == []
+        state_path = (
+            results_dir / ".metrics/test-system/cpu/sysbench" / CHANGEPOINTS_FILENAME
+        )
+        assert state_path.exists()
+
+        save_nights(30, 10, 900, "6.5.0")
+        (change,) = find_changepoints(results_dir, "test-system", metrics=["eps"])
+        assert change.metric == "eps"
+        assert change.before_id.startswith("2025-01-30")
+        assert change.after_id.startswith("2025-01-31")
+        assert change.percent_change == pytest.approx(-10, abs=1.5)
+
+        # Unchanged results leave the stored state alone
+        mtime = state_path.stat().st_mtime_ns
+        assert find_changepoints(results_dir, "test-system", metrics=["eps"]) == [
+            change
+        ]
+        assert state_path.stat().st_mtime_ns == mtime
+
+        # Starting over finds the same change
+        state_path.unlink()
+        assert find_changepoints(results_dir, "test-system", metrics=["eps"]) == [
+            change
+        ]
+
+
+class TestGate:
+    """Tests for the regression gate."""
+
+    def test_parse_thresholds(self):
+        """Test metric thresholds inherit the default and are validated."""
+        config = parse_thresholds(
+            {
+                "default": {"max_regression": "2.5%"},
+                "metrics": {"lat": {"direction": "lower"}, "eps": None},
+            }
+        )
+        assert config.threshold("lat") == Threshold("lower", 2.5)
+        assert config.threshold("eps") == Threshold(None, 2.5)
+        assert config.threshold("other") == Threshold(None, 2.5)
+        assert parse_thresholds(None).threshold("eps") is None
+
+        for data in [
+            {"metrics": {"eps": {"direction": "up"}}},
+            {"metrics": {"eps": {"max_regression": -1}}},
+            {"metrics": {"eps": {"limit": 5}}},
+            {"thresholds": {}},
+            ["eps"],
+        ]:
+            with pytest.raises(ValueError):
+                parse_thresholds(data)
+
+    def test_baseline_rows(self, tmp_path):
+        """Test baselines by label, run count and time window."""
+        labels = ["A", "B", "A", "B", "A", "A"]
+        results = _group_results(None, [{"eps": 1.0}] * len(labels))
+        results = [
+            result.model_copy(
+                update={"label": label, "timestamp": datetime(2025, 1, 1 + day)}
+            )
+            for day, (result, label) in enumerate(zip(results, labels))
+        ]
+        save_benchmark_results(results, tmp_path)
+        (series,) = load_metric_series(tmp_path, "test-system")
+
+        assert baseline_rows(series, 5, "A") == [0, 2, 4]
+        assert baseline_rows(series, 4, "B") == [1, 3]
+        assert baseline_rows(series, 5, "last:2") == [3, 4]
+        assert baseline_rows(series, 1, "last:5") == [0]
+        assert baseline_rows(series, 5, "last:3d") == [2, 3, 4]
+        assert baseline_rows(series, 5, "last:1w") == [0, 1, 2, 3, 4]
+
+
+    def test_thresholds_may_use_reported_names(self, tmp_path):
+        """Test thresholds keyed by a tool's own metric names are applied."""
+        results = _group_results(
+            None,
+            [{"bw": 1000.0, "lat_p99_us": 500.0}] * 3
+            + [{"bw": 800.0, "lat_p99_us": 510.0}],
+            tool="fio",
+        )
+        save_benchmark_results(results, tmp_path)
+        (series,) = load_metric_series(tmp_path, "test-system")
+        config = parse_thresholds(
+            {"metrics": {"bw": {"max_regression": 5}, "lat_p99_us": None}}
+        )
 
-        assert len(trends["events_per_second"]) == 2
-        assert len(trends["total_events"]) == 1  # Only first result has it
+        report = evaluate_gate(series, config, "last:3")
+        statuses = {check.metric: check.status for check in report.checks}
+        assert statuses == {"bw_mb_s": REGRESSION, "lat_p99_ms": PASS}
+
+        # A reported and a canonical name of one metric are ambiguous
+        config = parse_thresholds({"metrics": {"bw": None, "bw_mb_s": None}})
+        with pytest.raises(ValueError, match="bw_mb_s"):
+            evaluate_gate(series, config, "last:3")
+
+
+class TestMetricRegistry:
+    """Tests for metric names, units and directions."""
+
+    def test_lookup_metric(self):
+        """Test tool entries, unit suffixes and name-based directions."""
+        bw = lookup_metric("fio", "read_bw")
+        assert (bw.name, bw.unit, bw.direction) == ("read_bw_mb_s", "MB/s", "higher")
+        assert bw.factor == pytest.approx(1024 / 1e6)
+
+        lat = lookup_metric("fio", "clat_p99_us")
+        assert (lat.name, lat.unit, lat.direction) == ("clat_p99_ms", "ms", "lower")
+        assert lookup_metric("mbw", "copy_mib_s").name == "copy_mb_s"
+        assert lookup_metric("iperf3", "sender_gbit_s").factor == 1000
+        assert lookup_metric("netperf", "rr_latency").direction == "lower"
+        assert lookup_metric("stress-ng", "bogo_ops")[:3] == ("bogo_ops", "", "higher")
+
+    def test_canonical_names_map_to_themselves(self):
+        """Test normalized metrics can be looked up again unchanged."""
+        for tool, metrics in TOOL_METRICS.items():
+            for name in [*metrics, "lat_avg_us", "bw_kib_s", "rate_bits_per_second"]:
+                spec = lookup_metric(tool, name)
+                again = lookup_metric(tool, spec.name)
+                assert again == spec._replace(factor=1.0), (tool, name)
+
+    def test_renamed_metric_is_merged(self):
+        """Test results of tool versions naming a metric differently line up."""
+        assert normalize_metrics("fio", {"bw": 2048.0, "iops": 1.0}) == {
+            "bw_mb_s": pytest.approx(2.097152),
+            "iops": 1.0,
+        }
+        assert normalize_metrics("fio", {"bw": 2048.0, "bw_mb_s": 2.0}) == {
+            "bw_mb_s": 2.0
+        }
+
+        old = _group_results(None, [{"bw": 1000.0}] * 2, tool="fio")
+        new = _group_results(None, [{"bw_mb_s": 1.1}] * 2, tool="fio")
+        new = [
+            result.model_copy(update={"timestamp": datetime(2025, 12, 1 + i)})
+            for i, result in enumerate(new)
+        ]
+        matrix = TrendMatrix.from_results(old + new)
+        assert matrix.metrics == ["bw_mb_s"]
+        assert matrix.column("bw_mb_s").tolist() == pytest.approx(
+            [1.024, 1.024, 1.1, 1.1]
+        )
@@ -0,0 +1,351 @@
+"""Tests for the command-line interface."""
+
+import json
+import re
+import subprocess
+import sys
+from datetime import datetime
+
+import pytest
+from click.testing import CliRunner
+
+from mybench.cli.main import cli
+from mybench.models.config import KernelConfig, SystemConfiguration
+from mybench.models.result import BenchmarkResult
+from mybench.storage.results import save_benchmark_results
+
+# Cumulative import time allowed for the CLI entry point, in microseconds.
+# Importing every subcommand eagerly took several times this.
+STARTUP_BUDGET_US = 200_000
+
+
+def _loaded_modules(args):
+    """Run the CLI in a fresh interpreter and return the modules it imported."""
+    code = (
+        "import sys\n"
+        "from mybench.cli.main import cli\n"
+        "try:\n"
+        f"    cli({args!r})\n"
+        "except SystemExit:\n"
+        "    pass\n"
+        "print(*sorted(sys.modules), sep='\\n', file=sys.stderr)\n"
+    )
+    proc = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return set(proc.stderr.splitlines())
+
+
+def test_cli_import_time_within_budget():
+    """Test importing the CLI entry point stays within its time budget."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import mybench.cli.main"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = re.search(r"\|\s*(\d+)\s*\|\s*mybench\.cli\.main$", proc.stderr, re.M)
+    assert match is not None
+    assert int(match.group(1)) < STARTUP_BUDGET_US
+
+
+def test_cli_version_skips_heavy_imports():
+    """Test --version loads neither Rich, Pydantic nor any subcommand."""
+    loaded = _loaded_modules(["--version"])
+    for module in ["rich", "pydantic", "mybench.storage", "mybench.cli.list"]:
+        assert module not in loaded
+
+
+def test_cli_imports_only_invoked_subcommand():
+    """Test a subcommand does not import its siblings, Pygments or NumPy."""
+    loaded = _loaded_modules(["list", "--help"])
+    assert "mybench.cli.list" in loaded
+    for module in ["mybench.cli.compare", "mybench.cli.system", "pygments", "numpy"]:
+        assert module not in loaded
+
+
+def test_compare_diff_skips_statistics_modules():
+    """Test compare diff loads neither NumPy nor the statistical commands."""
+    loaded = _loaded_modules(["compare", "diff", "--help"])
+    assert "mybench.cli.compare" in loaded
+    for module in ["mybench.cli.gate", "mybench.cli.groups", "numpy"]:
+        assert module not in loaded
+
+
+def test_list_writes_tsv_when_piped(tmp_path, monkeypatch):
+    """Test list skips Rich when not writing to a terminal."""
+    results = [
+        BenchmarkResult(
+            timestamp=datetime(2025, 11, 9, 14, minute, 0),
+            category="cpu",
+            tool="sysbench",
+            system_profile_id="test",
+            label="a\tb" if minute else None,
+            configuration=SystemConfiguration(
+                os="Ubuntu", kernel=KernelConfig(version="5.15.0")
+            ),
+            benchmark_parameters={},
+            results={"score": minute + 0.5},
+        )
+        for minute in range(3)
+    ]
+    save_benchmark_results(results, tmp_path / "results")
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["--no-daemon", "list"])
+    assert result.exit_code == 0, result.output
+    assert result.output.splitlines() == [
+        "Timestamp\tCategory\tTool\tSystem\tLabel\tKey Metrics",
+        "2025-11-09 14:02:00\tcpu\tsysbench\ttest\ta b\tscore: 2.50",
+        "2025-11-09 14:01:00\tcpu\tsysbench\ttest\ta b\tscore: 1.50",
+        "2025-11-09 14:00:00\tcpu\tsysbench\ttest\t-\tscore: 0.50",
+    ]
+
+    result = runner.invoke(cli, ["--no-daemon", "list", "--format", "table"])
+    assert "Total: 3 results" in result.output
+
+    result = runner.invoke(cli, ["--no-daemon", "show", "2025-11-09_1400"])
+    assert result.exit_code == 0, result.output
+    assert result.output.startswith("{\n")
+
+
+def test_compare_gate_exit_codes(tmp_path, monkeypatch):
+    """Test the gate exits with 0 on pass, 1 on regression and 2 on errors."""
+    results = [
+        BenchmarkResult(
+            timestamp=datetime(2025, 11, day, 2, 0, 0),
+            category="cpu",
+            tool="sysbench",
+            system_profile_id="test",
+            label="nightly",
+            configuration=SystemConfiguration(
+                os="Ubuntu", kernel=KernelConfig(version="5.15.0")
+            ),
+            benchmark_parameters={},
+            results={"eps": eps, "latency_ms": 2.0},
+        )
+        for day, eps in enumerate([1000, 1010, 990, 1000, 940], start=1)
+    ]
+    save_benchmark_results(results, tmp_path / "results")
+    (tmp_path / "gate.yaml").write_text(
+        "metrics:\n"
+        "  eps:\n"
+        "    max_regression: 5%\n"
+        "  latency_ms:\n"
+        "    direction: lower\n"
+    )
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    gate = ["--no-daemon", "compare", "gate", "--system", "test", "--tool", "sysbench"]
+    gate += ["--thresholds", "gate.yaml", "--report", "-"]
+
+    result = runner.invoke(cli, gate + ["--baseline", "nightly"])
+    assert result.exit_code == 1, result.output
+    report = json.loads(result.output)
+    assert report["status"] == "fail"
+    assert report["candidate"] == "2025-11-05_020000_sysbench"
+    assert report["baseline"]["count"] == 4
+    assert report["metrics"]["eps"]["status"] == "regression"
+    assert report["metrics"]["eps"]["percent_change"] == pytest.approx(-6)
+    assert report["metrics"]["latency_ms"]["status"] == "pass"
+
+    result = runner.invoke(
+        cli, gate + ["--baseline", "last:2", "--candidate", "2025-11-04"]
+    )
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["status"] == "pass"
+
+    result = runner.invoke(cli, gate + ["--baseline", "missing-label"])
+    assert result.exit_code == 2
+    assert "No baseline results" in result.output
+
+
+def test_compare_exit_is_not_reported_as_failure(tmp_path, monkeypatch):
+    """Test commands exiting early keep their exit code and message."""
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["--no-daemon", "compare", "trend", "--system", "x"])
+    assert result.exit_code == 0
+    assert "No results found for system 'x'" in result.output
+    assert "Failed" not in result.output
+
+    result = runner.invoke(cli, ["--no-daemon", "compare", "diff", "a", "b"])
+    assert result.exit_code == 1
+    assert "Result 'a' not found" in result.output
+    assert "Failed" not in result.output
+
+
+def test_csv_export_normalizes_metrics(tmp_path, monkeypatch):
+    """Test CSV exports use canonical metric names and units."""
+    results = [
+        BenchmarkResult(
+            timestamp=datetime(2025, 11, 9, 14, minute, 0),
+            category="disk",
+            tool="fio",
+            system_profile_id="test",
+            configuration=SystemConfiguration(
+                os="Ubuntu", kernel=KernelConfig(version="5.15.0")
+            ),
+            benchmark_parameters={},
+            results=metrics,
+        )
+        for minute, metrics in enumerate(
+            [{"bw": 1000, "lat_avg_us": 250}, {"bw_mb_s": 1.5, "iops": 300}]
+        )
+    ]
+    save_benchmark_results(results, tmp_path / "results")
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(cli, ["--no-daemon", "list", "--export", "csv"])
+    assert result.exit_code == 0, result.output
+    header, newest, oldest = result.output.splitlines()
+    assert header.endswith(",result_bw_mb_s,result_iops,result_lat_avg_ms")
+    assert newest.endswith(",1.5,300,")
+    assert oldest.endswith(",1.024,,0.25")
+
+    result = runner.invoke(
+        cli, ["--no-daemon", "list", "--export", "csv", "--raw-metrics"]
+    )
+    assert result.output.splitlines()[0].endswith(
+        ",result_bw,result_bw_mb_s,result_iops,result_lat_avg_us"
+    )
+
+
+def test_save_batch(tmp_path, monkeypatch):
+    """Test --batch saves every entry and refuses single-result options."""
+    (tmp_path / "systems").mkdir()
+    (tmp_path / "systems" / "test.json").write_text("{}")
+    entries = [
+        BenchmarkResult(
+            timestamp=datetime(2025, 11, 9, 14, minute, 0),
+            category="cpu",
+            tool="sysbench",
+            system_profile_id="test",
+            configuration=SystemConfiguration(
+                os="Ubuntu", kernel=KernelConfig(version="5.15.0")
+            ),
+            benchmark_parameters={},
+            results={"score": minute},
+        ).model_dump_json()
+        for minute in range(3)
+    ]
+    (tmp_path / "batch.jsonl").write_text("\n".join(entries))
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+
+    result = runner.invoke(
+        cli, ["--no-daemon", "save", "--batch", "batch.jsonl", "--tool", "fio"]
+    )
+    assert result.exit_code == 2
+    assert "--batch cannot be combined with --tool" in result.output
+    assert not (tmp_path / "results").exists()
+
+    result = runner.invoke(cli, ["--no-daemon", "save", "--batch", "batch.jsonl"])
+    assert result.exit_code == 0, result.output
+    assert "Saved 3 benchmark results" in result.output
+    result = runner.invoke(cli, ["--no-daemon", "list", "--export", "json"])
+    assert len(json.loads(result.output)) == 3
+
+
+def test_show_warns_about_missing_raw_output(tmp_path, monkeypatch):
+    """Test show still prints a result whose raw output sidecar is gone."""
+    result = BenchmarkResult(
+        timestamp=datetime(2025, 3, 1, 3, 0, 0),
+        category="disk",
+        tool="fio",
+        system_profile_id="test",
+        configuration=SystemConfiguration(
+            os="Ubuntu", kernel=KernelConfig(version="6.1")
+        ),
+        benchmark_parameters={},
+        results={"iops": 1000},
+        raw_output="fio-3.35",
+    )
+    (path,) = save_benchmark_results([result], tmp_path / "results")
+    path.with_suffix(".raw.gz").unlink()
+    monkeypatch.chdir(tmp_path)
+
+    result = CliRunner().invoke(
+        cli, ["--no-daemon", "show", "2025-03-01_030000_fio", "--plain"]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Raw output unavailable" in result.output
+    assert '"iops": 1000' in result.output
+    # The configuration is shown once, without its storage hash
+    assert '"kernel"' in result.output
+    assert "configuration_ref" not in result.output
+
+
+def test_export_round_trips_through_save_batch(tmp_path, monkeypatch):
+    """Test an NDJSON export saved into a fresh tree keeps its raw output."""
+    source = tmp_path / "source"
+    target = tmp_path / "target"
+    for tree in (source, target):
+        (tree / "systems").mkdir(parents=True)
+        (tree / "systems" / "test.json").write_text("{}")
+    result = BenchmarkResult(
+        timestamp=datetime(2025, 3, 1, 3, 0, 0),
+        category="disk",
+        tool="fio",
+        system_profile_id="test",
+        configuration=SystemConfiguration(
+            os="Ubuntu", kernel=KernelConfig(version="6.1")
+        ),
+        benchmark_parameters={},
+        results={"iops": 1000},
+        raw_output="fio-3.35\nread: IOPS=1000",
+    )
+    save_benchmark_results([result], source / "results")
+    runner = CliRunner()
+
+    monkeypatch.chdir(source)
+    exported = runner.invoke(cli, ["--no-daemon", "list", "--export", "ndjson"])
+    assert exported.exit_code == 0, exported.output
+    (tmp_path / "export.ndjson").write_text(exported.output)
+
+    monkeypatch.chdir(target)
+    saved = runner.invoke(
+        cli, ["--no-daemon", "save", "--batch", str(tmp_path / "export.ndjson")]
+    )
+    assert saved.exit_code == 0, saved.output
+
+    shown = runner.invoke(
+        cli, ["--no-daemon", "show", "2025-03-01_030000_fio", "--plain"]
+    )
+    assert shown.exit_code == 0, shown.output
+    assert "Raw output unavailable" not in shown.output
+    assert json.loads(shown.output)["raw_output"] == result.raw_output
+
+
+def test_trend_metric_accepts_reported_names(tmp_path, monkeypatch):
+    """Test --metric resolves a tool's own metric names to canonical ones."""
+    results = [
+        BenchmarkResult(
+            timestamp=datetime(2025, 11, 9, 14, minute, 0),
+            category="disk",
+            tool="fio",
+            system_profile_id="test",
+            configuration=SystemConfiguration(
+                os="Ubuntu", kernel=KernelConfig(version="5.15.0")
+            ),
+            benchmark_parameters={},
+            results={"bw": 1000 + minute},
+        )
+        for minute in range(2)
+    ]
+    save_benchmark_results(results, tmp_path / "results")
+    monkeypatch.chdir(tmp_path)
+    runner = CliRunner()
+    trend = ["--no-daemon", "compare", "trend", "--system", "test", "--metric"]
+
+    result = runner.invoke(cli, trend + ["bw"])
+    assert result.exit_code == 0, result.output
+    assert "Trend: bw_mb_s" in result.output
+    assert "1.0250" in result.output
+
+    result = runner.invoke(cli, trend + ["lat_avg_us", "--tool", "fio"])
+    assert result.exit_code == 1
+    assert "canonical name 'lat_avg_ms'" in result.output
@@ -0,0 +1,89 @@
+"""Tests for the query daemon."""
+
+import threading
+from datetime import datetime
+
+import pytest
+
+from mybench.daemon.client import DaemonClient, DaemonUnavailable, socket_path
+from mybench.daemon.server import create_server
+from mybench.models.config import KernelConfig, SystemConfiguration
+from mybench.models.result import BenchmarkResult
+from mybench.storage import results as results_module
+from mybench.storage.results import list_benchmark_results, save_benchmark_results
+
+
+def _make_result(minute, **results):
+    return BenchmarkResult(
+        timestamp=datetime(2025, 11, 9, 14, minute, 0),
+        category="cpu",
+        tool="sysbench",
+        system_profile_id="test",
+        configuration=SystemConfiguration(
+            os="Ubuntu", kernel=KernelConfig(version="5.15.0")
+        ),
+        benchmark_parameters={},
+        results=results,
+    )
+
+
+@pytest.fixture(autouse=True)
+def _restore_result_cache(monkeypatch):
+    # The daemon enables a process-wide cache; keep it out of other tests
+    monkeypatch.setattr(results_module, "_result_cache", None)
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    results_dir = tmp_path / "results"
+    save_benchmark_results(
+        [_make_result(i, score=i) for i in range(3)], results_dir
+    )
+    server = create_server(results_dir, tmp_path / "systems")
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield results_dir
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+def test_daemon_answers_queries(daemon):
+    """Test the daemon returns the same results as reading files."""
+    client = DaemonClient.find(daemon)
+    assert client is not None
+
+    expected = [
+        r.model_dump(mode="json")
+        for r in list_benchmark_results(daemon, sort_by="score", limit=2)
+    ]
+    assert list(client.results(sort_by="score", limit=2)) == expected
+    assert [r["results"] for r in client.results(where="score < 1")] == [
+        {"score": 0}
+    ]
+
+    # Files saved after startup are picked up by the next query
+    save_benchmark_results([_make_result(9, score=9)], daemon)
+    assert len(list(client.results())) == 4
+
+    found = client.results_by_ids(["2025-11-09_1401", "2024"])
+    assert found[0]["results"] == {"score": 1}
+    assert found[1] is None
+
+    with pytest.raises(ValueError, match="Ambiguous"):
+        client.results_by_ids(["2025"])
+    with pytest.raises(ValueError, match="position"):
+        client.get("metric-names", where="score >")
+
+
+def test_daemon_socket_removed_on_close(tmp_path):
+    """Test closing the server removes its socket, and stale sockets fail fast."""
+    results_dir = tmp_path / "results"
+    server = create_server(results_dir, tmp_path / "systems")
+    assert DaemonClient.find(results_dir) is not None
+    server.server_close()
+    assert not socket_path(results_dir).exists()
+    assert DaemonClient.find(results_dir) is None
+
+    with pytest.raises(DaemonUnavailable):
+        DaemonClient(socket_path(results_dir)).get("ping")
@@ -95,3 +95,36 @@ def test_system_configuration_valid():
     )
     assert config.os == "Ubuntu 22.04"
     assert config.kernel.cpu_governor == "performance"
+
+
+def test_system_configuration_content_hash():
+    """Test equal configurations share a content hash."""
+    config1 = SystemConfiguration(
+        os="Ubuntu 22.04",
+        kernel=KernelConfig(version="5.15.0", parameters={"a": "1", "b": "2"}),
+    )
+    config2 = SystemConfiguration(
+        os="Ubuntu 22.04",
+        kernel=KernelConfig(version="5.15.0", parameters={"b": "2", "a": "1"}),
+    )
+    config3 = SystemConfiguration(os="Ubuntu 22.04", kernel=KernelConfig(version="6.1"))
+
+    assert config1.content_hash() == config2.content_hash()
+    assert config1.content_hash() != config3.content_hash()
+
+
+def test_benchmark_result_requires_configuration():
+    """Test a result needs an inline configuration or a reference."""
+    fields = dict(
+        timestamp=datetime(2025, 11, 9, 14, 30, 22),
+        category="cpu",
+        tool="sysbench",
+        system_profile_id="test",
+        benchmark_parameters={},
+        results={},
+    )
+    with pytest.raises(Exception):  # Pydantic ValidationError
+        BenchmarkResult(**fields)
+
+    result = BenchmarkResult(configuration_ref="abc123", **fields)
+    assert result.configuration is None
@@ -1,15 +1,25 @@
 """Tests for storage integrity and JSON operations."""
 
+import numpy as np
 import pytest
 import json
+import os
+import sqlite3
+import sys
 from pathlib import Path
 from datetime import date, datetime
+from pydantic import ValidationError
+from mybench.storage import codec
 from mybench.storage.base import (
     atomic_save_json,
     load_and_validate_json,
     save_model_to_json,
 )
+from mybench.storage import profiles as profiles_module
 from mybench.storage.profiles import (
+    CATALOG_FILENAME,
+    clear_profile_cache,
+    compile_profile_catalog,
     save_system_profile,
     load_system_profile,
     list_system_profiles,
@@ -20,7 +30,18 @@ from mybench.storage.results import (
     load_benchmark_result,
     list_benchmark_results,
     get_result_by_id,
+    get_results_by_ids,
+    iter_benchmark_results,
+    list_metric_names,
+    migrate_results_layout,
+    save_benchmark_results,
 )
+from mybench.storage.index import INDEX_FILENAME, ResultIndex
+from mybench.storage.layout import parse_result_id, write_layout
+from mybench.storage.metrics import load_metric_series, series_dir
+from mybench.storage.query import parse_where
+from mybench.storage import index as index_module
+from mybench.storage import watch as watch_module
 from mybench.models.system import (
     SystemProfile,
     CPUSpec,
@@ -334,3 +355,768 @@ def test_get_result_by_id(tmp_path):
     # Non-existent ID
     not_found = get_result_by_id("nonexistent", results_dir)
     assert not_found is None
+
+
+def _make_result(timestamp, tool="sysbench", system="test", label=None, **results):
+    return BenchmarkResult(
+        timestamp=timestamp,
+        category="cpu",
+        tool=tool,
+        system_profile_id=system,
+        label=label,
+        configuration=SystemConfiguration(
+            os="Ubuntu",
+            kernel=KernelConfig(version="5.15.0"),
+        ),
+        benchmark_parameters={},
+        results=results or {"score": 100},
+    )
+
+
+def test_result_index_refresh_is_incremental(tmp_path):
+    """Test the result index only re-parses changed files."""
+    results_dir = tmp_path / "results"
+    for i in range(3):
+        save_benchmark_result(
+            _make_result(datetime(2025, 11, 9, 14, i, 0), score=i), results_dir
+        )
+
+    with ResultIndex(results_dir) as index:
+        # Saving keeps the index current
+        assert index.refresh() == {"added": 0, "updated": 0, "removed": 0}
+        assert len(index.query()) == 3
+
+    # Rewrite one file and delete another behind the index's back
+    paths = sorted((results_dir / "cpu").glob("*.json"))
+    data = json.loads(paths[0].read_text())
+    data["label"] = "changed"
+    paths[0].write_text(json.dumps(data) + "\n")
+    paths[1].unlink()
+
+    with ResultIndex(results_dir) as index:
+        assert index.refresh() == {"added": 0, "updated": 1, "removed": 1}
+        assert index.query(label="changed") == [paths[0]]
+
+
+def test_result_index_recovers_from_deleted_index(tmp_path):
+    """Test listing rebuilds a missing index from the result files."""
+    results_dir = tmp_path / "results"
+    save_benchmark_result(_make_result(datetime(2025, 11, 9, 14, 0, 0)), results_dir)
+    (results_dir / INDEX_FILENAME).unlink()
+
+    results = list_benchmark_results(results_dir, system_profile_id="test")
+    assert len(results) == 1
+    assert (results_dir / INDEX_FILENAME).exists()
+
+
+def test_list_benchmark_results_without_index(tmp_path):
+    """Test the file-scanning fallback matches the indexed listing."""
+    results_dir = tmp_path / "results"
+    for i in range(3):
+        save_benchmark_result(
+            _make_result(datetime(2025, 11, 9, 14, i, 0), system=f"s{i % 2}"),
+            results_dir,
+        )
+
+    indexed = list_benchmark_results(results_dir, system_profile_id="s0")
+    scanned = list_benchmark_results(
+        results_dir, system_profile_id="s0", use_index=False
+    )
+    assert [r.timestamp for r in indexed] == [r.timestamp for r in scanned]
+    assert indexed[0].timestamp > indexed[1].timestamp
+
+
+def test_get_result_by_id_prefix(tmp_path):
+    """Test result lookup by unique ID prefix."""
+    results_dir = tmp_path / "results"
+    save_benchmark_result(_make_result(datetime(2025, 11, 9, 14, 30, 22)), results_dir)
+    save_benchmark_result(_make_result(datetime(2025, 11, 9, 15, 0, 0)), results_dir)
+
+    loaded = get_result_by_id("2025-11-09_1430", results_dir)
+    assert loaded is not None
+    assert loaded.timestamp == datetime(2025, 11, 9, 14, 30, 22)
+
+    with pytest.raises(ValueError, match="Ambiguous"):
+        get_result_by_id("2025-11-09_1", results_dir)
+
+
+def test_get_results_by_ids_batch(tmp_path):
+    """Test batch lookup picks up files added behind the index's back."""
+    results_dir = tmp_path / "results"
+    save_benchmark_result(_make_result(datetime(2025, 11, 9, 14, 30, 22)), results_dir)
+
+    # Written without going through save_benchmark_result
+    unindexed = _make_result(datetime(2025, 11, 10, 9, 0, 0), tool="fio")
+    save_model_to_json(results_dir / "cpu" / "2025-11-10_090000_fio.json", unindexed)
+
+    loaded = get_results_by_ids(
+        ["2025-11-09_143022_sysbench", "missing", "2025-11-10_090000_fio"],
+        results_dir,
+    )
+    assert loaded[0].tool == "sysbench"
+    assert loaded[1] is None
+    assert loaded[2].tool == "fio"
+
+
+def test_list_benchmark_results_parallel(tmp_path, capsys):
+    """Test loading through a worker pool keeps order and reports warnings."""
+    results_dir = tmp_path / "results"
+    for i in range(6):
+        save_benchmark_result(
+            _make_result(datetime(2025, 11, 9, 14, i, 0), score=i), results_dir
+        )
+    (results_dir / "cpu" / "2025-11-09_150000_broken.json").write_text("{}")
+
+    serial = list_benchmark_results(results_dir, use_index=False)
+    capsys.readouterr()
+    parallel = list_benchmark_results(results_dir, use_index=False, workers=2)
+
+    assert [r.results["score"] for r in parallel] == [5, 4, 3, 2, 1, 0]
+    assert [r.timestamp for r in parallel] == [r.timestamp for r in serial]
+    output = capsys.readouterr().out
+    assert output.count("Warning:") == 1
+    assert output.startswith("Warning: Failed to load")
+    assert "2025-11-09_150000_broken.json" in output
+
+
+def test_raw_output_stored_in_compressed_sidecar(tmp_path):
+    """Test raw output is split into a gzip sidecar and loaded lazily."""
+    results_dir = tmp_path / "results"
+    result = _make_result(datetime(2025, 11, 9, 14, 30, 22))
+    result.raw_output = "fio-3.35\n" + "lat (usec): 99.00th=[  1200]\n" * 1000
+
+    filepath = save_benchmark_result(result, results_dir)
+    raw_path = results_dir / "cpu" / "2025-11-09_143022_sysbench.raw.gz"
+    assert raw_path.exists()
+    assert raw_path.stat().st_size < len(result.raw_output)
+
+    data = json.loads(filepath.read_text())
+    assert data["raw_output"] is None
+    assert data["raw_output_file"] == raw_path.name
+
+    loaded = get_result_by_id("2025-11-09_143022_sysbench", results_dir)
+    assert loaded.raw_output is None
+    assert loaded.load_raw_output() == result.raw_output
+
+
+def test_raw_output_sidecar_follows_result_to_another_tree(tmp_path):
+    """Test re-saving a result elsewhere keeps its raw output resolvable."""
+    result = _make_result(datetime(2025, 11, 9, 14, 30, 22))
+    result.raw_output = "events per second: 12543.67"
+    loaded = load_benchmark_result(save_benchmark_result(result, tmp_path / "a"))
+
+    # Loaded from tree a, so the sidecar is copied along
+    path = save_benchmark_result(loaded, tmp_path / "b")
+    assert path.with_suffix(".raw.gz").exists()
+    assert load_benchmark_result(path).load_raw_output() == result.raw_output
+
+    # A reference without its sidecar is dropped rather than kept dangling
+    orphan = loaded.model_copy()
+    orphan._source_path = None
+    path = save_benchmark_result(orphan, tmp_path / "c")
+    stored = load_benchmark_result(path)
+    assert stored.raw_output_file is None
+    assert stored.load_raw_output() is None
+
+
+def test_inline_raw_output_still_loads(tmp_path):
+    """Test result files with inline raw output remain readable."""
+    filepath = tmp_path / "results" / "cpu" / "2025-11-09_143022_sysbench.json"
+    result = _make_result(datetime(2025, 11, 9, 14, 30, 22))
+    result.raw_output = "events per second: 12543.67"
+    save_model_to_json(filepath, result)
+
+    loaded = load_benchmark_result(filepath)
+    assert loaded.raw_output_file is None
+    assert loaded.load_raw_output() == "events per second: 12543.67"
+
+
+def test_metric_store_columns_and_invalidation(tmp_path):
+    """Test metric series are stored as columns and rebuilt on change."""
+    results_dir = tmp_path / "results"
+    save_benchmark_result(
+        _make_result(datetime(2025, 11, 9, 10, 0, 0), score=1.0, lat=5.0),
+        results_dir,
+    )
+    save_benchmark_result(
+        _make_result(datetime(2025, 11, 10, 10, 0, 0), score=2.0), results_dir
+    )
+
+    (series,) = load_metric_series(results_dir, "test", tool="sysbench")
+    assert series.ids == [
+        "2025-11-09_100000_sysbench",
+        "2025-11-10_100000_sysbench",
+    ]
+    assert list(series.columns["score"]) == [1.0, 2.0]
+    assert list(series.points("lat")) == [(0, 5.0)]
+
+    meta_path = results_dir / ".metrics" / "test" / "cpu" / "sysbench" / "meta.json"
+    built = meta_path.stat().st_mtime_ns
+    (series,) = load_metric_series(results_dir, "test")
+    assert meta_path.stat().st_mtime_ns == built
+    # Stored columns are mapped, not read into memory
+    assert isinstance(series.columns["score"], np.memmap)
+
+    save_benchmark_result(
+        _make_result(datetime(2025, 11, 11, 10, 0, 0), score=3.0), results_dir
+    )
+    (series,) = load_metric_series(results_dir, "test")
+    assert list(series.columns["score"]) == [1.0, 2.0, 3.0]
+
+
+def test_metric_store_paths_stay_inside_store(tmp_path):
+    """Test IDs with separators or dots cannot escape the metric store."""
+    store = tmp_path / ".metrics"
+    for system, tool in [("../../x", "fio"), ("a/b", ".."), ("..", "t/../../u")]:
+        directory = series_dir(tmp_path, system, "cpu", tool)
+        assert directory.parent.parent.parent == store
+        assert ".." not in directory.relative_to(store).parts
+
+    # Distinct IDs never share a directory
+    assert series_dir(tmp_path, "a/b", "cpu", "t") != series_dir(
+        tmp_path, "a%2Fb", "cpu", "t"
+    )
+    with pytest.raises(ValueError):
+        series_dir(tmp_path, "", "cpu", "fio")
+
+
+def test_parse_result_id():
+    """Test result IDs split into timestamp and tool."""
+    assert parse_result_id("2025-11-09_143022_sysbench-memory") == (
+        datetime(2025, 11, 9, 14, 30, 22),
+        "sysbench-memory",
+    )
+    assert parse_result_id("notes") is None
+    assert parse_result_id("2025-11-09_143022") is None
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_list_filters_pushed_down_to_filenames(tmp_path, capsys, use_index):
+    """Test tool/time filters skip files without opening them."""
+    results_dir = tmp_path / "results"
+    for day in (8, 9, 10):
+        save_benchmark_result(
+            _make_result(datetime(2025, 11, day, 12, 0, 0)), results_dir
+        )
+    # Unreadable files that the filename proves cannot match
+    (results_dir / "cpu" / "2025-11-09_120000_fio.json").write_text("{")
+    (results_dir / "cpu" / "2025-01-01_000000_sysbench.json").write_text("{")
+
+    results = list_benchmark_results(
+        results_dir,
+        tool="sysbench",
+        since=datetime(2025, 11, 9),
+        until=datetime(2025, 11, 9, 23, 59, 59),
+        use_index=use_index,
+    )
+
+    assert [r.timestamp.day for r in results] == [9]
+    assert "Warning" not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize("fast", [True, False])
+def test_codec_matches_stdlib_format(monkeypatch, fast):
+    """Test both codec backends write the same pretty-printed JSON."""
+    if fast:
+        pytest.importorskip("orjson")
+    else:
+        monkeypatch.setattr(codec, "orjson", None)
+
+    data = {"tool": "fio", "nested": {"a": 1, "b": [1.5, None]}, "os": "日本", "x": {}}
+    encoded = codec.dumps(data)
+
+    expected = json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    assert encoded == expected.encode("utf-8")
+    assert codec.loads(encoded) == data
+
+
+def test_unchanged_results_skip_validation(tmp_path, monkeypatch):
+    """Test files matching their indexed hash are constructed, not validated."""
+    from mybench.storage import results as results_module
+
+    results_dir = tmp_path / "results"
+    for i in range(2):
+        save_benchmark_result(
+            _make_result(datetime(2025, 11, 9, 14, i, 0), score=i), results_dir
+        )
+
+    constructed = []
+    construct = results_module.construct_benchmark_result
+    monkeypatch.setattr(
+        results_module,
+        "construct_benchmark_result",
+        lambda data: constructed.append(data["tool"]) or construct(data),
+    )
+
+    results = list_benchmark_results(results_dir)
+    assert constructed == ["sysbench", "sysbench"]
+    for result in results:
+        assert isinstance(result.timestamp, datetime)
+        assert isinstance(result.configuration.kernel, KernelConfig)
+        assert result == load_benchmark_result(result._source_path)
+
+    # Strict mode always validates
+    constructed.clear()
+    list_benchmark_results(results_dir, strict=True)
+    get_result_by_id(results[0]._source_path.stem, results_dir, strict=True)
+    assert constructed == []
+
+    # A changed file no longer matches its indexed hash and is validated
+    path = results[0]._source_path
+    data = json.loads(path.read_text())
+    data["results"]["score"] = 42
+    path.write_text(json.dumps(data) + "\n")
+    assert get_result_by_id(results[0]._source_path.stem, results_dir).results["score"] == 42
+
+
+def test_configuration_stored_once(tmp_path):
+    """Test identical configurations are stored once and referenced."""
+    results_dir = tmp_path / "results"
+    paths = [
+        save_benchmark_result(_make_result(datetime(2025, 11, 9, 14, i, 0)), results_dir)
+        for i in range(3)
+    ]
+
+    stored = list((results_dir / "configurations").glob("*.json"))
+    assert len(stored) == 1
+
+    data = json.loads(paths[0].read_text())
+    assert data["configuration"] is None
+    assert data["configuration_ref"] == stored[0].stem
+
+    results = list_benchmark_results(results_dir)
+    assert results[0].configuration.kernel.version == "5.15.0"
+    assert results[0].configuration.content_hash() == stored[0].stem
+    assert all(r.configuration is results[0].configuration for r in results)
+    # Shared instances cannot be changed through one result
+    with pytest.raises(ValidationError):
+        results[0].configuration.os = "Debian"
+    with pytest.raises(ValidationError):
+        results[0].configuration.kernel.version = "6.1"
+
+    # Results written before deduplication keep their inline configuration
+    data["configuration"] = json.loads(stored[0].read_text())
+    data["configuration_ref"] = None
+    paths[0].write_text(json.dumps(data) + "\n")
+    loaded = load_benchmark_result(paths[0])
+    assert loaded.configuration == results[0].configuration
+
+
+def test_save_benchmark_results_batch(tmp_path):
+    """Test a batch save writes every file and indexes it in one pass."""
+    results_dir = tmp_path / "results"
+    batch = [_make_result(datetime(2025, 11, 9, 14, i, 0), score=i) for i in range(5)]
+    batch[0].raw_output = "raw"
+
+    paths = save_benchmark_results(batch, results_dir)
+
+    assert [p.name for p in paths] == [
+        f"2025-11-09_14{i:02d}00_sysbench.json" for i in range(5)
+    ]
+    assert not list(results_dir.rglob("*.tmp"))
+    assert len(list((results_dir / "configurations").glob("*.json"))) == 1
+    with ResultIndex(results_dir) as index:
+        assert index.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+    results = list_benchmark_results(results_dir)
+    assert [r.results["score"] for r in results] == [4, 3, 2, 1, 0]
+    assert results[-1].load_raw_output() == "raw"
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_sharded_layout(tmp_path, capsys, use_index):
+    """Test sharded results are found and far-off shards are never read."""
+    results_dir = tmp_path / "results"
+    write_layout(results_dir, "sharded")
+    save_benchmark_results(
+        [_make_result(datetime(2025, month, 9, 14, 0, 0)) for month in (1, 6, 11)],
+        results_dir,
+    )
+    assert (results_dir / "cpu/2025/06/2025-06-09_140000_sysbench.json").exists()
+
+    # A broken file in an out-of-range shard must not be opened
+    (results_dir / "cpu/2025/01/2025-01-09_150000_sysbench.json").write_text("{")
+
+    results = list_benchmark_results(
+        results_dir, since=datetime(2025, 6, 1), use_index=use_index
+    )
+    assert [r.timestamp.month for r in results] == [11, 6]
+    assert "Warning" not in capsys.readouterr().out
+
+    assert get_result_by_id("2025-06-09_140000_sysbench", results_dir) is not None
+    assert get_result_by_id("2025-11", results_dir).timestamp.month == 11
+
+
+def test_migrate_results_layout(tmp_path):
+    """Test migrating moves files and sidecars without re-parsing them."""
+    results_dir = tmp_path / "results"
+    result = _make_result(datetime(2025, 11, 9, 14, 0, 0))
+    result.raw_output = "raw"
+    save_benchmark_results(
+        [result, _make_result(datetime(2025, 10, 9, 14, 0, 0))], results_dir
+    )
+
+    assert migrate_results_layout(results_dir, "sharded") == 2
+    shard = results_dir / "cpu" / "2025" / "11"
+    assert sorted(p.name for p in shard.iterdir()) == [
+        "2025-11-09_140000_sysbench.json",
+        "2025-11-09_140000_sysbench.raw.gz",
+    ]
+    with ResultIndex(results_dir) as index:
+        assert index.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+    # New results follow the recorded layout
+    save_benchmark_result(_make_result(datetime(2025, 12, 1, 9, 0, 0)), results_dir)
+    assert (results_dir / "cpu/2025/12/2025-12-01_090000_sysbench.json").exists()
+
+    assert migrate_results_layout(results_dir, "flat") == 3
+    assert sorted(p.name for p in (results_dir / "cpu").iterdir()) == [
+        "2025-10-09_140000_sysbench.json",
+        "2025-11-09_140000_sysbench.json",
+        "2025-11-09_140000_sysbench.raw.gz",
+        "2025-12-01_090000_sysbench.json",
+    ]
+    loaded = get_result_by_id("2025-11-09_140000_sysbench", results_dir)
+    assert loaded.load_raw_output() == "raw"
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+@pytest.mark.parametrize("layout", ["flat", "sharded"])
+def test_iter_benchmark_results_streams_in_order(tmp_path, use_index, layout):
+    """Test results stream in timestamp order across categories and shards."""
+    results_dir = tmp_path / "results"
+    write_layout(results_dir, layout)
+    batch = []
+    for i, month in enumerate([1, 3, 5, 7, 9, 11]):
+        result = _make_result(datetime(2025, month, 1, 12, 0, 0), score=i)
+        result.category = "cpu" if i % 2 else "memory"
+        batch.append(result)
+    save_benchmark_results(batch, results_dir)
+
+    results = iter_benchmark_results(results_dir, use_index=use_index, workers=2)
+    assert next(results).results["score"] == 5
+    assert [r.results["score"] for r in results] == [4, 3, 2, 1, 0]
+
+    oldest_first = iter_benchmark_results(
+        results_dir,
+        use_index=use_index,
+        newest_first=False,
+        since=datetime(2025, 4, 1),
+        category="cpu",
+    )
+    assert [r.results["score"] for r in oldest_first] == [3, 5]
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_list_metric_names_is_union(tmp_path, use_index):
+    """Test metric names are collected from every matching result."""
+    results_dir = tmp_path / "results"
+    save_benchmark_results(
+        [
+            _make_result(datetime(2025, 11, 9, 14, 0, 0), score=1),
+            _make_result(datetime(2025, 11, 9, 15, 0, 0), latency=2.5, mode="rw"),
+            _make_result(datetime(2025, 11, 9, 16, 0, 0), tool="fio", iops=3),
+        ],
+        results_dir,
+    )
+
+    names = list_metric_names(results_dir, tool="sysbench", use_index=use_index)
+    assert names == ["latency", "mode", "score"]
+
+    pairs = list_metric_names(results_dir, use_index=use_index, by_tool=True)
+    assert pairs == [
+        ("fio", "iops"),
+        ("sysbench", "latency"),
+        ("sysbench", "mode"),
+        ("sysbench", "score"),
+    ]
+
+
+@pytest.mark.parametrize("use_index", [True, False])
+def test_list_benchmark_results_sort_and_limit(tmp_path, use_index):
+    """Test top-k by metric or field with limit and offset."""
+    results_dir = tmp_path / "results"
+    scores = [5, 9, 1, 7, 3]
+    batch = [
+        _make_result(datetime(2025, 11, 9, 14, i, 0), score=score)
+        for i, score in enumerate(scores)
+    ]
+    batch.append(_make_result(datetime(2025, 11, 9, 15, 0, 0), tool="fio", iops=1))
+    save_benchmark_results(batch, results_dir)
+
+    def listed(**kwargs):
+        return list_benchmark_results(results_dir, use_index=use_index, **kwargs)
+
+    top = listed(sort_by="score", limit=3)
+    assert [r.results["score"] for r in top] == [9, 7, 5]
+
+    page = listed(sort_by="score", descending=False, limit=2, offset=1)
+    assert [r.results["score"] for r in page] == [3, 5]
+
+    newest = listed(limit=2)
+    assert [r.timestamp.hour for r in newest] == [15, 14]
+    assert newest[1].results["score"] == 3
+
+    by_tool = listed(sort_by="tool", descending=False, limit=2)
+    assert [r.tool for r in by_tool] == ["fio", "sysbench"]
+    assert by_tool[1].results["score"] == 5
+
+
+def _make_profile(profile_id):
+    return SystemProfile(
+        profile_id=profile_id,
+        profile_name=profile_id.title(),
+        type="physical",
+        created=date(2025, 11, 9),
+        hardware=HardwareSpecs(
+            cpu=CPUSpec(model="CPU", cores=4, threads=4),
+            memory=MemorySpec(total_gb=16),
+            disk=DiskSpec(type="SSD", capacity_gb=500),
+            network=NetworkSpec(),
+        ),
+    )
+
+
+def test_profile_cache_invalidated_by_mtime(tmp_path):
+    """Test cached profiles are reused until their file changes."""
+    systems_dir = tmp_path / "systems"
+    for name in ["a", "b"]:
+        save_system_profile(_make_profile(name), systems_dir)
+
+    listed = list_system_profiles(systems_dir)
+    assert load_system_profile("a", systems_dir) is listed[0]
+
+    # Rewrite a profile and add another behind the cache's back
+    data = json.loads((systems_dir / "a.json").read_text())
+    data["profile_name"] = "Changed"
+    (systems_dir / "a.json").write_text(json.dumps(data) + "\n")
+    save_model_to_json(systems_dir / "c.json", _make_profile("c"))
+
+    assert load_system_profile("a", systems_dir).profile_name == "Changed"
+    assert profile_exists("c", systems_dir)
+    assert [p.profile_id for p in list_system_profiles(systems_dir)] == [
+        "a",
+        "b",
+        "c",
+    ]
+
+
+def test_profile_exists_despite_coarse_directory_mtime(tmp_path):
+    """Test a profile added within the cached listing's mtime tick is found."""
+    systems_dir = tmp_path / "systems"
+    save_system_profile(_make_profile("a"), systems_dir)
+    assert not profile_exists("b", systems_dir)
+
+    # Add a file without changing the directory mtime, as on filesystems
+    # with coarse timestamps
+    st = systems_dir.stat()
+    save_model_to_json(systems_dir / "b.json", _make_profile("b"))
+    os.utime(systems_dir, ns=(st.st_atime_ns, st.st_mtime_ns))
+
+    assert profile_exists("b", systems_dir)
+    assert [p.profile_id for p in list_system_profiles(systems_dir)] == ["a", "b"]
+
+
+def test_cached_profiles_are_frozen(tmp_path):
+    """Test shared cached profiles cannot be changed through one caller."""
+    systems_dir = tmp_path / "systems"
+    save_system_profile(_make_profile("a"), systems_dir)
+    profile = load_system_profile("a", systems_dir)
+
+    with pytest.raises(ValidationError):
+        profile.profile_name = "Changed"
+    with pytest.raises(ValidationError):
+        profile.hardware.memory.total_gb = 32
+    assert load_system_profile("a", systems_dir).profile_name == "A"
+
+
+def test_profile_catalog(tmp_path, monkeypatch):
+    """Test a compiled catalog replaces per-file loads on a cold cache."""
+    systems_dir = tmp_path / "systems"
+    for name in ["a", "b", "c"]:
+        save_system_profile(_make_profile(name), systems_dir)
+    compile_profile_catalog(systems_dir)
+    assert (systems_dir / CATALOG_FILENAME).exists()
+
+    loaded_files = []
+    load_many = profiles_module.load_many_and_validate_json
+    monkeypatch.setattr(
+        profiles_module,
+        "load_many_and_validate_json",
+        lambda paths, *args, **kwargs: loaded_files.extend(paths)
+        or load_many(paths, *args, **kwargs),
+    )
+
+    clear_profile_cache()
+    profiles = list_system_profiles(systems_dir)
+    assert [p.profile_id for p in profiles] == ["a", "b", "c"]
+    assert loaded_files == []
+
+    # A stale entry is reloaded from its file and the catalog is refreshed
+    save_model_to_json(systems_dir / "b.json", _make_profile("b"))
+    clear_profile_cache()
+    list_system_profiles(systems_dir)
+    assert loaded_files == [systems_dir / "b.json"]
+
+    loaded_files.clear()
+    clear_profile_cache()
+    list_system_profiles(systems_dir)
+    assert loaded_files == []
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("iops > 100 and lat < 2", [1]),
+        ("iops >= 100 or lat=3", [1, 2]),
+        ("not (iops > 100)", [0, 2, 3]),
+        ("mode == 1", []),
+        ("lat != 1.5", [0, 2]),
+    ],
+)
+@pytest.mark.parametrize("use_index", [True, False])
+def test_where_predicate(tmp_path, use_index, text, expected):
+    """Test --where predicates match the same results in SQL and in Python."""
+    results_dir = tmp_path / "results"
+    rows = [
+        dict(iops=50, lat=1.0),
+        dict(iops=150, lat=1.5),
+        dict(iops=100, lat=3.0, mode="rw"),
+        dict(mode="ro"),
+    ]
+    save_benchmark_results(
+        [_make_result(datetime(2025, 11, 9, 14, i), **r) for i, r in enumerate(rows)],
+        results_dir,
+    )
+
+    where = parse_where(text)
+    results = list_benchmark_results(
+        results_dir, where=where, descending=False, use_index=use_index
+    )
+    assert [r.timestamp.minute for r in results] == expected
+
+    series = load_metric_series(results_dir, "test", where=where)
+    assert [s.timestamp(row).minute for s in series for row in range(len(s))] == (
+        expected
+    )
+
+
+@pytest.mark.parametrize("text", ["", "iops >", "iops > 1 lat", "(iops > 1", "a ~ 1"])
+def test_where_syntax_errors(text):
+    """Test malformed --where expressions are rejected."""
+    with pytest.raises(ValueError, match="position"):
+        parse_where(text)
+
+
+@pytest.mark.parametrize("backend", ["inotify", "polling"])
+def test_watched_index_reloads_only_changed_files(tmp_path, monkeypatch, backend):
+    """Test a watched results directory is refreshed without a full scan."""
+    if backend == "polling":
+        monkeypatch.setattr(
+            watch_module, "InotifyWatcher", watch_module.PollingWatcher
+        )
+    elif not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+
+    results_dir = tmp_path / "results"
+    paths = [
+        save_benchmark_result(
+            _make_result(datetime(2025, 11, 9, 14, i, 0), score=i), results_dir
+        )
+        for i in range(3)
+    ]
+    watch_module.watch(results_dir)
+    try:
+        with ResultIndex(results_dir) as index:
+            # The first refresh after watching scans everything
+            assert index.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+            # Changes made behind the index's back, as by git pull
+            new_path = paths[0].with_name("2025-11-09_150000_sysbench.json")
+            new_path.write_text(paths[0].read_text())
+            paths[1].write_text(
+                paths[1].read_text().replace('"score": 1', '"score": 7')
+            )
+            paths[2].unlink()
+
+            loaded = []
+            load_many = index_module.load_many_and_validate_json
+            monkeypatch.setattr(
+                index_module,
+                "load_many_and_validate_json",
+                lambda files, *args, **kwargs: loaded.extend(files)
+                or load_many(files, *args, **kwargs),
+            )
+            monkeypatch.setattr(ResultIndex, "_scan_files", None)
+
+            stats = index.refresh()
+            assert stats == {"added": 1, "updated": 1, "removed": 1}
+            assert sorted(loaded) == sorted([new_path, paths[1]])
+            assert index.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+        results = list_benchmark_results(results_dir, descending=False)
+        assert [r.results["score"] for r in results] == [0, 0, 7]
+    finally:
+        watch_module.unwatch(results_dir)
+
+
+@pytest.mark.parametrize("backend", ["inotify", "polling"])
+def test_watched_index_keeps_changes_after_failed_refresh(
+    tmp_path, monkeypatch, backend
+):
+    """Test changes drained by a failed refresh are picked up by the next one."""
+    if backend == "polling":
+        monkeypatch.setattr(
+            watch_module, "InotifyWatcher", watch_module.PollingWatcher
+        )
+    elif not sys.platform.startswith("linux"):
+        pytest.skip("inotify is Linux-only")
+
+    results_dir = tmp_path / "results"
+    path = save_benchmark_result(
+        _make_result(datetime(2025, 11, 9, 14, 0, 0), score=1), results_dir
+    )
+    watch_module.watch(results_dir)
+    try:
+        with ResultIndex(results_dir) as index:
+            index.refresh()
+            path.write_text(path.read_text().replace('"score": 1', '"score": 7'))
+
+            apply_changes = ResultIndex._apply_changes
+            calls = []
+
+            def fail_once(self, *args, **kwargs):
+                calls.append(args)
+                if len(calls) == 1:
+                    raise sqlite3.OperationalError("database is locked")
+                return apply_changes(self, *args, **kwargs)
+
+            monkeypatch.setattr(ResultIndex, "_apply_changes", fail_once)
+            with pytest.raises(sqlite3.OperationalError):
+                index.refresh()
+            assert index.refresh()["updated"] == 1
+            assert index.refresh() == {"added": 0, "updated": 0, "removed": 0}
+
+        results = list_benchmark_results(results_dir)
+        assert [r.results["score"] for r in results] == [7]
+    finally:
+        watch_module.unwatch(results_dir)
+
+
+def test_watcher_requires_drain(tmp_path):
+    """Test a watcher subclass without drain cannot be created."""
+
+    class Incomplete(watch_module.Watcher):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete(tmp_path)
+
+
+def test_load_and_validate_json_invalid_json(tmp_path):
+    """Test malformed JSON is reported as a validation error."""
+    filepath = tmp_path / "broken.json"
+    filepath.write_text('{"profile_id": ')
+
+    with pytest.raises(ValidationError):
+        load_and_validate_json(filepath, SystemProfile)